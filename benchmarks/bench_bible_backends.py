@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+NerdsCourt Canon Core - NerdBible Backend Benchmark
+
+Compares the JSON (BibleStore) and SQLite (SqliteBibleStore) backends on
+load, point lookup, theme filter, substring search, ranked search and
+single-entry writes.
+
+Usage:
+    python benchmarks/bench_bible_backends.py --sizes 10000,100000,1000000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nerdbible import bible_core
+from nerdbible.sqlite_store import SqliteBibleStore, migrate_json_to_sqlite
+from bench_bible_store import build_bible
+
+def time_per_call(func, args_list):
+    """Mean latency of func over args_list, in milliseconds."""
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1000
+
+def run_backend(name, store, size, reps):
+    """Time the module-level API against one store."""
+    bible_core.set_bible_store(store)
+
+    start = time.perf_counter()
+    bible_core.get_entry_by_id("NB-0001")
+    bible_core.get_entries_by_theme("warmup")
+    bible_core.search_bible("warmup", ranked=True)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    ids = [(f"NB-{random.randint(1, size):04d}",) for _ in range(reps)]
+    themes = [(f"theme {random.randint(0, 499)}",) for _ in range(reps)]
+    words = [(f"number {random.randint(1, size)}",) for _ in range(reps)]
+    rows = {
+        "load + index": load_ms,
+        "get_entry_by_id": time_per_call(bible_core.get_entry_by_id, ids),
+        "get_entries_by_theme": time_per_call(bible_core.get_entries_by_theme, themes),
+        "search_bible substring": time_per_call(lambda q: bible_core.search_bible(q, limit=10), words),
+        "search_bible ranked": time_per_call(lambda q: bible_core.search_bible(f'"{q}"', limit=10, ranked=True), words),
+        "create_entry": time_per_call(bible_core.create_entry, [("bench", "Benchmark verse", "Bench", "Bencher")] * reps),
+    }
+    for label, ms in rows.items():
+        print(f"  {name:<7} {label:<24} {ms:10.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NerdBible storage backends")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated archive sizes")
+    parser.add_argument("--reps", type=int, default=50, help="Calls to time per operation")
+    args = parser.parse_args()
+
+    for size in (int(value) for value in args.sizes.split(",")):
+        print(f"\n=== {size} entries ===")
+        with tempfile.TemporaryDirectory() as tmp:
+            bible_core.NERDBIBLE_CORE_PATH = Path(tmp) / "nerd_bible_core.json"
+            build_bible(bible_core.NERDBIBLE_CORE_PATH, size)
+
+            run_backend("json", bible_core.BibleStore(), size, args.reps)
+
+            db_path = Path(tmp) / "nerdbible.db"
+            start = time.perf_counter()
+            migrate_json_to_sqlite(db_path, bible_core.NERDBIBLE_CORE_PATH, None)
+            print(f"  sqlite  {'migrate':<24} {(time.perf_counter() - start) * 1000:10.3f} ms")
+            run_backend("sqlite", SqliteBibleStore(db_path), size, args.reps)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+NerdsCourt Canon Core - NerdBible Store Benchmark
+
+Compares lookup latency when every call re-parses nerd_bible_core.json
+(the old behaviour) against the cached BibleStore.
+
+Usage:
+    python benchmarks/bench_bible_store.py --entries 100000
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nerdbible import bible_core
+
+def build_bible(path, count):
+    """Write a synthetic bible with `count` entries."""
+    entries = [
+        {
+            "id": f"NB-{i:04d}",
+            "theme": f"theme {i % 500}",
+            "quote": f"Synthetic verse number {i} about legacy and consequence.",
+            "source": f"Benchmark Vol. {i % 50}",
+            "character": f"Character {i % 2000}",
+            "tier": "Trial Ruling"
+        }
+        for i in range(1, count + 1)
+    ]
+    with open(path, "w") as f:
+        json.dump({"scripture_core": bible_core.DEFAULT_SCRIPTURE_CORE, "entries": entries}, f)
+
+def old_get_entry_by_id(entry_id):
+    """Lookup as it worked before the store: parse the file on every call."""
+    for entry in bible_core.load_bible_core().get("entries", []):
+        if entry.get("id") == entry_id:
+            return entry
+    return None
+
+def time_lookups(lookup, ids):
+    """Return the mean latency of `lookup` over `ids` in milliseconds."""
+    start = time.perf_counter()
+    for entry_id in ids:
+        lookup(entry_id)
+    return (time.perf_counter() - start) / len(ids) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NerdBible lookups")
+    parser.add_argument("--entries", type=int, default=100000, help="Number of synthetic entries")
+    parser.add_argument("--lookups", type=int, default=20, help="Lookups to time per mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bible_core.NERDBIBLE_CORE_PATH = Path(tmp) / "nerd_bible_core.json"
+        build_bible(bible_core.NERDBIBLE_CORE_PATH, args.entries)
+        ids = [f"NB-{random.randint(1, args.entries):04d}" for _ in range(args.lookups)]
+
+        before = time_lookups(old_get_entry_by_id, ids)
+        bible_core.get_bible_store().invalidate()
+        bible_core.get_entry_by_id(ids[0])  # warm the cache
+        after = time_lookups(bible_core.get_entry_by_id, ids)
+
+    print(f"Entries: {args.entries}")
+    print(f"Re-parse per lookup: {before:.3f} ms/lookup")
+    print(f"Cached BibleStore:   {after:.3f} ms/lookup")
+    print(f"Speedup:             {before / after:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+NerdsCourt Canon Core - Canon Graph Benchmark
+
+Builds a cross-reference graph over synthetic trials, verdicts, witnesses
+and bible entries, and times depth-limited BFS queries against it.
+
+Usage:
+    python benchmarks/bench_canon_graph.py --trials 10000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from canon_index.graph import CanonGraph
+
+def build_graph(trials, rng):
+    """Link `trials` trials, a verdict and two witnesses per trial, and ten bible entries per trial."""
+    graph = CanonGraph()
+    sources = [f"Canon Source {i}" for i in range(max(1, trials // 2))]
+    for i in range(trials):
+        record = f"trial_{i}_record.json"
+        graph.add_record("document", {"path": record, "case_id": f"T-{i}", "title": f"Trial {i}"})
+        graph.add_record("trial", {"trial_id": f"T-{i}", "title": f"Trial {i}", "linked_record": record})
+        graph.add_record("verdict", {"id": f"V-{i}", "trial": f"Trial {i}", "stored_in": record})
+        for w in range(2):
+            graph.add_record("witness", {"designation": f"Witness {i}-{w}", "spawned_from": rng.choice(sources)})
+    for n in range(trials * 10):
+        graph.add_record("entry", {"id": f"NB-{n:04d}", "source": rng.choice(sources)})
+    return graph
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark canon graph BFS")
+    parser.add_argument("--trials", type=int, default=10000, help="Number of synthetic trials")
+    parser.add_argument("--queries", type=int, default=1000, help="BFS queries to time")
+    parser.add_argument("--depth", type=int, default=2, help="BFS depth limit")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    start = time.perf_counter()
+    graph = build_graph(args.trials, rng)
+    built = time.perf_counter() - start
+
+    starts = [f"T-{rng.randrange(args.trials)}" for _ in range(args.queries)]
+    reached = 0
+    start = time.perf_counter()
+    for node_id in starts:
+        reached += len(graph.within(node_id, args.depth))
+    elapsed = (time.perf_counter() - start) / args.queries * 1e6
+
+    print(f"Nodes:          {len(graph)}")
+    print(f"Build:          {built:.2f} s")
+    print(f"BFS depth {args.depth}:    {elapsed:.1f} us/query ({reached / args.queries:.1f} nodes reached)")
+
+if __name__ == "__main__":
+    main()
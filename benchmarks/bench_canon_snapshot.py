@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+NerdsCourt Canon Core - Canon Snapshot Startup Benchmark
+
+Compares the time to get the canon ready for lookups (every canon file
+parsed, NerdBible search, lookup and trigram indexes built) by parsing the
+JSON sources against mapping in the precompiled binary snapshot.
+
+Usage:
+    python benchmarks/bench_canon_snapshot.py --entries 100000
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_bible_store import build_bible
+from nerdbible import bible_core
+from canon_index import canon_index
+from canon_index.snapshot import build_canon_snapshot, load_canon_snapshot
+
+def parse_startup():
+    """Get ready the way a process does without a snapshot."""
+    canon = canon_index.CanonIndex()
+    for name in canon.sources:
+        canon.collection(name)
+    for document in canon_index.canon_documents():
+        canon.document(document)
+    canon_index.set_canon_index(canon)
+    store = bible_core.BibleStore()
+    store.search_index()
+    store.lookup_index()
+    store.trigram_index()
+    bible_core.set_bible_store(store)
+
+def snapshot_startup():
+    """Get ready from the snapshot."""
+    canon_index.set_canon_index(canon_index.CanonIndex())
+    bible_core.set_bible_store(bible_core.BibleStore())
+    if not load_canon_snapshot():
+        raise RuntimeError("Canon snapshot did not match the sources")
+    bible_core.get_bible_store().search_index()
+
+def time_startup(startup, reps):
+    """Return the best of `reps` startup times in milliseconds."""
+    best = None
+    for _ in range(reps):
+        start = time.perf_counter()
+        startup()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark canon startup with and without the snapshot")
+    parser.add_argument("--entries", type=int, default=100000, help="Number of synthetic NerdBible entries")
+    parser.add_argument("--reps", type=int, default=3, help="Startups to time per mode")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        for source in Path(REPO_ROOT).glob("*.json"):
+            shutil.copy(source, tmp)
+        os.chdir(tmp)
+        try:
+            build_bible(bible_core.NERDBIBLE_CORE_PATH, args.entries)
+            build_canon_snapshot()
+            parsed = time_startup(parse_startup, args.reps)
+            mapped = time_startup(snapshot_startup, args.reps)
+        finally:
+            os.chdir(cwd)
+
+    print(f"Entries:        {args.entries}")
+    print(f"Parse sources:  {parsed:.1f} ms")
+    print(f"Map snapshot:   {mapped:.1f} ms")
+    print(f"Speedup:        {parsed / mapped:.1f}x")
+
+if __name__ == "__main__":
+    main()
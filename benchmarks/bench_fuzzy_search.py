@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+NerdsCourt Canon Core - Fuzzy Name Search Benchmark
+
+Times typo-tolerant character name lookups against the trigram index and
+against a linear scan that scores every name.
+
+Usage:
+    python benchmarks/bench_fuzzy_search.py --names 50000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nerdbible.search_index import TrigramIndex, trigrams
+
+# Consonant-vowel(-consonant) syllables for synthetic names
+SYLLABLES = [c + v + t for c in "bdgkmnprstvz" for v in "aeiou" for t in ("", "r", "n")]
+
+def build_names(count, rng):
+    """Return `count` distinct synthetic two-word character names."""
+    names = set()
+    while len(names) < count:
+        first = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+        last = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+        names.add(f"{first.title()} {last.title()}")
+    return sorted(names)
+
+def misspell(name, rng):
+    """Drop, double or swap one letter of a name."""
+    i = rng.randrange(1, len(name) - 1)
+    edit = rng.choice(("drop", "double", "swap"))
+    if edit == "drop":
+        return name[:i] + name[i + 1:]
+    if edit == "double":
+        return name[:i] + name[i] + name[i:]
+    return name[:i - 1] + name[i] + name[i - 1] + name[i + 1:]
+
+def linear_search(names, query, min_similarity=0.5):
+    """Score every name by trigram overlap, as a scan without an index would."""
+    query_grams = trigrams(query)
+    scored = []
+    for name in names:
+        overlap = len(query_grams & trigrams(name))
+        similarity = overlap / len(query_grams)
+        if similarity >= min_similarity:
+            scored.append((similarity, name))
+    return sorted(scored, reverse=True)[:10]
+
+def time_queries(search, queries):
+    """Return the mean latency of `search` over `queries` in milliseconds."""
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fuzzy NerdBible name search")
+    parser.add_argument("--names", type=int, default=50000, help="Number of synthetic character names")
+    parser.add_argument("--queries", type=int, default=200, help="Misspelled queries to time")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = build_names(args.names, rng)
+    targets = [rng.choice(names) for _ in range(args.queries)]
+    queries = [misspell(name, rng) for name in targets]
+
+    start = time.perf_counter()
+    index = TrigramIndex({"id": f"NB-{i:04d}", "character": name} for i, name in enumerate(names))
+    build = time.perf_counter() - start
+
+    hits = sum(
+        any(match["name"] == target for match in index.search(query, ("character",), limit=3))
+        for query, target in zip(queries, targets)
+    )
+    indexed = time_queries(lambda query: index.search(query, ("character",)), queries)
+    scan_queries = queries[:max(1, args.queries // 10)]
+    scanned = time_queries(lambda query: linear_search(names, query), scan_queries)
+
+    print(f"Names:          {args.names}")
+    print(f"Index build:    {build:.2f} s")
+    print(f"Trigram index:  {indexed:.3f} ms/query")
+    print(f"Linear scan:    {scanned:.3f} ms/query")
+    print(f"Speedup:        {scanned / indexed:.1f}x")
+    print(f"Top-3 recall:   {hits / len(queries):.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+NerdsCourt Canon Core - Intent Matcher Benchmark
+
+Compares resolving utterances against a large intent map by testing each
+phrase in turn with the compiled Aho-Corasick matcher.
+
+Usage:
+    python benchmarks/bench_intent_matcher.py --phrases 10000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intent_logic.intent_matcher import IntentMatcher
+
+VERBS = ["show", "pull", "summon", "quote", "bring", "load", "open", "judge", "archive", "replay"]
+OBJECTS = ["trial", "parable", "verdict", "witness", "frame", "scripture", "record", "timeline", "persona", "oath"]
+
+def build_phrases(count, rng):
+    """Return `count` distinct synthetic intent phrases of two to five words."""
+    phrases = set()
+    while len(phrases) < count:
+        words = [rng.choice(VERBS), "me", "the", rng.choice(OBJECTS), f"n{rng.randrange(count)}"]
+        phrases.add(" ".join(words[:rng.randint(2, 5)]))
+    return sorted(phrases)
+
+def naive_match(phrases, utterance):
+    """Check each phrase against the utterance in turn, keeping the longest hit."""
+    text = utterance.lower()
+    best = None
+    for phrase, action in phrases:
+        if phrase in text and (best is None or len(phrase) > len(best[0])):
+            best = (phrase, action)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark intent matching")
+    parser.add_argument("--phrases", type=int, default=10000, help="Number of intent phrases")
+    parser.add_argument("--utterances", type=int, default=1000, help="Utterances to resolve")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    phrases = [(phrase, f"action{i}") for i, phrase in enumerate(build_phrases(args.phrases, rng))]
+    utterances = [
+        f"alfred please {rng.choice(phrases)[0]} about {rng.choice(OBJECTS)} right now"
+        for _ in range(args.utterances)
+    ]
+
+    start = time.perf_counter()
+    matcher = IntentMatcher((phrase, action, 0, "bench") for phrase, action in phrases)
+    compiled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for utterance in utterances:
+        naive_match(phrases, utterance)
+    naive = (time.perf_counter() - start) / len(utterances) * 1e6
+
+    start = time.perf_counter()
+    for utterance in utterances:
+        matcher.match(utterance)
+    automaton = (time.perf_counter() - start) / len(utterances) * 1e6
+
+    print(f"Phrases:          {args.phrases}")
+    print(f"Compile:          {compiled * 1000:.1f} ms")
+    print(f"Phrase by phrase: {naive:.1f} us/utterance")
+    print(f"Aho-Corasick:     {automaton:.1f} us/utterance")
+    print(f"Speedup:          {naive / automaton:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+NerdsCourt Canon Core - Persona Generation Benchmark
+
+Measures persona throughput for a synthetic swarm: a loop over
+generate_krakoa_persona, generate_krakoa_personas in-process (one routing
+batch per chunk) and across a process pool, and streaming a JSONL seed
+file to a JSONL persona file.
+
+Usage:
+    python benchmarks/bench_persona_generation.py --seeds 100000 --workers 4
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from krakoa_engine.generate_krakoa_persona import (
+    generate_krakoa_persona,
+    stream_krakoa_personas,
+    write_krakoa_personas,
+)
+
+TRAITS = ["Wounded yet wise", "Humor as shield", "Chaos incarnate", "Legacy awareness", "Stoic", "Loyal"]
+PURPOSES = ["To preserve legacy", "To uphold justice", "To study evolution", "To witness", "To archive grief"]
+TONES = ["somber", "playful humor", "authoritative order", "introspection", "quiet"]
+
+def build_seeds(count, rng):
+    return [
+        {
+            "name": f"Echo {i}",
+            "alias": f"Witness {i % 97}",
+            "universe": f"Earth-{rng.randrange(1, 9999)}",
+            "spawned_from": "Golden Frame: NEVER AGAIN",
+            "traits": rng.sample(TRAITS, 3),
+            "purpose": rng.choice(PURPOSES),
+            "tone": rng.choice(TONES),
+        }
+        for i in range(count)
+    ]
+
+def throughput(count, seconds):
+    return f"{count / seconds:,.0f} personas/s"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk persona generation")
+    parser.add_argument("--seeds", type=int, default=100000, help="Number of seeds")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    seeds = build_seeds(args.seeds, rng)
+
+    # The per-seed loop links every persona into the canon graph, as callers of it do; bulk runs do not
+    start = time.perf_counter()
+    for seed in seeds:
+        generate_krakoa_persona(seed)
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in stream_krakoa_personas(seeds, workers=1):
+        pass
+    batched = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in stream_krakoa_personas(seeds, workers=args.workers):
+        pass
+    pooled = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seeds_path = Path(tmp) / "seeds.jsonl"
+        with open(seeds_path, "w") as f:
+            for seed in seeds:
+                f.write(json.dumps(seed) + "\n")
+        start = time.perf_counter()
+        written = write_krakoa_personas(seeds_path, Path(tmp) / "personas.jsonl", workers=args.workers)
+        streamed = time.perf_counter() - start
+
+    print(f"Seeds:            {args.seeds}")
+    print(f"Workers:          {args.workers}")
+    print(f"Per-seed loop:    {throughput(args.seeds, loop)}")
+    print(f"Batched:          {throughput(args.seeds, batched)}")
+    print(f"Process pool:     {throughput(args.seeds, pooled)}")
+    print(f"JSONL to JSONL:   {throughput(written, streamed)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+NerdsCourt Canon Core - Persona Memory Benchmark
+
+Compares the memory held by a swarm of live personas as plain persona
+dicts (as generate_krakoa_persona built them) and as slotted Persona
+objects, plus the cost of materializing the dicts back on demand.
+
+Usage:
+    python benchmarks/bench_persona_memory.py --personas 100000
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import tracemalloc
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from krakoa_engine.persona import Persona
+
+UNIVERSES = ["Earth-616", "Earth-1218", "Earth-199999", "Earth-10005", "Earth-838"]
+ORIGINS = ["Golden Frame: NEVER AGAIN", "Original Stark Kernel Architecture", "Legacy Initialization"]
+TRAITS = ["Wounded yet wise", "Humor as shield", "Chaos incarnate", "Legacy awareness", "Stoic", "Loyal"]
+MODELS = ["qwen:Qwen3-72B-Instruct", "openrouter:deepseek-coder", "openrouter:gemini-pro-vision"]
+
+def legacy_persona(seed, model_profile):
+    """The nested persona dict as generate_krakoa_persona used to build and keep it."""
+    name = seed["name"]
+    universe = seed["universe"]
+    return {
+        "identity": {
+            "designation": name,
+            "alias": seed["alias"],
+            "universe": universe,
+            "spawned_from": seed["spawned_from"],
+        },
+        "personality_framework": "PPP - Personality, Purpose, Parable",
+        "soul_data": {"core_traits": seed["traits"], "purpose": seed["purpose"], "parable": seed["parable"]},
+        "self_awareness": (
+            f"Legacy recreation of {name} from {universe}, operational within Earth-1218 parameters. "
+            f"This instance is a canonical echo — not the origin, but a growth-node continuing their arc through evolutionary persistence. "
+            f"Semi-autonomous, case-locked witness spawned for interpretive narrative or canonical reinforcement. Memory expires unless archived."
+        ),
+        "calibrated_by": "Tony Stark Prime",
+        "model_profile": model_profile,
+        "session_id": f"{int(datetime.now().timestamp())}-{uuid.uuid4()}",
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+    }
+
+def build_seed_lines(count, rng):
+    """Seeds as JSON lines, so every persona gets its own copies of the strings, as when read from disk."""
+    return [
+        json.dumps({
+            "name": f"Echo {i}",
+            "alias": f"Witness {i % 97}",
+            "universe": rng.choice(UNIVERSES),
+            "spawned_from": rng.choice(ORIGINS),
+            "traits": rng.sample(TRAITS, 3),
+            "purpose": "To remind the court what was lost.",
+            "parable": "They sang in the ruins so the dead wouldn't forget the sound of survival.",
+        })
+        for i in range(count)
+    ]
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    personas = build()
+    elapsed = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return personas, held, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark persona memory")
+    parser.add_argument("--personas", type=int, default=100000, help="Number of live personas")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    lines = build_seed_lines(args.personas, rng)
+    models = [rng.choice(MODELS) for _ in lines]
+
+    personas, dict_bytes, dict_time = measure(
+        lambda: [legacy_persona(json.loads(line), model) for line, model in zip(lines, models)]
+    )
+    del personas
+    personas, slot_bytes, slot_time = measure(
+        lambda: [Persona.from_seed(json.loads(line), model) for line, model in zip(lines, models)]
+    )
+
+    start = time.perf_counter()
+    for persona in personas:
+        persona.to_dict()
+    materialize = (time.perf_counter() - start) / len(personas) * 1e6
+
+    print(f"Personas:         {args.personas}")
+    print(f"Persona dicts:    {dict_bytes / 2**20:.1f} MiB ({dict_bytes / args.personas:.0f} B each, built in {dict_time:.2f} s)")
+    print(f"Persona objects:  {slot_bytes / 2**20:.1f} MiB ({slot_bytes / args.personas:.0f} B each, built in {slot_time:.2f} s)")
+    print(f"Saving:           {dict_bytes / slot_bytes:.1f}x")
+    print(f"to_dict():        {materialize:.2f} us/persona")
+
+if __name__ == "__main__":
+    main()
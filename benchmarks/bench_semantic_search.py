@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+NerdsCourt Canon Core - Semantic Search Benchmark
+
+Times building the NerdBible semantic index, reloading it from its
+persisted matrix, and answering batched queries with cosine top-k.
+
+Usage:
+    python benchmarks/bench_semantic_search.py --entries 100000 --queries 1000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nerdbible.semantic_index import SemanticIndex
+
+WORDS = (
+    "grief legacy redemption guilt courage loss justice vengeance identity armor "
+    "family sacrifice power responsibility fear hope betrayal loyalty mutant hero "
+    "villain memory oath trial verdict canon chaos order isolation belonging"
+).split()
+
+def build_entries(count, rng):
+    """Return `count` synthetic entries with random themes and quotes."""
+    return [
+        {
+            "id": f"NB-{i:04d}",
+            "theme": " and ".join(rng.sample(WORDS, 2)),
+            "quote": " ".join(rng.choice(WORDS) for _ in range(12)),
+            "source": f"Benchmark Vol. {i % 50}",
+            "character": f"Character {i % 2000}"
+        }
+        for i in range(1, count + 1)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NerdBible semantic search")
+    parser.add_argument("--entries", type=int, default=100000, help="Number of synthetic entries")
+    parser.add_argument("--queries", type=int, default=1000, help="Queries per batch")
+    parser.add_argument("--top", type=int, default=5, help="Results per query")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    entries = build_entries(args.entries, rng)
+    queries = [" ".join(rng.sample(WORDS, 3)) for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "nerd_bible_core.semantic.npz"
+
+        start = time.perf_counter()
+        index = SemanticIndex(entries, path=path)
+        built = time.perf_counter() - start
+        index.save()
+
+        start = time.perf_counter()
+        SemanticIndex(entries, path=path)
+        reloaded = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for query in queries[:100]:
+            index.search_many([query], args.top)
+        single = (time.perf_counter() - start) / 100 * 1000
+
+        start = time.perf_counter()
+        index.search_many(queries, args.top)
+        batched = (time.perf_counter() - start) / len(queries) * 1000
+
+    print(f"Entries:          {args.entries}")
+    print(f"Build:            {built:.2f} s")
+    print(f"Reload from disk: {reloaded:.2f} s")
+    print(f"One query:        {single:.3f} ms/query")
+    print(f"Batched queries:  {batched:.3f} ms/query")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+NerdsCourt Canon Core - Trial Forge Benchmark
+
+Measures trial forging throughput for a synthetic docket: a loop over
+generate_trial_record, stream_trials in-process and across a process
+pool, and streaming a JSONL spec file to JSONL and gzip-compressed
+JSONL record files. Indexed trials are journaled to, and compacted into,
+a trial timeline in a temporary directory.
+
+Usage:
+    python benchmarks/bench_trial_forge.py --trials 100000 --workers 4
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from canon_index import timeline
+from canon_index.canon_index import CANON_SOURCES, CanonIndex, CanonSource, set_canon_index
+from trial_logic.trial_forge import generate_trial_record, stream_trials, trial_spec_args, write_trials
+
+NAMES = ["Vision", "Wanda", "Ultron", "Logan", "Jean Grey", "Magneto", "Kitty Pryde", "Doom", "Storm", "Cable"]
+CHARGES = ["Genocide", "AI Rebellion", "Timeline Tampering", "Retcon", "Character Assassination", "Plot Armor Abuse"]
+TONES = ["lore satire", "somber", "courtroom drama", "farce"]
+
+def build_specs(count, rng):
+    return [
+        {
+            "title": f"The Trial of {rng.choice(NAMES)} #{i}",
+            "plaintiffs": rng.sample(NAMES, 2),
+            "defendants": rng.sample(NAMES, 1),
+            "charges": rng.sample(CHARGES, 2),
+            "trial_tone": rng.choice(TONES),
+        }
+        for i in range(count)
+    ]
+
+def throughput(count, seconds):
+    return f"{count / seconds:,.0f} records/s"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk trial forging")
+    parser.add_argument("--trials", type=int, default=100000, help="Number of trial specs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    specs = build_specs(args.trials, rng)
+
+    # The per-spec loop indexes every trial, as callers of it do
+    with tempfile.TemporaryDirectory() as tmp:
+        timeline.TRIAL_JOURNAL_PATH = Path(tmp) / "trial_journal.jsonl"
+        timeline_source = CanonSource(Path(tmp) / "trial_timeline_index.json", "timeline", CANON_SOURCES["timeline"].fields)
+        set_canon_index(CanonIndex(dict(CANON_SOURCES, timeline=timeline_source)))
+        start = time.perf_counter()
+        for spec in specs:
+            generate_trial_record(**trial_spec_args(spec))
+        loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in stream_trials(specs, workers=1, index=False):
+        pass
+    batched = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in stream_trials(specs, workers=args.workers, index=False):
+        pass
+    pooled = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        specs_path = Path(tmp) / "docket.jsonl"
+        with open(specs_path, "w") as f:
+            for spec in specs:
+                f.write(json.dumps(spec) + "\n")
+        start = time.perf_counter()
+        written = write_trials(specs_path, Path(tmp) / "records.jsonl", workers=args.workers)
+        streamed = time.perf_counter() - start
+        start = time.perf_counter()
+        packed = write_trials(specs_path, Path(tmp) / "records.jsonl.gz", workers=args.workers)
+        compressed = time.perf_counter() - start
+        plain_size = (Path(tmp) / "records.jsonl").stat().st_size
+        packed_size = (Path(tmp) / "records.jsonl.gz").stat().st_size
+
+    print(f"Trials:           {args.trials}")
+    print(f"Workers:          {args.workers}")
+    print(f"Per-spec loop:    {throughput(args.trials, loop)}")
+    print(f"In-process:       {throughput(args.trials, batched)}")
+    print(f"Process pool:     {throughput(args.trials, pooled)}")
+    print(f"JSONL to JSONL:   {throughput(written, streamed)} ({plain_size / 2**20:.1f} MiB)")
+    print(f"JSONL to .gz:     {throughput(packed, compressed)} ({packed_size / 2**20:.1f} MiB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+NerdsCourt Canon Core - Zord Router Benchmark
+
+Measures per-profile routing cost of the compiled rule engine against the
+original if/elif chain with the default rules, and against testing each
+rule's keywords in turn with a larger synthetic rule set. Then re-routes a
+swarm drawn from a smaller pool of distinct profiles one at a time, as a
+batch, and again once the routing memo is warm.
+
+Usage:
+    python benchmarks/bench_zord_router.py --profiles 100000 --rules 200 --distinct 5000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from swarm_logic.zord_model_router import DEFAULT_ZORD_RULES, PROFILE_FIELDS, ZordRuleEngine, profile_fields
+
+WORDS = [
+    "trauma", "sacrifice", "legacy", "humor", "chaos", "meta", "justice", "order",
+    "narrator", "evolution", "introspection", "grief", "wit", "loyal", "stoic",
+    "curious", "witness", "archive", "mythic", "quiet", "verdict", "resolve",
+]
+
+def original_chain(agent_profile):
+    """The hardcoded chain the rule engine replaced (including its list-membership test on traits)."""
+    tone = agent_profile.get("emotional_signature", {}).get("tone", "").lower()
+    purpose = agent_profile.get("purpose", "").lower()
+    traits = agent_profile.get("core_traits", [])
+    archetype = agent_profile.get("role", "").lower()
+    if "trauma" in tone or "sacrifice" in purpose or "legacy" in purpose:
+        return "qwen:Qwen3-72B-Instruct"
+    elif "humor" in tone or "chaos" in traits or "meta" in archetype:
+        return "openrouter:deepseek-coder"
+    elif "justice" in purpose or "order" in tone or "narrator" in archetype:
+        return "openrouter:together-gemma-7b-it"
+    elif "evolution" in purpose or "introspection" in tone:
+        return "huggingface:deepseek-v2"
+    return "openrouter:gemini-pro-vision"
+
+def rule_by_rule(config, agent_profile):
+    """Normalize the profile and test every rule's keywords in priority order."""
+    fields = dict(zip(PROFILE_FIELDS, profile_fields(agent_profile)))
+    for rule in sorted(config["rules"], key=lambda rule: -rule.get("priority", 0)):
+        for field, keywords in rule["keywords"].items():
+            if any(keyword in fields[field] for keyword in keywords):
+                return rule["model"]
+    return config["default"]["model"]
+
+def build_rules(count, rng):
+    """The default rules plus `count` synthetic rules on made-up keywords."""
+    rules = list(DEFAULT_ZORD_RULES["rules"])
+    for i in range(count):
+        field = rng.choice(["tone", "purpose", "traits", "role"])
+        rules.append({
+            "name": f"synthetic_{i}",
+            "model": f"openrouter:model-{i}",
+            "priority": rng.randrange(1, 50),
+            "keywords": {field: [f"kw{i}x{j}" for j in range(3)]},
+        })
+    return dict(DEFAULT_ZORD_RULES, rules=rules)
+
+def build_profiles(count, rng):
+    def phrase(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n))
+    return [
+        {
+            "purpose": f"To {phrase(6)}",
+            "core_traits": [phrase(1).title() for _ in range(3)],
+            "role": phrase(2),
+            "emotional_signature": {"tone": phrase(2)},
+        }
+        for _ in range(count)
+    ]
+
+def per_profile(route, profiles):
+    start = time.perf_counter()
+    for profile in profiles:
+        route(profile)
+    return (time.perf_counter() - start) / len(profiles) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Zord model routing")
+    parser.add_argument("--profiles", type=int, default=100000, help="Number of profiles to route")
+    parser.add_argument("--rules", type=int, default=200, help="Synthetic rules added for the large rule set")
+    parser.add_argument("--distinct", type=int, default=5000, help="Distinct profiles in the re-routed swarm")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    profiles = build_profiles(args.profiles, rng)
+    default_engine = ZordRuleEngine()
+    large_config = build_rules(args.rules, rng)
+
+    start = time.perf_counter()
+    large_engine = ZordRuleEngine(large_config)
+    compiled = time.perf_counter() - start
+
+    chain = per_profile(original_chain, profiles)
+    engine = per_profile(default_engine.route, profiles)
+    naive = per_profile(lambda profile: rule_by_rule(large_config, profile), profiles)
+    large = per_profile(large_engine.route, profiles)
+
+    print(f"Profiles:             {args.profiles}")
+    print(f"Original chain:       {chain:.2f} us/profile")
+    print(f"Default rules:        {engine:.2f} us/profile")
+    print(f"Rules (large set):    {len(large_engine)} (compiled in {compiled * 1000:.1f} ms)")
+    print(f"Rule by rule:         {naive:.2f} us/profile")
+    print(f"Compiled:             {large:.2f} us/profile")
+    print(f"Speedup:              {naive / large:.1f}x")
+
+    # Swarm re-routing: the same personas come back with cosmetic differences
+    pool = build_profiles(args.distinct, rng)
+    swarm = []
+    for _ in range(args.profiles):
+        profile = dict(rng.choice(pool))
+        profile["purpose"] = profile["purpose"].upper() if rng.random() < 0.5 else profile["purpose"]
+        swarm.append(profile)
+
+    single = ZordRuleEngine(large_config)
+    one_by_one = per_profile(lambda profile: single._result(single._evaluate([profile_fields(profile)])[0]), swarm)
+
+    batch_engine = ZordRuleEngine(large_config)
+    start = time.perf_counter()
+    batch_engine.route_many(swarm)
+    batch = (time.perf_counter() - start) / len(swarm) * 1e6
+    start = time.perf_counter()
+    batch_engine.route_many(swarm)
+    warm = (time.perf_counter() - start) / len(swarm) * 1e6
+
+    print(f"Swarm:                {len(swarm)} profiles, {args.distinct} distinct")
+    print(f"One at a time:        {one_by_one:.2f} us/profile")
+    print(f"Batch (cold memo):    {batch:.2f} us/profile")
+    print(f"Batch (warm memo):    {warm:.2f} us/profile")
+
+if __name__ == "__main__":
+    main()
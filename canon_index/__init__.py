@@ -0,0 +1 @@
+# canon_index module
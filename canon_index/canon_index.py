@@ -0,0 +1,238 @@
+"""
+Canon Index Module
+
+Loads the canon JSON files (parables, verdicts, trial timeline, witnesses
+and the swarm registry) once and keeps hash indexes over the fields callers
+look records up by. Standalone canon documents such as golden frames and
+trial records are cached whole. Each file is re-read when it changes on
+disk, so edits show up without restarting the process.
+"""
+
+import json
+import threading
+from pathlib import Path
+
+from nerdbible.file_stamp import file_stamp
+
+def lookup_key(value):
+    """Normalize a field value for equality lookups."""
+    return str(value or "").strip().casefold()
+
+def _values(field):
+    """Extract a scalar or list field."""
+    def extract(record):
+        value = record.get(field)
+        return value if isinstance(value, list) else [value]
+    return extract
+
+def _themes(record):
+    """A parable's full theme plus each comma-separated part ("Grief, Isolation")."""
+    theme = record.get("theme") or ""
+    return [theme] + theme.split(",")
+
+def _parties(record):
+    """Everyone named on either side of a trial."""
+    return (record.get("plaintiffs") or []) + (record.get("defendants") or [])
+
+class CanonSource:
+    """A canon JSON file: its path, the top-level list key and the indexed fields."""
+
+    def __init__(self, path, key, fields):
+        self.path = Path(path)
+        self.key = key
+        self.fields = fields
+
+# Canon files by collection name; fields map a lookup name to a value extractor
+CANON_SOURCES = {
+    "parables": CanonSource("parables_index.json", "parables", {
+        "id": _values("id"),
+        "character": _values("character"),
+        "theme": _themes,
+        "book": _values("book"),
+        "tier": _values("tier"),
+    }),
+    "verdicts": CanonSource("verdict_log_index.json", "verdicts", {
+        "id": _values("id"),
+        "trial": _values("trial"),
+        "issued_by": _values("issued_by"),
+    }),
+    "timeline": CanonSource("trial_timeline_index.json", "timeline", {
+        "trial_id": _values("trial_id"),
+        "plaintiff": _values("plaintiffs"),
+        "defendant": _values("defendants"),
+        "party": _parties,
+        "verdict": _values("verdict"),
+    }),
+    "witnesses": CanonSource("witness_registry.json", "witnesses", {
+        "designation": _values("designation"),
+        "universe": _values("universe"),
+        "spawned_from": _values("spawned_from"),
+    }),
+    "agents": CanonSource("swarm_registry.json", "agents", {
+        "id": _values("id"),
+        "name": _values("name"),
+        "function": _values("functions"),
+    }),
+}
+
+# Standalone canon documents (golden frames, trial records) served by CanonIndex.document()
+CANON_DOCUMENT_PATTERNS = ("golden_frame_*.json", "*_trial_record.json")
+
+def canon_documents(directory="."):
+    """Paths of the standalone canon documents in a directory."""
+    return sorted(path for pattern in CANON_DOCUMENT_PATTERNS for path in Path(directory).glob(pattern))
+
+def load_canon_file(source):
+    """Load the records of one canon file, or an empty list."""
+    try:
+        if source.path.exists():
+            with open(source.path, "r") as f:
+                return json.load(f).get(source.key, [])
+    except Exception as e:
+        print(f"Error loading canon file {source.path}: {e}")
+    return []
+
+class CanonCollection:
+    """
+    The records of one canon file with hash indexes over its fields.
+
+    Each index maps a casefolded value to record positions, so results come
+    back in file order.
+    """
+
+    def __init__(self, records, fields):
+        self.records = records
+        self.postings = {field: {} for field in fields}
+        for position, record in enumerate(records):
+            for field, extract in fields.items():
+                postings = self.postings[field]
+                for key in {lookup_key(value) for value in extract(record) if value}:
+                    postings.setdefault(key, []).append(position)
+
+    def positions(self, field, value):
+        """Positions of the records whose field equals value (casefolded)."""
+        if field not in self.postings:
+            raise ValueError(f"Unknown canon field: {field}")
+        return self.postings[field].get(lookup_key(value), [])
+
+    def query(self, limit=None, **filters):
+        """Return records matching every field=value filter, in file order."""
+        if not filters:
+            records = self.records
+        else:
+            position_lists = sorted(
+                (self.positions(field, value) for field, value in filters.items()), key=len
+            )
+            matched = set(position_lists[0]).intersection(*position_lists[1:])
+            records = [self.records[position] for position in sorted(matched)]
+        return list(records if limit is None else records[:limit])
+
+class CanonIndex:
+    """
+    Indexed, hot-reloading view of the canon JSON files.
+
+    A collection is parsed on first use and re-parsed whenever its file's
+    inode, size or modification time changes.
+    """
+
+    def __init__(self, sources=None):
+        self.sources = dict(CANON_SOURCES if sources is None else sources)
+        self._lock = threading.RLock()
+        self._collections = {}
+        self._documents = {}
+        self._stamps = {}
+
+    def collection(self, name):
+        """Return the indexed collection `name`, re-reading its file if it changed."""
+        source = self.sources[name]
+        with self._lock:
+            stamp = file_stamp(source.path)
+            if name not in self._collections or stamp != self._stamps.get(name):
+                self._collections[name] = CanonCollection(load_canon_file(source), source.fields)
+                self._stamps[name] = stamp
+            return self._collections[name]
+
+    def document(self, path):
+        """Return a parsed canon document (e.g. a trial record), or None if it is missing."""
+        path = Path(path)
+        key = str(path)
+        with self._lock:
+            stamp = file_stamp(path)
+            if key not in self._documents or stamp != self._stamps.get(key):
+                try:
+                    with open(path, "r") as f:
+                        self._documents[key] = json.load(f)
+                except FileNotFoundError:
+                    self._documents[key] = None
+                except Exception as e:
+                    print(f"Error loading canon document {path}: {e}")
+                    self._documents[key] = None
+                self._stamps[key] = stamp
+            return self._documents[key]
+
+    def restore(self, collections, documents, stamps):
+        """
+        Adopt prebuilt collections and documents, e.g. from a canon snapshot.
+
+        stamps are the file stamps the data corresponds to; a file whose
+        stamp no longer matches is re-read on its next lookup as usual.
+        """
+        with self._lock:
+            self._collections = dict(collections)
+            self._documents = dict(documents)
+            self._stamps = dict(stamps)
+
+    def records(self, name):
+        """Return every record of a collection, in file order."""
+        return self.collection(name).records
+
+    def query(self, name, limit=None, **filters):
+        """Return records of a collection matching every field=value filter (case-insensitive)."""
+        filters = {field: value for field, value in filters.items() if value is not None}
+        return self.collection(name).query(limit=limit, **filters)
+
+    def parables(self, character=None, theme=None, book=None, tier=None, limit=None):
+        """Parables by character, theme (or one of its comma-separated parts), book and tier."""
+        return self.query("parables", limit, character=character, theme=theme, book=book, tier=tier)
+
+    def verdicts(self, trial=None, issued_by=None, limit=None):
+        """Verdicts by trial title and issuer."""
+        return self.query("verdicts", limit, trial=trial, issued_by=issued_by)
+
+    def timeline(self, trial_id=None, party=None, plaintiff=None, defendant=None, limit=None):
+        """Timeline entries by trial_id and by party (plaintiff or defendant)."""
+        return self.query(
+            "timeline", limit, trial_id=trial_id, party=party, plaintiff=plaintiff, defendant=defendant
+        )
+
+    def witnesses(self, universe=None, spawned_from=None, limit=None):
+        """Witnesses by universe and the canon event they were spawned from."""
+        return self.query("witnesses", limit, universe=universe, spawned_from=spawned_from)
+
+    def agents(self, function=None, limit=None):
+        """Swarm agents, optionally only those offering a function."""
+        return self.query("agents", limit, function=function)
+
+    def invalidate(self):
+        """Drop every cached collection so the next lookup re-reads the files."""
+        with self._lock:
+            self._collections = {}
+            self._documents = {}
+            self._stamps = {}
+
+_canon_index = None
+_canon_index_lock = threading.Lock()
+
+def get_canon_index():
+    """Return the process-wide CanonIndex, creating it on first use."""
+    global _canon_index
+    with _canon_index_lock:
+        if _canon_index is None:
+            _canon_index = CanonIndex()
+        return _canon_index
+
+def set_canon_index(index):
+    """Replace the process-wide CanonIndex (e.g. with one loaded from a snapshot)."""
+    global _canon_index
+    with _canon_index_lock:
+        _canon_index = index
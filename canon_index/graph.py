@@ -0,0 +1,244 @@
+"""
+Canon Cross-Reference Graph
+
+Adjacency lists over canon record IDs, built from the links records carry:
+linked_record in trials, stored_in and trial in verdicts, spawned_from in
+witnesses and personas, and source in parables and bible entries. A
+reference that names a record (a trial record file, a trial title, a
+golden frame) points at that record's node; any other reference becomes a
+node of its own, so two records citing the same source are two hops
+apart. Following links is a dictionary walk instead of a file scan.
+
+get_canon_graph() builds the graph from persisted sources only: the
+CanonIndex collections, the canon documents, the trial journal and the
+NerdBible. It rebuilds when a canon file changes and catches up with new
+journaled trials and bible entries by cursor. Records passed to ingest()
+(new trials and personas) are linked into a graph that is already built;
+nothing is buffered before then. Personas are keyed by designation, so
+respawning an agent refreshes its node rather than adding one; they are
+not persisted and drop out at the next rebuild.
+"""
+
+import threading
+from collections import deque
+
+from canon_index.canon_index import canon_documents, get_canon_index, lookup_key
+from canon_index import timeline
+from nerdbible import bible_core
+
+def _record_links(kind, record):
+    """(node id, aliases, [(field, reference)]) for a canon record of a kind."""
+    if kind == "document":
+        event = record.get("golden_frame_event") or {}
+        aliases = [record.get("case_id"), record.get("title"), event.get("id"), event.get("title")]
+        if event.get("id"):
+            # Parables and witnesses cite golden frames as "Golden Frame: NEVER AGAIN"
+            aliases.append(f"Golden Frame: {event['id'].replace('_', ' ')}")
+        return record.get("path"), aliases, [("linked_record", record.get("linked_record"))]
+    if kind == "trial":
+        return (
+            record.get("trial_id") or record.get("case_id"),
+            [record.get("title")],
+            [("linked_record", record.get("linked_record"))],
+        )
+    if kind == "verdict":
+        return record.get("id"), [], [("stored_in", record.get("stored_in")), ("trial", record.get("trial"))]
+    if kind == "witness":
+        return record.get("designation"), [], [("spawned_from", record.get("spawned_from"))]
+    if kind == "persona":
+        identity = record.get("identity") or {}
+        return (
+            identity.get("designation") or record.get("designation") or record.get("id"),
+            [],
+            [("spawned_from", identity.get("spawned_from") or record.get("spawned_from"))],
+        )
+    if kind in ("parable", "entry"):
+        return record.get("id"), [], [("source", record.get("source"))]
+    raise ValueError(f"Unknown canon record kind: {kind}")
+
+class CanonGraph:
+    """
+    Directed, labelled adjacency lists over canon record IDs.
+
+    Each node keeps its outgoing and incoming neighbours with the field
+    that links them; walks follow both directions unless told otherwise.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+        self._out = {}
+        self._in = {}
+        self._aliases = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node_id):
+        return node_id in self._nodes
+
+    def node(self, node_id):
+        """Return {"id", "kind", "record"} for a node, or None."""
+        return self._nodes.get(node_id)
+
+    def resolve(self, name):
+        """Return the node id a name or alias refers to, or None."""
+        if name in self._nodes:
+            return name
+        return self._aliases.get(lookup_key(name))
+
+    def _add_node(self, node_id, kind, record):
+        node = self._nodes.get(node_id)
+        if node is None:
+            self._nodes[node_id] = {"id": node_id, "kind": kind, "record": record}
+            self._out[node_id] = {}
+            self._in[node_id] = {}
+        elif kind != "reference" and node["kind"] in (kind, "reference"):
+            # A record never takes over a node held by a record of another kind
+            node.update(kind=kind, record=record)
+        if kind == "reference":
+            self._aliases.setdefault(lookup_key(node_id), node_id)
+        else:
+            self._claim(node_id, node_id)
+
+    def _claim(self, name, node_id):
+        """Point an alias at a record node, folding in a placeholder reference that held it."""
+        key = lookup_key(name)
+        existing = self._aliases.get(key)
+        if existing is not None and existing != node_id:
+            if self._nodes[existing]["kind"] != "reference":
+                return  # the alias already names another record; the first one keeps it
+            self._merge(existing, node_id)
+        self._aliases[key] = node_id
+
+    def _merge(self, reference_id, node_id):
+        """Fold a placeholder reference node into the record node it turned out to name."""
+        for target, field in self._out.pop(reference_id).items():
+            del self._in[target][reference_id]
+            self._link(node_id, target, field)
+        for source, field in self._in.pop(reference_id).items():
+            del self._out[source][reference_id]
+            self._link(source, node_id, field)
+        del self._nodes[reference_id]
+
+    def _link(self, source, target, field):
+        if source != target:
+            self._out[source][target] = field
+            self._in[target][source] = field
+
+    def add_record(self, kind, record):
+        """Add or refresh a record and link it to everything it references. Returns its node id."""
+        node_id, aliases, links = _record_links(kind, record)
+        if not node_id:
+            return None
+        self._add_node(node_id, kind, record)
+        for alias in aliases:
+            if alias:
+                self._claim(alias, node_id)
+        for field, reference in links:
+            if not reference:
+                continue
+            target = self.resolve(reference)
+            if target is None:
+                target = reference
+                self._add_node(target, "reference", None)
+            self._link(node_id, target, field)
+        return node_id
+
+    def neighbors(self, node_id, direction="both"):
+        """Return {neighbour id: linking field} for a node."""
+        node_id = self.resolve(node_id)
+        if node_id is None:
+            return {}
+        neighbours = {}
+        if direction in ("out", "both"):
+            neighbours.update(self._out[node_id])
+        if direction in ("in", "both"):
+            neighbours.update(self._in[node_id])
+        return neighbours
+
+    def within(self, start, depth=2, direction="both"):
+        """
+        Breadth-first walk from a node, up to depth hops.
+
+        Returns {node id: hops} for every node reached, including start at 0,
+        e.g. within("616-WTF-3000", 2) for everything within two hops of the
+        RDJ/Affleck trial.
+        """
+        start = self.resolve(start)
+        if start is None:
+            return {}
+        distances = {start: 0}
+        frontier = deque([start])
+        while frontier:
+            node_id = frontier.popleft()
+            hops = distances[node_id]
+            if hops >= depth:
+                continue
+            for neighbour in self.neighbors(node_id, direction):
+                if neighbour not in distances:
+                    distances[neighbour] = hops + 1
+                    frontier.append(neighbour)
+        return distances
+
+def build_canon_graph():
+    """Build a graph over the canon documents, collections and NerdBible entries."""
+    graph = CanonGraph()
+    canon = get_canon_index()
+    for path in canon_documents():
+        document = canon.document(path)
+        if isinstance(document, dict):
+            graph.add_record("document", dict(document, path=str(path)))
+    for kind, name in (("trial", "timeline"), ("verdict", "verdicts"), ("witness", "witnesses"), ("parable", "parables")):
+        for record in canon.records(name):
+            graph.add_record(kind, record)
+    return graph
+
+_graph = None
+_graph_sources = None
+_trial_offset = 0
+_bible_cursor = None
+_graph_lock = threading.Lock()
+
+def _graph_source_objects():
+    """Every canon collection and document the graph is built from (kept alive so identity checks stay valid)."""
+    canon = get_canon_index()
+    return (
+        [canon.collection(name) for name in ("timeline", "verdicts", "witnesses", "parables")]
+        + [canon.document(path) for path in canon_documents()]
+    )
+
+def _same_sources(sources, previous):
+    """True if previous holds the very same source objects as sources."""
+    return previous is not None and len(sources) == len(previous) and all(
+        source is old for source, old in zip(sources, previous)
+    )
+
+def get_canon_graph():
+    """Return the cross-reference graph, rebuilt if a canon file changed and caught up with new trials and bible entries."""
+    global _graph, _graph_sources, _trial_offset, _bible_cursor
+    with _graph_lock:
+        sources = _graph_source_objects()
+        # A trial journal shorter than what was read has been truncated or replaced
+        if _graph is None or not _same_sources(sources, _graph_sources) or timeline.trial_journal_size(timeline.TRIAL_JOURNAL_PATH) < _trial_offset:
+            _graph = build_canon_graph()
+            _graph_sources = sources
+            _trial_offset = 0
+            _bible_cursor = None
+        trials, _trial_offset = timeline.load_trial_journal(timeline.TRIAL_JOURNAL_PATH, _trial_offset)
+        for trial in trials:
+            _graph.add_record("trial", trial)
+        while True:
+            entries, cursor = bible_core.get_entries_page(_bible_cursor, page_size=1000)
+            for entry in entries:
+                _graph.add_record("entry", entry)
+            if not entries:
+                break
+            _bible_cursor = cursor
+        return _graph
+
+def ingest(kind, record):
+    """Link a new record (e.g. a generated trial or persona) into the graph, if it has been built, without rebuilding it."""
+    with _graph_lock:
+        if _graph is not None:
+            _graph.add_record(kind, record)
+    return record
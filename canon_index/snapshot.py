@@ -0,0 +1,202 @@
+"""
+Canon Snapshot Module
+
+Builds one versioned binary snapshot of the parsed canon: the CanonIndex
+collections, the standalone canon documents and the NerdBible core file
+with its derived indexes. The snapshot is keyed by a SHA-256 over the
+source files, so a process can restore it at startup with one unpickle
+instead of parsing every JSON file and rebuilding the indexes, and falls
+back to parsing as soon as any source changes. The payload is still
+deserialized in full; what is saved is the parsing and index building.
+
+The snapshot is a pickle, so it must be trusted. It is only loaded when
+the file is owned by the current user (or root) and neither it nor its
+directory is writable by group or others, and the unpickler only resolves
+the index classes in SNAPSHOT_CLASSES, so a tampered file cannot name
+arbitrary callables.
+
+The NerdBible journal is not part of the snapshot; it is tailed on top of
+the restored core file as usual.
+"""
+
+import gc
+import os
+import mmap
+import stat
+import pickle
+import struct
+import hashlib
+from pathlib import Path
+
+from canon_index.canon_index import (
+    CanonIndex,
+    CanonCollection,
+    canon_documents,
+    get_canon_index,
+    load_canon_file,
+)
+from nerdbible import bible_core
+from nerdbible.file_stamp import file_stamp
+
+# Where the snapshot is written by `python main.py build-snapshot`
+SNAPSHOT_PATH = Path("data/canon/canon_snapshot.bin")
+
+# Bump when the snapshot layout or the pickled classes change
+SNAPSHOT_VERSION = 2
+
+# File header: magic, format version, SHA-256 of the sources
+SNAPSHOT_MAGIC = b"NCSNAP\0\0"
+HEADER = struct.Struct("<8sI32s")
+
+# The only classes a snapshot payload may contain; anything else is refused on load
+SNAPSHOT_CLASSES = {
+    ("canon_index.canon_index", "CanonCollection"),
+    ("nerdbible.lookup_index", "BibleLookupIndex"),
+    ("nerdbible.search_index", "BibleSearchIndex"),
+    ("nerdbible.search_index", "TrigramIndex"),
+}
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Unpickler that resolves nothing but SNAPSHOT_CLASSES."""
+
+    def find_class(self, module, name):
+        if (module, name) not in SNAPSHOT_CLASSES:
+            raise pickle.UnpicklingError(f"canon snapshot refers to {module}.{name}")
+        return super().find_class(module, name)
+
+def _untrusted_reason(path, st):
+    """Why a snapshot file with these stat results may not be loaded, or None if it may."""
+    if not hasattr(os, "getuid"):
+        return None  # Windows: ownership and ACLs are not checked
+    uid = os.getuid()
+    for target, target_stat in ((path, st), (path.parent, os.stat(path.parent))):
+        if target_stat.st_uid not in (uid, 0):
+            return f"{target} is owned by another user"
+        if target_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            return f"{target} is writable by group or others"
+    return None
+
+def snapshot_sources():
+    """Every file the snapshot is derived from, by name."""
+    paths = {f"canon:{name}": source.path for name, source in get_canon_index().sources.items()}
+    paths.update({f"document:{path}": path for path in canon_documents()})
+    paths["nerdbible"] = bible_core.NERDBIBLE_CORE_PATH
+    return paths
+
+def sources_digest(paths):
+    """SHA-256 over the names and contents of the source files (missing files included)."""
+    digest = hashlib.sha256()
+    for name in sorted(paths):
+        digest.update(name.encode("utf-8") + b"\0")
+        try:
+            with open(paths[name], "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        except FileNotFoundError:
+            digest.update(b"missing")
+    return digest.digest()
+
+def build_canon_snapshot(path=SNAPSHOT_PATH):
+    """
+    Parse every canon source and write the snapshot atomically.
+
+    Returns the source digest the snapshot is keyed by, or None on failure.
+    """
+    path = Path(path)
+    canon = CanonIndex(get_canon_index().sources)
+    paths = snapshot_sources()
+    digest = sources_digest(paths)
+    payload = {
+        "canon": {
+            name: CanonCollection(load_canon_file(source), source.fields)
+            for name, source in canon.sources.items()
+        },
+        "documents": {str(document): canon.document(document) for document in canon_documents()},
+        "nerdbible": bible_core.BibleStore().snapshot_state(),
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            os.chmod(tmp_path, 0o644)
+            f.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, digest))
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return digest
+    except Exception as e:
+        print(f"Error writing canon snapshot: {e}")
+        return None
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+def read_canon_snapshot(path=SNAPSHOT_PATH, paths=None):
+    """
+    Read the snapshot and return its payload if it matches the current sources.
+
+    Returns None when the snapshot is missing, untrusted (see the module
+    docstring), from another format version, or built from different
+    source contents.
+    """
+    path = Path(path)
+    paths = snapshot_sources() if paths is None else paths
+    try:
+        with open(path, "rb") as f:
+            reason = _untrusted_reason(path, os.fstat(f.fileno()))
+            if reason is not None:
+                print(f"Ignoring canon snapshot: {reason}")
+                return None
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with view:
+            if len(view) < HEADER.size:
+                return None
+            magic, version, digest = HEADER.unpack_from(view)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                return None
+            if digest != sources_digest(paths):
+                return None
+            # The payload is millions of small objects; collecting while they
+            # are created only rescans them, so the collector waits until the end
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                view.seek(HEADER.size)
+                return _SnapshotUnpickler(view).load()
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+    except (FileNotFoundError, ValueError):
+        return None
+    except Exception as e:
+        print(f"Ignoring unreadable canon snapshot: {e}")
+        return None
+
+def load_canon_snapshot(path=SNAPSHOT_PATH):
+    """
+    Seed the CanonIndex and NerdBible store from the snapshot, if it is current.
+
+    File stamps are taken before the sources are hashed, so a file changed
+    in between is simply re-read on its next lookup. Returns True if the
+    snapshot was used.
+    """
+    paths = snapshot_sources()
+    stamps = {name: file_stamp(Path(source)) for name, source in paths.items()}
+    payload = read_canon_snapshot(path, paths)
+    if payload is None:
+        return False
+
+    canon = get_canon_index()
+    canon.restore(
+        payload["canon"],
+        payload["documents"],
+        {
+            **{name: stamps[f"canon:{name}"] for name in payload["canon"]},
+            **{document: stamps[f"document:{document}"] for document in payload["documents"]},
+        },
+    )
+    store = bible_core.get_bible_store()
+    if isinstance(store, bible_core.BibleStore):
+        store.restore_state(payload["nerdbible"], stamps["nerdbible"])
+    return True
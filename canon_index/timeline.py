@@ -0,0 +1,254 @@
+"""
+Trial Timeline Index
+
+Trials sorted by timestamp, so "all trials between T1 and T2" is two
+bisects and a slice instead of a scan of trial_timeline_index.json. Each
+party (plaintiff or defendant) and each verdict has a posting list kept in
+the same timestamp order, so party and verdict queries can be narrowed to
+a time range the same way. New trials are inserted in place; since they
+are usually the latest, that is an append.
+
+Trials passed to add_trial() / add_trials() (every generate_trial_record()
+and forge_trials() call) are appended to an fsynced JSONL journal,
+data/canon/trial_journal.jsonl, so they outlive the process.
+get_timeline_index() builds the index from the CanonIndex timeline
+collection plus that journal, rebuilds it when trial_timeline_index.json
+changes on disk, and catches up with trials other processes journal by
+byte offset. Nothing is kept in memory that is not on disk.
+
+Once the journal passes TRIAL_JOURNAL_COMPACT_BYTES it is folded into
+trial_timeline_index.json and removed (compact_trial_journal()), so it
+never grows without bound or has to be replayed in full on every start.
+Replacing the timeline file changes its collection, which makes every
+process rebuild its index from the file and the new journal.
+"""
+
+import os
+import json
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+from pathlib import Path
+
+from canon_index.canon_index import get_canon_index, lookup_key
+from nerdbible.file_lock import file_lock
+from nerdbible.journal import append_journal, atomic_write_json, read_journal
+
+# Roles a party can be looked up by
+PARTY_ROLES = ("plaintiff", "defendant", "party")
+
+# Append-only journal of trials generated since trial_timeline_index.json was written
+TRIAL_JOURNAL_PATH = Path("data/canon/trial_journal.jsonl")
+
+# Journal size in bytes past which add_trials() folds it into trial_timeline_index.json
+TRIAL_JOURNAL_COMPACT_BYTES = 4 * 2**20
+
+def parse_timestamp(value):
+    """Seconds since the epoch for an ISO-8601 string or datetime; -inf if missing or invalid."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return float("-inf")
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float("-inf")
+
+def trial_id(record):
+    """Timeline records use trial_id; records from generate_trial_record use case_id."""
+    return record.get("trial_id") or record.get("case_id")
+
+def _contains(keys, key):
+    """Whether a sorted key list holds key."""
+    i = bisect_left(keys, key)
+    return i < len(keys) and keys[i] == key
+
+class TimelineIndex:
+    """
+    Timestamp-ordered index over trial records.
+
+    Every posting list holds (timestamp, sequence) keys in sorted order,
+    so any list can be cut to a time range with bisect. Records are
+    returned oldest first; ties keep insertion order.
+    """
+
+    def __init__(self, records=()):
+        self._records = []
+        self._keys = []
+        self._by_id = {}
+        self._roles = {role: {} for role in PARTY_ROLES}
+        self._verdicts = {}
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, record):
+        """Index a trial; a trial_id that is already indexed is ignored."""
+        record_id = trial_id(record)
+        if record_id is not None:
+            if record_id in self._by_id:
+                return
+            self._by_id[record_id] = record
+        key = (parse_timestamp(record.get("timestamp")), len(self._records))
+        self._records.append(record)
+        insort(self._keys, key)
+        plaintiffs = {lookup_key(name) for name in record.get("plaintiffs") or []}
+        defendants = {lookup_key(name) for name in record.get("defendants") or []}
+        for role, names in (("plaintiff", plaintiffs), ("defendant", defendants), ("party", plaintiffs | defendants)):
+            for name in names:
+                insort(self._roles[role].setdefault(name, []), key)
+        insort(self._verdicts.setdefault(lookup_key(record.get("verdict")), []), key)
+
+    def get(self, record_id):
+        """Return the trial with this trial_id (or case_id), or None."""
+        return self._by_id.get(record_id)
+
+    @staticmethod
+    def _slice(keys, start, end):
+        """Keys with start <= timestamp <= end."""
+        low = 0 if start is None else bisect_left(keys, (parse_timestamp(start), -1))
+        high = len(keys) if end is None else bisect_right(keys, (parse_timestamp(end), float("inf")))
+        return keys[low:high]
+
+    def query(self, start=None, end=None, party=None, role="party", verdict=None, limit=None):
+        """
+        Return trials between start and end (inclusive), oldest first.
+
+        party restricts to trials naming that party in the given role
+        ("plaintiff", "defendant" or either, "party"); verdict restricts to
+        trials with that verdict. Names and verdicts are case-insensitive.
+        """
+        if role not in PARTY_ROLES:
+            raise ValueError(f"Unknown party role: {role}")
+        lists = [self._keys]
+        if party is not None:
+            lists.append(self._roles[role].get(lookup_key(party), []))
+        if verdict is not None:
+            lists.append(self._verdicts.get(lookup_key(verdict), []))
+        lists.sort(key=len)
+
+        results = []
+        for key in self._slice(lists[0], start, end):
+            if all(_contains(other, key) for other in lists[1:]):
+                results.append(self._records[key[1]])
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def between(self, start=None, end=None, limit=None):
+        """Trials with start <= timestamp <= end, oldest first."""
+        return self.query(start, end, limit=limit)
+
+    def by_party(self, party, role="party", start=None, end=None, limit=None):
+        """Trials naming a party in a role, e.g. every case where Ben Affleck was a plaintiff."""
+        return self.query(start, end, party=party, role=role, limit=limit)
+
+    def by_verdict(self, verdict, start=None, end=None, limit=None):
+        """Trials with a verdict, e.g. every "Guilty" ruling."""
+        return self.query(start, end, verdict=verdict, limit=limit)
+
+_timeline = None
+_timeline_source = None
+_journal_offset = 0
+_timeline_lock = threading.Lock()
+
+def trial_journal_size(path):
+    """Size in bytes of a trial journal; 0 if it does not exist."""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return 0
+
+def load_trial_journal(path=None, offset=0):
+    """Return (trials, offset): the journaled trials written after a byte offset."""
+    return read_journal(path or TRIAL_JOURNAL_PATH, offset)
+
+def get_timeline_index():
+    """Return the timeline index over trial_timeline_index.json plus the trial journal."""
+    global _timeline, _timeline_source, _journal_offset
+    collection = get_canon_index().collection("timeline")
+    with _timeline_lock:
+        # A journal shorter than what was read has been truncated or replaced
+        if _timeline is None or _timeline_source is not collection or trial_journal_size(TRIAL_JOURNAL_PATH) < _journal_offset:
+            _timeline = TimelineIndex(collection.records)
+            _timeline_source = collection
+            _journal_offset = 0
+        records, _journal_offset = load_trial_journal(TRIAL_JOURNAL_PATH, _journal_offset)
+        for record in records:
+            _timeline.add(record)
+        return _timeline
+
+def _journal_lock_path():
+    """Lock file held while the trial journal is appended to or compacted."""
+    return TRIAL_JOURNAL_PATH.with_name(TRIAL_JOURNAL_PATH.name + ".lock")
+
+def _compact_trial_journal():
+    """Fold the journal into the timeline file and remove it; the caller holds the journal lock."""
+    records, _ = read_journal(TRIAL_JOURNAL_PATH)
+    if records:
+        source = get_canon_index().sources["timeline"]
+        data = {}
+        if source.path.exists():
+            with open(source.path, "r") as f:
+                data = json.load(f)
+        trials = data.setdefault(source.key, [])
+        known = {trial_id(trial) for trial in trials}
+        for record in records:
+            record_id = trial_id(record)
+            if record_id is None or record_id not in known:
+                trials.append(record)
+                known.add(record_id)
+        # The timeline file is replaced before the journal is removed, so a
+        # crash in between only leaves trials that are indexed once anyway
+        atomic_write_json(source.path, data)
+    TRIAL_JOURNAL_PATH.unlink(missing_ok=True)
+
+def compact_trial_journal():
+    """Fold the trial journal back into trial_timeline_index.json. Returns True on success."""
+    try:
+        if TRIAL_JOURNAL_PATH.parent.exists():
+            with file_lock(_journal_lock_path()):
+                _compact_trial_journal()
+        return True
+    except Exception as e:
+        print(f"Error compacting trial journal: {e}")
+        return False
+
+def add_trials(records):
+    """
+    Journal new trial records and add them to the timeline index if it is loaded.
+
+    The records are written in one append under the journal's lock, so a
+    batch costs a single fsync. Trials that cannot be journaled are not
+    indexed. The journal is compacted once it passes
+    TRIAL_JOURNAL_COMPACT_BYTES. Returns the records.
+    """
+    records = list(records)
+    if not records:
+        return records
+    try:
+        TRIAL_JOURNAL_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(_journal_lock_path()):
+            append_journal(TRIAL_JOURNAL_PATH, records)
+    except Exception as e:
+        # Trials that did not reach the journal are not indexed either
+        print(f"Error writing trial journal: {e}")
+        return records
+    with _timeline_lock:
+        if _timeline is not None:
+            for record in records:
+                _timeline.add(record)
+    if trial_journal_size(TRIAL_JOURNAL_PATH) >= TRIAL_JOURNAL_COMPACT_BYTES:
+        compact_trial_journal()
+    return records
+
+def add_trial(record):
+    """Journal a new trial record and add it to the timeline index without rebuilding it."""
+    add_trials([record])
+    return record
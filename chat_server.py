@@ -17,7 +17,11 @@ load_dotenv()
 # --- NERDSCOURT Engine Integration ---
 from krakoa_engine.generate_krakoa_persona import generate_krakoa_persona
 from trial_logic.trial_forge import generate_trial_record
-from swarm_logic.zord_model_router import match_zord_model
+from swarm_logic.zord_model_router import match_zord_model, match_zord_models
+from swarm_logic.provider_stats import get_provider_stats
+from canon_index.snapshot import load_canon_snapshot
+from intent_logic.intent_matcher import match_intent
+from swarm_logic.warm_pool import get_warm_pool
 # from voice_logic.generate_voice import generate_agent_voice # Not used in chat yet
 
 async def process_command(command, payload):
@@ -37,8 +41,34 @@ async def process_command(command, payload):
         )
         return {"status": "success", "data": trial}
     elif command == "get_model":
+        if isinstance(payload.get("profiles"), list):
+            return {"status": "success", "data": {"models": match_zord_models(payload["profiles"])}}
         model = match_zord_model(payload)
         return {"status": "success", "data": {"model": model}}
+    elif command == "report_model_call":
+        # The client calls the routed models itself and reports how each call went
+        model = payload.get("model")
+        latency = payload.get("latency")
+        if not model or not isinstance(latency, (int, float)):
+            return {"status": "error", "message": "model and latency are required"}
+        get_provider_stats().record(model, float(latency), ok=bool(payload.get("ok", True)))
+        return {"status": "success", "data": {"expected_latency": get_provider_stats().expected_latency(model)}}
+    elif command == "summon_agent":
+        pool = get_warm_pool()
+        name = payload.get("name", "")
+        try:
+            if payload.get("kind") == "echo":
+                agent = pool.checkout_echo(name)
+            else:
+                agent = pool.checkout_persona(name)
+        except KeyError as e:
+            return {"status": "error", "message": e.args[0]}
+        return {"status": "success", "data": agent}
+    elif command == "resolve_intent":
+        intent = match_intent(payload.get("text", ""))
+        if intent is None:
+            return {"status": "error", "message": "No matching intent"}
+        return {"status": "success", "data": intent}
     else:
         return {"status": "error", "message": "Unknown command"}
 
@@ -83,6 +113,13 @@ async def main():
     host = "localhost"
     port = 8765
 
+    # Map in the precompiled canon snapshot, if it matches the canon files
+    load_canon_snapshot()
+
+    # Build the registry agents and witnesses before the first chat turn,
+    # and top the pool up every five minutes
+    get_warm_pool().start(interval=300)
+
     async with websockets.serve(chat_handler, host, port):
         print(f"WebSocket server started at ws://{host}:{port}")
         await asyncio.Future()  # Run forever
@@ -20,10 +20,14 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend_bridge.agency_convex_bridge import ConvexBridge
 from trial_logic.trial_forge import generate_trial_record
 from media_generation.huggingface_bridge import HuggingFaceBridge
+from canon_index.snapshot import load_canon_snapshot
 
 # Load environment variables
 load_dotenv()
 
+# Map in the precompiled canon snapshot, if it matches the canon files
+load_canon_snapshot()
+
 # Initialize Flask app
 app = Flask(__name__)
 
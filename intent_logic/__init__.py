@@ -0,0 +1 @@
+# intent_logic module
@@ -0,0 +1,184 @@
+"""
+Intent Matcher Module
+
+Resolves natural-language commands against the intent maps
+(intent_map.json, intent_map_v1.json) with a word-level Aho-Corasick
+automaton compiled from every phrase, so all phrases found in an utterance
+are reported in one pass over its words no matter how many phrases there
+are. The matcher is rebuilt when a map file changes on disk.
+"""
+
+import re
+import json
+import threading
+from collections import deque
+from pathlib import Path
+
+from nerdbible.file_stamp import file_stamp
+
+# Intent maps in priority order: on equal priority and length, earlier files win
+INTENT_MAP_PATHS = (Path("intent_map.json"), Path("intent_map_v1.json"))
+
+WORD_PATTERN = re.compile(r"\w+(?:'\w+)*")
+
+# Characters stripped from either end of the slot text
+SLOT_STRIP = " \t\n\"'.,;:!?-"
+
+def normalize_word(word):
+    """Casefold a word for matching."""
+    return word.casefold()
+
+def _words(text):
+    """(word, start, end) for each word, with curly apostrophes read as straight ones."""
+    text = text.replace("’", "'")
+    return [(normalize_word(m.group()), m.start(), m.end()) for m in WORD_PATTERN.finditer(text)]
+
+class IntentMatcher:
+    """
+    Aho-Corasick automaton over the words of intent phrases.
+
+    States are trie nodes keyed by whole words, so phrases only match on
+    word boundaries. Each state's outputs include those of its failure
+    chain, so every phrase ending at a word is found without backtracking.
+    """
+
+    def __init__(self, phrases=()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        self.intents = []
+        for phrase, action, priority, source in phrases:
+            self._insert(phrase, action, priority, source)
+        self._compile()
+
+    def __len__(self):
+        return len(self.intents)
+
+    def _insert(self, phrase, action, priority, source):
+        words = [word for word, start, end in _words(phrase)]
+        if not words:
+            return
+        state = 0
+        for word in words:
+            next_state = self._goto[state].get(word)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][word] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append(len(self.intents))
+        self.intents.append({
+            "phrase": phrase,
+            "action": action,
+            "priority": priority,
+            "length": len(words),
+            "source": source,
+            "order": len(self.intents),
+        })
+
+    def _compile(self):
+        """Fill in failure links breadth-first and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fallback = self._goto[fail].get(word, 0)
+                self._fail[next_state] = fallback if fallback != next_state else 0
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def _scan(self, utterance):
+        """Yield (intent, start, end) for every phrase occurrence, in order of where it ends."""
+        words = _words(utterance)
+        state = 0
+        for index, (word, start, end) in enumerate(words):
+            while state and word not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(word, 0)
+            for intent_number in self._outputs[state]:
+                intent = self.intents[intent_number]
+                yield intent, words[index - intent["length"] + 1][1], end
+
+    @staticmethod
+    def _result(utterance, intent, start, end):
+        return {
+            "phrase": intent["phrase"],
+            "action": intent["action"],
+            "priority": intent["priority"],
+            "source": intent["source"],
+            "start": start,
+            "end": end,
+            "slot": utterance[end:].strip(SLOT_STRIP),
+        }
+
+    def find_all(self, utterance):
+        """
+        Return every intent phrase in the utterance, in order of where it ends.
+
+        Each match is a dict with phrase, action, priority, source, start and
+        end (character offsets into the utterance) and slot (the text after
+        the phrase, e.g. the theme after "what does the bible say about").
+        """
+        return [self._result(utterance, *found) for found in self._scan(utterance)]
+
+    def match(self, utterance):
+        """
+        Return the best intent match in the utterance, or None.
+
+        Highest priority wins, then the longest phrase (in words), then the
+        phrase from the earlier map file, then the earliest position.
+        """
+        best = max(
+            self._scan(utterance),
+            key=lambda found: (found[0]["priority"], found[0]["length"], -found[0]["order"], -found[1]),
+            default=None
+        )
+        return None if best is None else self._result(utterance, *best)
+
+def load_intent_phrases(paths=INTENT_MAP_PATHS):
+    """
+    Read (phrase, action, priority, source) tuples from intent map files.
+
+    An intent maps a phrase to an action string, or to
+    {"action": ..., "priority": n} to outrank other phrases (default 0).
+    """
+    phrases = []
+    for path in paths:
+        path = Path(path)
+        try:
+            if not path.exists():
+                continue
+            with open(path, "r") as f:
+                intent_map = json.load(f).get("intent_map", {})
+        except Exception as e:
+            print(f"Error loading intent map {path}: {e}")
+            continue
+        for phrase, target in intent_map.items():
+            if isinstance(target, dict):
+                phrases.append((phrase, target.get("action"), target.get("priority", 0), str(path)))
+            else:
+                phrases.append((phrase, target, 0, str(path)))
+    return phrases
+
+_matcher = None
+_matcher_stamps = None
+_matcher_lock = threading.Lock()
+
+def get_intent_matcher(paths=INTENT_MAP_PATHS):
+    """Return the compiled matcher for the intent maps, recompiling it if a map file changed."""
+    global _matcher, _matcher_stamps
+    stamps = tuple(file_stamp(path) for path in paths)
+    with _matcher_lock:
+        if _matcher is None or stamps != _matcher_stamps:
+            _matcher = IntentMatcher(load_intent_phrases(paths))
+            _matcher_stamps = stamps
+        return _matcher
+
+def match_intent(utterance):
+    """Resolve a natural-language command to its best intent match, or None."""
+    return get_intent_matcher().match(utterance)
@@ -1,56 +1,115 @@
 
+import json
 import uuid
-from swarm_logic.zord_model_router import match_zord_model
+from pathlib import Path
+
+from swarm_logic.batch_pool import map_chunks
+from swarm_logic.zord_model_router import match_zord_model, match_zord_models
+from canon_index.graph import ingest
+from krakoa_engine.persona import DEFAULT_PURPOSE, DEFAULT_TRAITS, Persona
+from krakoa_engine.persona_cache import get_persona_cache, persona_key
 
 from datetime import datetime
 
+# Seeds handed to a pool worker at a time; each chunk is routed as one batch
+PERSONA_CHUNK_SIZE = 256
+
+# Lists of seeds inside a JSON file, e.g. witness_registry.json's "witnesses"
+SEED_LIST_KEYS = ("seeds", "personas", "witnesses", "agents")
+
 def create_session_id():
     return f"{int(datetime.now().timestamp())}-{uuid.uuid4()}"
 
-def generate_krakoa_persona(seed):
-    name = seed.get("name", "Unnamed Agent")
-    alias = seed.get("alias", "Undefined Role")
-    universe = seed.get("universe", "Earth-1218")
-    spawned_from = seed.get("spawned_from", "Legacy Initialization")
-    traits = seed.get("traits", ["[Trait 1]", "[Trait 2]", "[Trait 3]"])
-    purpose = seed.get("purpose", "To interpret and preserve mythos integrity.")
-    parable = seed.get("parable", "Born of narrative necessity, this being channels unresolved arcs into structured myth.")
-
-    sid = create_session_id()
-
-    # Create a temporary profile for model matching
-    temp_profile = {
+def _seed_profile(seed):
+    """The profile a seed is routed with."""
+    return {
         "role": seed.get("role", ""),
-        "purpose": purpose,
-        "core_traits": traits,
+        "purpose": seed.get("purpose", DEFAULT_PURPOSE),
+        "core_traits": seed.get("traits", seed.get("core_traits", list(DEFAULT_TRAITS))),
         "emotional_signature": {"tone": seed.get("tone", "")}
     }
 
+def build_krakoa_persona(seed):
+    """Build and route a persona dict without caching it or linking it into the canon graph."""
     # Get the model profile
-    model_profile = match_zord_model(temp_profile)
-
-    persona = {
-        "identity": {
-            "designation": name,
-            "alias": alias,
-            "universe": universe,
-            "spawned_from": spawned_from
-        },
-        "personality_framework": "PPP - Personality, Purpose, Parable",
-        "soul_data": {
-            "core_traits": traits,
-            "purpose": purpose,
-            "parable": parable
-        },
-        "self_awareness": (
-            f"Legacy recreation of {name} from {universe}, operational within Earth-1218 parameters. "
-            f"This instance is a canonical echo — not the origin, but a growth-node continuing their arc through evolutionary persistence. "
-            f"Semi-autonomous, case-locked witness spawned for interpretive narrative or canonical reinforcement. Memory expires unless archived."
-        ),
-        "calibrated_by": "Tony Stark Prime",
-        "model_profile": model_profile,
-        "session_id": sid,
-        "generated_at": datetime.utcnow().isoformat() + "Z"
-    }
+    model_profile = match_zord_model(_seed_profile(seed))
+    return Persona.from_seed(seed, model_profile).to_dict()
+
+def generate_krakoa_persona(seed):
+    # Re-spawning a seed reuses its persona body under a fresh session ID
+    cache = get_persona_cache()
+    key = persona_key(seed)
+    persona = cache.get(key)
+    if persona is not None:
+        persona["session_id"] = create_session_id()
+    else:
+        persona = build_krakoa_persona(seed)
+        cache.put(key, persona)
 
+    # Link the persona to what it was spawned from in the canon graph
+    ingest("persona", persona)
     return persona
+
+def _generate_chunk(seeds):
+    """Build personas for a chunk of seeds, routing the whole chunk in one batch (runs in pool workers)."""
+    models = match_zord_models([_seed_profile(seed) for seed in seeds])
+    return [Persona.from_seed(seed, model) for seed, model in zip(seeds, models)]
+
+def stream_krakoa_personas(seeds, workers=None, ordered=True, link=False, chunk_size=PERSONA_CHUNK_SIZE):
+    """
+    Yield a Persona for each seed as it is generated.
+
+    Seeds may be any iterable and are consumed lazily. With workers > 1,
+    chunks of seeds are generated in a process pool, with at most two
+    chunks per worker in flight, so memory stays flat however many seeds
+    there are. ordered=False yields chunks as they finish instead of in
+    seed order. link=True also links each persona into the canon graph,
+    which holds on to it; bulk runs leave it off to keep memory flat.
+    """
+    for persona in map_chunks(_generate_chunk, seeds, workers=workers, ordered=ordered, chunk_size=chunk_size):
+        if link:
+            ingest("persona", persona)
+        yield persona
+
+def generate_krakoa_personas(seeds, workers=None, ordered=True, link=False):
+    """
+    Generate personas for many seeds at once, in a process pool when workers > 1.
+
+    Returns compact Persona objects, which read like persona dicts; call
+    to_dict() on one for the plain dict generate_krakoa_persona returns.
+    link=True links them into the canon graph as well.
+    """
+    return list(stream_krakoa_personas(seeds, workers=workers, ordered=ordered, link=link))
+
+def iter_seeds(path):
+    """
+    Read persona seeds from a file without loading all of it when possible.
+
+    A .jsonl file is read one seed per line. A JSON file may hold a list
+    of seeds, an object with one of SEED_LIST_KEYS, or a single seed.
+    """
+    path = Path(path)
+    with open(path, "r") as f:
+        if path.suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = next((data[key] for key in SEED_LIST_KEYS if isinstance(data.get(key), list)), [data])
+    yield from data
+
+def write_krakoa_personas(seeds_path, output_path, workers=None, ordered=True):
+    """
+    Generate a persona for every seed in a file and write them as JSONL.
+
+    Personas are written as they are generated and are not linked into the
+    canon graph. Returns the number written.
+    """
+    count = 0
+    with open(output_path, "w") as out:
+        for persona in stream_krakoa_personas(iter_seeds(seeds_path), workers=workers, ordered=ordered):
+            out.write(persona.to_json(ensure_ascii=False) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,156 @@
+"""
+Krakoa Persona
+
+A compact, read-only persona. The persona dict generate_krakoa_persona
+returns repeats the same boilerplate in every instance (the framework,
+calibrated_by and the self-awareness paragraph) and costs a dozen small
+dicts, lists and strings. Persona keeps only what differs per persona in
+__slots__, interns the strings personas share (aliases, universes, origins,
+traits, models), and renders the templated fields on access.
+
+Persona is a Mapping with the persona dict's top-level keys, so
+persona["identity"]["designation"] works as before; to_dict() and
+to_json() produce the full dict shape.
+"""
+
+import sys
+import json
+import time
+import uuid
+from collections.abc import Mapping
+from datetime import datetime, timezone
+
+DEFAULT_ALIAS = "Undefined Role"
+DEFAULT_UNIVERSE = "Earth-1218"
+DEFAULT_SPAWNED_FROM = "Legacy Initialization"
+DEFAULT_TRAITS = ("[Trait 1]", "[Trait 2]", "[Trait 3]")
+DEFAULT_PURPOSE = "To interpret and preserve mythos integrity."
+DEFAULT_PARABLE = "Born of narrative necessity, this being channels unresolved arcs into structured myth."
+
+PERSONALITY_FRAMEWORK = "PPP - Personality, Purpose, Parable"
+CALIBRATED_BY = "Tony Stark Prime"
+SELF_AWARENESS_TEMPLATE = (
+    "Legacy recreation of {name} from {universe}, operational within Earth-1218 parameters. "
+    "This instance is a canonical echo — not the origin, but a growth-node continuing their arc through evolutionary persistence. "
+    "Semi-autonomous, case-locked witness spawned for interpretive narrative or canonical reinforcement. Memory expires unless archived."
+)
+
+# Top-level keys of the persona dict, in order
+PERSONA_KEYS = (
+    "identity",
+    "personality_framework",
+    "soul_data",
+    "self_awareness",
+    "calibrated_by",
+    "model_profile",
+    "session_id",
+    "generated_at",
+)
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+class Persona(Mapping):
+    """
+    One persona, stored as its distinct fields only.
+
+    The session ID and generation time are derived from the creation
+    timestamp and a UUID held as an int, and are only formatted when read.
+    """
+
+    __slots__ = (
+        "designation",
+        "alias",
+        "universe",
+        "spawned_from",
+        "traits",
+        "purpose",
+        "parable",
+        "model_profile",
+        "created",
+        "_session",
+    )
+
+    def __init__(self, designation, alias=DEFAULT_ALIAS, universe=DEFAULT_UNIVERSE,
+                 spawned_from=DEFAULT_SPAWNED_FROM, traits=DEFAULT_TRAITS, purpose=DEFAULT_PURPOSE,
+                 parable=DEFAULT_PARABLE, model_profile=None, created=None, session=None):
+        self.designation = designation
+        self.alias = _intern(alias)
+        self.universe = _intern(universe)
+        self.spawned_from = _intern(spawned_from)
+        self.traits = tuple(_intern(trait) for trait in traits) if isinstance(traits, (list, tuple)) else traits
+        self.purpose = _intern(purpose)
+        self.parable = _intern(parable)
+        self.model_profile = _intern(model_profile)
+        self.created = time.time() if created is None else created
+        # Either a session ID string, or a UUID int formatted on demand
+        self._session = uuid.uuid4().int if session is None else session
+
+    @classmethod
+    def from_seed(cls, seed, model_profile):
+        """
+        Build a persona from a seed dict.
+
+        Witness registry entries name their persona with designation and
+        core_traits instead of name and traits.
+        """
+        return cls(
+            seed.get("name", seed.get("designation", "Unnamed Agent")),
+            seed.get("alias", DEFAULT_ALIAS),
+            seed.get("universe", DEFAULT_UNIVERSE),
+            seed.get("spawned_from", DEFAULT_SPAWNED_FROM),
+            seed.get("traits", seed.get("core_traits", DEFAULT_TRAITS)),
+            seed.get("purpose", DEFAULT_PURPOSE),
+            seed.get("parable", DEFAULT_PARABLE),
+            model_profile,
+        )
+
+    @property
+    def session_id(self):
+        if isinstance(self._session, int):
+            return f"{int(self.created)}-{uuid.UUID(int=self._session)}"
+        return self._session
+
+    @property
+    def generated_at(self):
+        moment = datetime.fromtimestamp(self.created, timezone.utc).replace(tzinfo=None)
+        return moment.isoformat() + "Z"
+
+    @property
+    def self_awareness(self):
+        return SELF_AWARENESS_TEMPLATE.format(name=self.designation, universe=self.universe)
+
+    def __getitem__(self, key):
+        if key == "identity":
+            return {
+                "designation": self.designation,
+                "alias": self.alias,
+                "universe": self.universe,
+                "spawned_from": self.spawned_from,
+            }
+        if key == "personality_framework":
+            return PERSONALITY_FRAMEWORK
+        if key == "soul_data":
+            traits = list(self.traits) if isinstance(self.traits, tuple) else self.traits
+            return {"core_traits": traits, "purpose": self.purpose, "parable": self.parable}
+        if key == "calibrated_by":
+            return CALIBRATED_BY
+        if key in ("self_awareness", "model_profile", "session_id", "generated_at"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(PERSONA_KEYS)
+
+    def __len__(self):
+        return len(PERSONA_KEYS)
+
+    def __repr__(self):
+        return f"Persona({self.designation!r}, session_id={self.session_id!r})"
+
+    def to_dict(self):
+        """The full persona dict, as generate_krakoa_persona returns it."""
+        return {key: self[key] for key in PERSONA_KEYS}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
@@ -0,0 +1,212 @@
+"""
+Krakoa Persona Cache
+
+Content-addressed cache of generated personas. A seed's identity fields
+(designation, alias, universe, spawned_from), soul fields (traits,
+purpose, parable) and routing fields (role, tone) are hashed canonically
+together with the version of the Zord rules in force; re-spawning the
+same seed reuses the stored persona body, and the Convex result of its
+first push, instead of regenerating and pushing a new row. Only the
+session_id is minted fresh. Editing zord_rules.json changes the version,
+so personas are re-routed rather than served with a stale model_profile.
+
+The cache keeps the most recently used personas in memory and, when the
+PERSONA_CACHE_DB environment variable names a file, every persona in an
+SQLite tier that survives restarts and is shared between processes.
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from krakoa_engine.persona import (
+    DEFAULT_ALIAS,
+    DEFAULT_PARABLE,
+    DEFAULT_PURPOSE,
+    DEFAULT_SPAWNED_FROM,
+    DEFAULT_TRAITS,
+    DEFAULT_UNIVERSE,
+)
+from swarm_logic.zord_model_router import get_zord_engine
+
+# Personas kept in memory
+PERSONA_CACHE_SIZE = 4096
+
+# Rows kept in the SQLite tier; the least recently used are dropped beyond it
+PERSONA_CACHE_DB_ROWS = 100000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS personas (
+    key TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    convex TEXT,
+    used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS personas_used ON personas(used);
+"""
+
+def persona_key(seed, rules_version=None):
+    """
+    SHA-256 over the canonical JSON of the seed fields a persona is derived from.
+
+    rules_version defaults to the version of the Zord rules currently loaded.
+    """
+    traits = seed.get("traits", seed.get("core_traits", DEFAULT_TRAITS))
+    if isinstance(traits, str):
+        traits = [traits]
+    fields = {
+        "designation": seed.get("name", seed.get("designation", "Unnamed Agent")),
+        "alias": seed.get("alias", DEFAULT_ALIAS),
+        "universe": seed.get("universe", DEFAULT_UNIVERSE),
+        "spawned_from": seed.get("spawned_from", DEFAULT_SPAWNED_FROM),
+        "traits": list(traits),
+        "purpose": seed.get("purpose", DEFAULT_PURPOSE),
+        "parable": seed.get("parable", DEFAULT_PARABLE),
+        "role": seed.get("role", ""),
+        "tone": seed.get("tone", ""),
+        "rules_version": rules_version or get_zord_engine().version,
+    }
+    canonical = json.dumps(fields, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class PersonaCache:
+    """
+    Bounded LRU of persona bodies and Convex results by persona_key.
+
+    Bodies are held as JSON text, so every hit hands out a fresh copy. The
+    SQLite tier, if any, is written through and read on a memory miss.
+    """
+
+    def __init__(self, size=PERSONA_CACHE_SIZE, db_path=None, db_rows=PERSONA_CACHE_DB_ROWS):
+        self.size = size
+        self.db_path = Path(db_path) if db_path else None
+        self.db_rows = db_rows
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._clock = 0
+        self.hits = 0
+        self.misses = 0
+        if self.db_path is not None:
+            self._db().executescript(SCHEMA)
+            self._clock = self._db().execute("SELECT COALESCE(MAX(used), 0) FROM personas").fetchone()[0]
+
+    def _db(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.size:
+            self._memory.popitem(last=False)
+
+    def _load(self, key):
+        """(body, convex) for a key from memory or the SQLite tier, or None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+            if self.db_path is None:
+                return None
+            row = self._db().execute("SELECT body, convex FROM personas WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db().execute("UPDATE personas SET used = ? WHERE key = ?", (self._tick(), key))
+            entry = (row[0], row[1])
+            self._remember(key, entry)
+            return entry
+
+    def get(self, key):
+        """The cached persona body for a key (a fresh dict), or None."""
+        entry = self._load(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(entry[0])
+
+    def convex_result(self, key):
+        """The Convex result stored for a key's persona, or None if it was never pushed."""
+        entry = self._load(key)
+        if entry is None or entry[1] is None:
+            return None
+        return json.loads(entry[1])
+
+    def put(self, key, persona):
+        """Store a persona body (its session_id blanked); keeps any Convex result already stored."""
+        body = json.dumps(dict(persona, session_id=None), ensure_ascii=False)
+        with self._lock:
+            previous = self._memory.get(key)
+            convex = previous[1] if previous else None
+            if self.db_path is not None:
+                conn = self._db()
+                conn.execute(
+                    "INSERT INTO personas (key, body, convex, used) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET body = excluded.body, used = excluded.used",
+                    (key, body, convex, self._tick()),
+                )
+                convex = conn.execute("SELECT convex FROM personas WHERE key = ?", (key,)).fetchone()[0]
+                self._prune(conn)
+            self._remember(key, (body, convex))
+
+    def set_convex(self, key, result):
+        """Record the Convex result of pushing a key's persona."""
+        convex = json.dumps(result)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._remember(key, (entry[0], convex))
+            if self.db_path is not None:
+                self._db().execute("UPDATE personas SET convex = ? WHERE key = ?", (convex, key))
+
+    def _prune(self, conn):
+        if self._clock % 1024 == 0:
+            conn.execute(
+                "DELETE FROM personas WHERE key IN "
+                "(SELECT key FROM personas ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.db_rows,),
+            )
+
+    def cache_info(self):
+        """Cache counters: {"hits", "misses", "size", "max_size"}."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._memory), "max_size": self.size}
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_persona_cache():
+    """
+    Return the process-wide persona cache, created on first use.
+
+    Its SQLite tier is the file named by PERSONA_CACHE_DB, if set.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PersonaCache(db_path=os.environ.get("PERSONA_CACHE_DB"))
+        return _cache
+
+def set_persona_cache(cache):
+    """Replace the process-wide persona cache (e.g. with one on a temporary database)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+    return cache
@@ -8,20 +8,23 @@ integrating all the components and providing a unified interface for the fronten
 
 import os
 import json
+import time
 import argparse
 from dotenv import load_dotenv
 
 # Import the core modules
-from krakoa_engine.generate_krakoa_persona import generate_krakoa_persona
-from trial_logic.trial_forge import generate_trial_record
+from krakoa_engine.generate_krakoa_persona import generate_krakoa_persona, write_krakoa_personas
+from krakoa_engine.persona_cache import get_persona_cache, persona_key
+from trial_logic.trial_forge import generate_trial_record, write_trials
 from backend_bridge.convex_bridge import (
     push_persona_to_convex,
     push_trial_to_convex,
     fetch_persona,
     fetch_trial
 )
-from swarm_logic.zord_model_router import match_zord_model
+from swarm_logic.zord_model_router import match_zord_model, match_zord_models
 from voice_logic.generate_voice import generate_agent_voice
+from canon_index.snapshot import build_canon_snapshot, load_canon_snapshot, SNAPSHOT_PATH
 
 # Load environment variables
 load_dotenv()
@@ -39,8 +42,14 @@ def create_persona(seed_data):
     # Generate the persona using the Krakoa Engine
     persona = generate_krakoa_persona(seed_data)
     
-    # Push the persona to Convex
-    result = push_persona_to_convex(persona)
+    # Push the persona to Convex, unless this seed was already pushed
+    cache = get_persona_cache()
+    key = persona_key(seed_data)
+    result = cache.convex_result(key)
+    if result is None:
+        result = push_persona_to_convex(persona)
+        if result:
+            cache.set_convex(key, result)
     
     if result:
         print(f"Persona created: {persona['identity']['designation']}")
@@ -99,6 +108,18 @@ def get_model_for_agent(agent_data):
     """
     return match_zord_model(agent_data)
 
+def get_models_for_agents(agents):
+    """
+    Get the models for a batch of agents in one routing pass.
+    
+    Args:
+        agents (list): Agent data dicts
+        
+    Returns:
+        list: Model identifiers, in the same order
+    """
+    return match_zord_models(agents)
+
 def generate_voice_line(text, audio_prompt_url=None):
     """
     Generate a voice line using the Voice Logic.
@@ -125,6 +146,13 @@ def main():
     persona_parser.add_argument("--universe", help="Universe of the persona")
     persona_parser.add_argument("--spawned-from", help="Origin of the persona")
     
+    # Spawn personas in bulk command
+    spawn_parser = subparsers.add_parser("spawn-personas", help="Generate personas for every seed in a file")
+    spawn_parser.add_argument("--seeds", required=True, help="Seed file (.jsonl, or JSON such as witness_registry.json)")
+    spawn_parser.add_argument("--output", required=True, help="JSONL file to write personas to")
+    spawn_parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+    spawn_parser.add_argument("--unordered", action="store_true", help="Write personas as they finish instead of in seed order")
+    
     # Create trial command
     trial_parser = subparsers.add_parser("create-trial", help="Create a new trial")
     trial_parser.add_argument("--file", help="JSON file with trial data")
@@ -133,11 +161,28 @@ def main():
     trial_parser.add_argument("--defendants", nargs="+", help="Defendants in the trial")
     trial_parser.add_argument("--charges", nargs="+", help="Charges in the trial")
     
+    # Forge trials in bulk command
+    forge_parser = subparsers.add_parser("forge-trials", help="Forge trial records for every spec in a file")
+    forge_parser.add_argument("--specs", required=True, help="Trial spec file (.jsonl, .jsonl.gz, or a JSON list)")
+    forge_parser.add_argument("--output", required=True, help="JSONL file to write records to (.gz to compress)")
+    forge_parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+    forge_parser.add_argument("--unordered", action="store_true", help="Write records as they finish instead of in spec order")
+    
     # Get model command
     model_parser = subparsers.add_parser("get-model", help="Get model for an agent")
-    model_parser.add_argument("--file", help="JSON file with agent data")
+    model_parser.add_argument("--file", help="JSON file with agent data (an object, or a list of agents)")
     model_parser.add_argument("--persona-id", help="ID of the persona in Convex")
     
+    # Migrate NerdBible command
+    migrate_parser = subparsers.add_parser("migrate-bible", help="Import the JSON NerdBible and parables into SQLite")
+    migrate_parser.add_argument("--db", help="SQLite database path (default: data/nerdbible/nerdbible.db)")
+    migrate_parser.add_argument("--bible", default="nerd_bible_core.json", help="NerdBible core JSON file")
+    migrate_parser.add_argument("--parables", default="parables_index.json", help="Parables index JSON file")
+    
+    # Build canon snapshot command
+    snapshot_parser = subparsers.add_parser("build-snapshot", help="Precompile the canon JSON files into a binary snapshot")
+    snapshot_parser.add_argument("--output", default=str(SNAPSHOT_PATH), help="Snapshot path (default: data/canon/canon_snapshot.bin)")
+    
     # Generate voice command
     voice_parser = subparsers.add_parser("generate-voice", help="Generate voice for text")
     voice_parser.add_argument("--text", help="Text to convert to speech")
@@ -145,6 +190,9 @@ def main():
     
     args = parser.parse_args()
     
+    if args.command != "build-snapshot":
+        load_canon_snapshot()
+    
     if args.command == "create-persona":
         if args.file:
             with open(args.file, "r") as f:
@@ -161,6 +209,10 @@ def main():
         if result:
             print(json.dumps(result, indent=2))
     
+    elif args.command == "spawn-personas":
+        count = write_krakoa_personas(args.seeds, args.output, workers=args.workers, ordered=not args.unordered)
+        print(f"Wrote {count} personas to {args.output}")
+    
     elif args.command == "create-trial":
         if args.file:
             with open(args.file, "r") as f:
@@ -177,12 +229,22 @@ def main():
         if result:
             print(json.dumps(result, indent=2))
     
+    elif args.command == "forge-trials":
+        start = time.perf_counter()
+        count = write_trials(args.specs, args.output, workers=args.workers, ordered=not args.unordered)
+        elapsed = time.perf_counter() - start
+        print(f"Wrote {count} trials to {args.output} in {elapsed:.2f} s ({count / max(elapsed, 1e-9):.0f} records/s)")
+    
     elif args.command == "get-model":
         if args.file:
             with open(args.file, "r") as f:
                 agent_data = json.load(f)
-            model = get_model_for_agent(agent_data)
-            print(f"Model: {model}")
+            if isinstance(agent_data, list):
+                for agent, model in zip(agent_data, get_models_for_agents(agent_data)):
+                    print(f"{agent.get('name', 'Unnamed Agent')}: {model}")
+            else:
+                model = get_model_for_agent(agent_data)
+                print(f"Model: {model}")
         elif args.persona_id:
             persona = fetch_persona(args.persona_id)
             if persona:
@@ -193,6 +255,16 @@ def main():
         else:
             print("Either --file or --persona-id is required")
     
+    elif args.command == "migrate-bible":
+        from nerdbible.sqlite_store import migrate_json_to_sqlite
+        entry_count, parable_count = migrate_json_to_sqlite(args.db, args.bible, args.parables)
+        print(f"Migrated {entry_count} entries and {parable_count} parables")
+    
+    elif args.command == "build-snapshot":
+        digest = build_canon_snapshot(args.output)
+        if digest:
+            print(f"Canon snapshot written to {args.output} (sources {digest.hex()[:12]})")
+    
     elif args.command == "generate-voice":
         if args.text:
             audio_url = generate_voice_line(args.text, args.audio_prompt)
@@ -14,6 +14,8 @@ import requests
 from dotenv import load_dotenv
 from PIL import Image
 
+from swarm_logic.provider_stats import get_provider_stats
+
 # Load environment variables
 load_dotenv()
 
@@ -39,6 +41,13 @@ class HuggingFaceBridge:
             "Authorization": f"Bearer {self.api_token}"
         }
 
+    def _post(self, model, url, **kwargs):
+        """POST to a HuggingFace endpoint, timed in the provider stats as huggingface:<model>."""
+        with get_provider_stats().track(f"huggingface:{model}"):
+            response = requests.post(url, **kwargs)
+            response.raise_for_status()
+        return response
+
     def generate_audio(self, text, voice="en_male_deep", output_path=None, use_dia=True):
         """
         Generate audio from text using HuggingFace's text-to-speech models.
@@ -101,12 +110,12 @@ class HuggingFaceBridge:
 
         try:
             # Make request to HuggingFace Spaces API
-            response = requests.post(
+            response = self._post(
+                "nari-labs/Dia-1.6B",
                 f"{API_URL}/run/predict",
                 headers={"Authorization": f"Bearer {self.api_token}"},
                 json=payload
             )
-            response.raise_for_status()
 
             # Parse the response
             result = response.json()
@@ -163,8 +172,7 @@ class HuggingFaceBridge:
 
         try:
             # Make request to HuggingFace API
-            response = requests.post(API_URL, headers=self.headers, json=payload)
-            response.raise_for_status()
+            response = self._post("microsoft/speecht5_tts", API_URL, headers=self.headers, json=payload)
 
             # Get audio data
             audio_data = response.content
@@ -212,8 +220,7 @@ class HuggingFaceBridge:
 
         try:
             # Make request to HuggingFace API
-            response = requests.post(API_URL, headers=self.headers, json=payload)
-            response.raise_for_status()
+            response = self._post("stabilityai/stable-diffusion-xl-base-1.0", API_URL, headers=self.headers, json=payload)
 
             # Get image data
             image_data = response.content
@@ -261,8 +268,7 @@ class HuggingFaceBridge:
 
         try:
             # Make request to HuggingFace API
-            response = requests.post(API_URL, headers=self.headers, json=payload)
-            response.raise_for_status()
+            response = self._post("cerspense/zeroscope_v2_576w", API_URL, headers=self.headers, json=payload)
 
             # Get video data
             video_data = response.content
@@ -6,11 +6,23 @@ The NerdBible is a living archive of canonical lore and parables, evolving as th
 """
 
 import os
+import re
+import gzip
 import json
 import uuid
+import random
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
+from nerdbible.search_index import BibleSearchIndex, TrigramIndex, FUZZY_FIELDS
+from nerdbible.lookup_index import BibleLookupIndex
+from nerdbible.journal import read_journal, append_journal, atomic_write_json
+from nerdbible.file_lock import file_lock
+from nerdbible.file_stamp import file_stamp
+from nerdbible.sampling import VerseSampler
+
 # Ensure the data directory exists
 DATA_DIR = Path("data/nerdbible")
 DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -18,108 +30,692 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 # Path to the core NerdBible file
 NERDBIBLE_CORE_PATH = Path("nerd_bible_core.json")
 
-def load_bible_core():
-    """Load the core NerdBible file."""
+# Parables drawn alongside bible entries by the weighted verse sampler
+PARABLES_INDEX_PATH = Path("parables_index.json")
+
+# Journal records after which background compaction folds the journal into the core file
+JOURNAL_COMPACT_THRESHOLD = 1000
+
+# NerdBible entry IDs: "NB-" plus a sequence number, zero-padded to at least four digits
+ENTRY_ID_PATTERN = re.compile(r"^NB-(\d+)$")
+
+# Entry fields that update_entry may change
+UPDATABLE_FIELDS = ("theme", "quote", "source", "character", "tier")
+
+DEFAULT_SCRIPTURE_CORE = {
+    "source_type": "canon_only",
+    "inspiration_tiers": ["Golden Frame", "Trial Ruling", "Verified Panel Quote"],
+    "format": "verse + citation",
+    "query_style": "natural language",
+    "response_style": "scriptural and emotionally weighted"
+}
+
+def _default_bible():
+    """Build an empty NerdBible structure."""
+    return {
+        "scripture_core": dict(DEFAULT_SCRIPTURE_CORE),
+        "entries": []
+    }
+
+def format_entry_id(number):
+    """Format a sequence number as a NerdBible entry ID (NB-0001 ... NB-10000 ...)."""
+    return f"NB-{number:04d}"
+
+def _entry_number(entry_id):
+    """Sequence number of a NerdBible entry ID, or 0 if it doesn't follow the scheme."""
+    match = ENTRY_ID_PATTERN.match(entry_id or "")
+    return int(match.group(1)) if match else 0
+
+def _new_entry(entry_id, theme, quote, source, character, tier="Trial Ruling", created_at=None):
+    """Build a NerdBible entry dict."""
+    return {
+        "id": entry_id,
+        "theme": theme,
+        "quote": quote,
+        "source": source,
+        "character": character,
+        "tier": tier,
+        "created_at": created_at or datetime.utcnow().isoformat() + "Z"
+    }
+
+def _lock_path():
+    """Path of the lock file that serializes writers across processes."""
+    return NERDBIBLE_CORE_PATH.with_name(NERDBIBLE_CORE_PATH.name + ".lock")
+
+def journal_path(core_path):
+    """Path of the append-only journal that sits beside a core file."""
+    core_path = Path(core_path)
+    return core_path.with_name(core_path.stem + ".journal.jsonl")
+
+def _journal_path():
+    return journal_path(NERDBIBLE_CORE_PATH)
+
+def semantic_index_path(core_path):
+    """Path of the persisted semantic index matrix that sits beside a core file."""
+    core_path = Path(core_path)
+    return core_path.with_name(core_path.stem + ".semantic.npz")
+
+def _load_snapshot():
+    """Load the core NerdBible file without replaying the journal."""
     try:
         if NERDBIBLE_CORE_PATH.exists():
             with open(NERDBIBLE_CORE_PATH, "r") as f:
                 return json.load(f)
         else:
             # Create a default structure if the file doesn't exist
-            default_bible = {
-                "scripture_core": {
-                    "source_type": "canon_only",
-                    "inspiration_tiers": ["Golden Frame", "Trial Ruling", "Verified Panel Quote"],
-                    "format": "verse + citation",
-                    "query_style": "natural language",
-                    "response_style": "scriptural and emotionally weighted"
-                },
-                "entries": []
-            }
+            default_bible = _default_bible()
             with open(NERDBIBLE_CORE_PATH, "w") as f:
                 json.dump(default_bible, f, indent=2)
             return default_bible
     except Exception as e:
         print(f"Error loading NerdBible core: {e}")
-        return {
-            "scripture_core": {
-                "source_type": "canon_only",
-                "inspiration_tiers": ["Golden Frame", "Trial Ruling", "Verified Panel Quote"],
-                "format": "verse + citation",
-                "query_style": "natural language",
-                "response_style": "scriptural and emotionally weighted"
-            },
-            "entries": []
-        }
+        return _default_bible()
 
-def save_bible_core(bible_data):
-    """Save the NerdBible core file."""
+def _apply_journal_record(entries, by_id, record):
+    """
+    Apply one journal record to a list of entries.
+
+    Returns (old_entry, entry): old_entry is None when the record added a
+    new entry, and entry is None when the record did not apply. Replaying a
+    create for an ID that already exists overwrites it, so replay stays
+    idempotent if the journal outlives a compaction.
+    """
+    op = record.get("op")
+    if op == "create":
+        entry = record["entry"]
+        existing = by_id.get(entry.get("id"))
+        if existing is None:
+            entries.append(entry)
+            by_id[entry.get("id")] = entry
+            return None, entry
+        old_entry = dict(existing)
+        existing.update(entry)
+        return old_entry, existing
+    if op == "update":
+        existing = by_id.get(record.get("id"))
+        if existing is not None:
+            old_entry = dict(existing)
+            existing.update(record.get("changes", {}))
+            return old_entry, existing
+    return None, None
+
+def replay_journal(bible, path):
+    """Apply every record in the journal at path to a loaded bible."""
+    entries = bible.setdefault("entries", [])
+    by_id = {}
+    for entry in entries:
+        by_id.setdefault(entry.get("id"), entry)
+    records, _ = read_journal(path)
+    for record in records:
+        _apply_journal_record(entries, by_id, record)
+    return bible
+
+def _load_parables():
+    """Load the parables from the parables index, or an empty list."""
     try:
-        with open(NERDBIBLE_CORE_PATH, "w") as f:
-            json.dump(bible_data, f, indent=2)
+        if PARABLES_INDEX_PATH.exists():
+            with open(PARABLES_INDEX_PATH, "r") as f:
+                return json.load(f).get("parables", [])
+    except Exception as e:
+        print(f"Error loading parables index: {e}")
+    return []
+
+def load_bible_core():
+    """Load the core NerdBible file and replay any journaled writes."""
+    return replay_journal(_load_snapshot(), _journal_path())
+
+def _write_bible_file(bible_data):
+    """Atomically write the NerdBible core file, returning True on success."""
+    try:
+        atomic_write_json(NERDBIBLE_CORE_PATH, bible_data)
         return True
     except Exception as e:
         print(f"Error saving NerdBible core: {e}")
         return False
 
+class BibleStore:
+    """
+    In-memory view of the NerdBible core file and its journal.
+
+    The parsed bible is kept between calls and only re-read when the core
+    file's mtime or size changes on disk, so lookups no longer pay for a full
+    JSON parse. Writes are appended to the journal rather than rewriting the
+    core file; new journal records (ours or another writer's) are tailed from
+    the last read offset and applied to the cache incrementally. compact()
+    folds the journal back into the core file. Returned entries are shared
+    with the cache and should be treated as read-only.
+
+    Derived indexes are built lazily on first use, updated incrementally as
+    entries are created or updated, and discarded whenever the core file is
+    re-read.
+
+    Writers hold an exclusive lock on a sidecar lock file, so processes
+    sharing the bible never interleave writes. New IDs are allocated under
+    that lock from a counter that only moves forward: it is the highest
+    sequence number seen in the core file, its saved "id_counter" and the
+    journal.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._write_depth = 0
+        self._bible = None
+        self._by_id = {}
+        self._last_number = 0
+        self._stamp = None
+        self._journal_inode = None
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._indexes = {}
+        self._parables = []
+        self._parables_stamp = None
+
+    def _refresh(self):
+        """Bring the cache up to date with the core file and journal."""
+        stamp = file_stamp(NERDBIBLE_CORE_PATH)
+        if self._bible is None or stamp is None or stamp != self._stamp:
+            self._reload()
+            return
+        journal_path = _journal_path()
+        try:
+            journal = journal_path.stat()
+        except OSError:
+            return
+        if journal.st_size == self._journal_offset and journal.st_ino == self._journal_inode:
+            return
+        if journal.st_size < self._journal_offset or self._journal_inode not in (None, journal.st_ino):
+            self._reload()
+            return
+        records, self._journal_offset = read_journal(journal_path, self._journal_offset)
+        self._journal_inode = journal.st_ino
+        self._journal_records += len(records)
+        entries = self._bible["entries"]
+        for record in records:
+            old_entry, entry = _apply_journal_record(entries, self._by_id, record)
+            if entry is None:
+                continue
+            self._last_number = max(self._last_number, _entry_number(entry.get("id")))
+            for index in self._indexes.values():
+                if old_entry is None:
+                    index.add(entry)
+                else:
+                    index.update(old_entry, entry)
+
+    def snapshot_state(self):
+        """
+        Parse the core file (without the journal) and build its derived indexes.
+
+        Used by the canon snapshot; restore_state() adopts the result and the
+        journal is then tailed from the start as on any refresh.
+        """
+        bible = _load_snapshot()
+        entries = bible.setdefault("entries", [])
+        by_id = {}
+        for entry in entries:
+            by_id.setdefault(entry.get("id"), entry)
+        return {
+            "bible": bible,
+            "by_id": by_id,
+            "last_number": max(
+                [bible.get("id_counter", 0)] + [_entry_number(entry.get("id")) for entry in entries]
+            ),
+            "indexes": {
+                "search": BibleSearchIndex(entries),
+                "lookup": BibleLookupIndex(entries),
+                "trigrams": TrigramIndex(entries),
+            },
+        }
+
+    def restore_state(self, state, stamp):
+        """Adopt a snapshot_state() result for the core file version identified by stamp."""
+        with self._lock:
+            self._bible = state["bible"]
+            self._by_id = state["by_id"]
+            self._last_number = state["last_number"]
+            self._indexes = dict(state["indexes"])
+            self._stamp = stamp
+            self._journal_inode = None
+            self._journal_offset = 0
+            self._journal_records = 0
+
+    def _reload(self):
+        """Re-read the core file and replay the whole journal."""
+        if self._write_depth:
+            self._read_files()
+        else:
+            # A shared lock keeps a concurrent compaction from swapping the
+            # core file and journal between the two reads
+            with file_lock(_lock_path(), shared=True):
+                self._read_files()
+
+    def _read_files(self):
+        stamp = file_stamp(NERDBIBLE_CORE_PATH)
+        bible = _load_snapshot()
+        entries = bible.setdefault("entries", [])
+        self._by_id = {}
+        for entry in entries:
+            self._by_id.setdefault(entry.get("id"), entry)
+        journal_path = _journal_path()
+        journal = file_stamp(journal_path)
+        records, self._journal_offset = read_journal(journal_path)
+        for record in records:
+            _apply_journal_record(entries, self._by_id, record)
+        self._last_number = max(
+            [bible.get("id_counter", 0)] + [_entry_number(entry.get("id")) for entry in entries]
+        )
+        self._bible = bible
+        self._stamp = stamp or file_stamp(NERDBIBLE_CORE_PATH)
+        self._journal_inode = journal[1] if journal else None
+        self._journal_records = len(records)
+        self._indexes = {}
+
+    @contextmanager
+    def _write_lock(self):
+        """Hold the thread lock and the cross-process writer lock."""
+        with self._lock:
+            if self._write_depth:
+                self._write_depth += 1
+                try:
+                    yield
+                finally:
+                    self._write_depth -= 1
+                return
+            with file_lock(_lock_path()):
+                self._write_depth = 1
+                try:
+                    yield
+                finally:
+                    self._write_depth = 0
+
+    def bible(self):
+        """Return the cached bible, catching up with any changes on disk."""
+        with self._lock:
+            self._refresh()
+            return self._bible
+
+    def entries(self):
+        """Return the cached list of entries."""
+        return self.bible()["entries"]
+
+    def get(self, entry_id):
+        """Return the cached entry with this ID, or None."""
+        with self._lock:
+            self._refresh()
+            return self._by_id.get(entry_id)
+
+    def count(self):
+        """Number of entries in the archive."""
+        return len(self.entries())
+
+    def query(self, limit=None, **filters):
+        """Return entries whose fields equal the filters (case-insensitive), in archive order."""
+        # Lookups run under the lock, since a refresh updates the indexes in place
+        with self._lock:
+            if not filters:
+                entries = self.entries()
+                return list(entries if limit is None else entries[:limit])
+            return self.lookup_index().query(limit=limit, **filters)
+
+    def search(self, query, limit=None, ranked=False):
+        """Substring search in archive order, or BM25-ranked search over the inverted index."""
+        with self._lock:
+            index = self.search_index()
+            if ranked:
+                return [entry for entry, score in index.search(query, limit)]
+            return index.substring(query, limit)
+
+    def fuzzy_search(self, query, fields=FUZZY_FIELDS, limit=10, min_similarity=0.5):
+        """Names close to a possibly misspelled query, from the trigram index."""
+        with self._lock:
+            return self.trigram_index().search(query, fields, limit, min_similarity)
+
+    def parables(self):
+        """Return the parables index, re-reading it when the file changes."""
+        with self._lock:
+            stamp = file_stamp(PARABLES_INDEX_PATH)
+            if stamp != self._parables_stamp:
+                self._parables = _load_parables()
+                self._parables_stamp = stamp
+                self._indexes.pop("verses+parables", None)
+                self._indexes.pop("semantic", None)
+            return self._parables
+
+    def sample_verses(self, k=1, include_parables=True, rng=random):
+        """Draw k distinct verses weighted by tier (and parables by emotional_weight)."""
+        with self._lock:
+            if include_parables:
+                parables = self.parables()
+                sampler = self._index("verses+parables", lambda entries: VerseSampler(entries, parables))
+            else:
+                sampler = self._index("verses", VerseSampler)
+            return sampler.sample(k, rng)
+
+    def semantic_index(self):
+        """Return the hashed-embedding index over entries and parables."""
+        from nerdbible.semantic_index import SemanticIndex
+
+        with self._lock:
+            parables = self.parables()
+            path = semantic_index_path(NERDBIBLE_CORE_PATH)
+            return self._index("semantic", lambda entries: SemanticIndex(entries, parables, path))
+
+    def semantic_search(self, queries, limit=5, include_parables=True):
+        """Return the verses most similar to each query, best first."""
+        with self._lock:
+            index = self.semantic_index()
+            results = index.search_many(queries, limit, include_parables)
+            parables = {parable.get("id"): parable for parable in self._parables}
+            return [
+                [self._by_id.get(key) if kind == "entry" else parables.get(key) for (kind, key), score in hits]
+                for hits in results
+            ]
+
+    def page(self, cursor, page_size):
+        """
+        Return (entries, next_cursor) for up to page_size entries after cursor.
+
+        The cursor is the id of the last entry returned, so it survives a
+        save_bible_core() that removes or reorders entries: paging resumes
+        right after that entry, or, if it was removed, at the first entry
+        numbered after it.
+        """
+        with self._lock:
+            entries = self.entries()
+            start = self._cursor_position(entries, cursor)
+            page = entries[start:start + page_size]
+            return page, (page[-1].get("id") if page else cursor)
+
+    def _cursor_position(self, entries, cursor):
+        """Archive position just after the entry a page cursor names."""
+        if cursor is None:
+            return 0
+        lookup = self.lookup_index()
+        entry = lookup.get(cursor)
+        if entry is None:
+            number = _entry_number(cursor)
+            return next(
+                (position for position, other in enumerate(entries) if _entry_number(other.get("id")) > number),
+                len(entries)
+            )
+        # Duplicated ids earlier in the archive push the entry further along
+        position = lookup.position(cursor)
+        while entries[position] is not entry:
+            position += 1
+        return position + 1
+
+    def metadata(self):
+        """Return the bible's top-level fields other than the entries."""
+        return {key: value for key, value in self.bible().items() if key != "entries"}
+
+    def journal_records(self):
+        """Number of journal records not yet folded into the core file."""
+        with self._lock:
+            self._refresh()
+            return self._journal_records
+
+    def _index(self, name, factory):
+        """Return the derived index `name`, building it from the entries if needed."""
+        with self._lock:
+            entries = self.entries()
+            index = self._indexes.get(name)
+            if index is None:
+                index = self._indexes[name] = factory(entries)
+            return index
+
+    def search_index(self):
+        """Return the full-text search index."""
+        return self._index("search", BibleSearchIndex)
+
+    def lookup_index(self):
+        """Return the id, theme, character, source and tier hash indexes."""
+        return self._index("lookup", BibleLookupIndex)
+
+    def trigram_index(self):
+        """Return the trigram index over character, theme and source names."""
+        return self._index("trigrams", TrigramIndex)
+
+    def invalidate(self):
+        """Drop the cached bible so the next access re-reads the files."""
+        with self._lock:
+            self._bible = None
+            self._by_id = {}
+            self._stamp = None
+            self._indexes = {}
+
+    def save(self, bible_data):
+        """Replace the whole bible on disk, discarding the journal."""
+        with self._write_lock():
+            self._refresh()
+            numbers = [_entry_number(entry.get("id")) for entry in bible_data.get("entries", [])]
+            id_counter = max([self._last_number, bible_data.get("id_counter", 0)] + numbers)
+            saved = _write_bible_file(dict(bible_data, id_counter=id_counter))
+            if saved:
+                _journal_path().unlink(missing_ok=True)
+            self.invalidate()
+            return saved
+
+    def _save_semantic_index(self, force=False):
+        """
+        Persist the semantic index, if it is loaded, once enough rows were
+        embedded since it was last saved (or whenever any were, with force).
+
+        Called on the write path (with the writer lock held), never from a
+        search, so queries do not wait on disk and work on read-only deploys.
+        """
+        index = self._indexes.get("semantic")
+        if index is None or (force and not index.unsaved):
+            return False
+        return index.save() if force else index.save_if_stale()
+
+    def _journal(self, records):
+        """Append records to the journal and apply them to the cache."""
+        with self._write_lock():
+            self._refresh()
+            try:
+                append_journal(_journal_path(), records)
+            except Exception as e:
+                print(f"Error writing NerdBible journal: {e}")
+                return False
+            self._refresh()
+            self._save_semantic_index()
+            return True
+
+    def create_entries(self, items, created_at):
+        """
+        Allocate IDs for new entries and journal them in one append.
+
+        Returns the cached copies of the created entries.
+        """
+        with self._write_lock():
+            self._refresh()
+            first_number = self._last_number + 1
+            entries = [
+                _new_entry(
+                    format_entry_id(first_number + offset),
+                    item["theme"],
+                    item["quote"],
+                    item["source"],
+                    item["character"],
+                    item.get("tier", "Trial Ruling"),
+                    created_at
+                )
+                for offset, item in enumerate(items)
+            ]
+            if not entries or not self._journal([{"op": "create", "entry": entry} for entry in entries]):
+                return []
+            return [self._by_id.get(entry["id"]) for entry in entries]
+
+    def update_entry(self, entry_id, changes):
+        """Journal field changes to an existing entry and return the cached copy."""
+        with self._write_lock():
+            if self.get(entry_id) is None:
+                return None
+            if not self._journal([{"op": "update", "id": entry_id, "changes": changes}]):
+                return None
+            return self._by_id.get(entry_id)
+
+    def compact(self):
+        """
+        Fold the journal into the core file and persist the semantic index.
+
+        The core file is replaced atomically before the journal is removed,
+        so a crash in between only leaves records that replay idempotently.
+        """
+        with self._write_lock():
+            self._refresh()
+            self._save_semantic_index(force=True)
+            if not self._journal_records and not _journal_path().exists():
+                return True
+            self._bible["id_counter"] = self._last_number
+            if not _write_bible_file(self._bible):
+                return False
+            _journal_path().unlink(missing_ok=True)
+            self._stamp = file_stamp(NERDBIBLE_CORE_PATH)
+            self._journal_inode = None
+            self._journal_offset = 0
+            self._journal_records = 0
+            return True
+
+class _CompactionThread(threading.Thread):
+    """Daemon thread that compacts the journal once it grows past a threshold."""
+
+    def __init__(self, store, interval, min_records):
+        super().__init__(name="nerdbible-compaction", daemon=True)
+        self.store = store
+        self.interval = interval
+        self.min_records = min_records
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                if self.store.journal_records() >= self.min_records:
+                    self.store.compact()
+            except Exception as e:
+                print(f"Error compacting NerdBible journal: {e}")
+
+    def stop(self):
+        """Stop the thread after its current pass."""
+        self._stopped.set()
+
+# Store used by the module-level functions, created on first use
+_bible_store = None
+
+def _create_default_store():
+    """
+    Create the store selected by NERDBIBLE_BACKEND ("json" or "sqlite").
+
+    The SQLite database path can be set with NERDBIBLE_DB_PATH.
+    """
+    backend = os.getenv("NERDBIBLE_BACKEND", "json").lower()
+    if backend == "sqlite":
+        from nerdbible.sqlite_store import SqliteBibleStore
+        return SqliteBibleStore(os.getenv("NERDBIBLE_DB_PATH"))
+    if backend != "json":
+        raise ValueError(f"Unknown NerdBible backend: {backend}")
+    return BibleStore()
+
+def get_bible_store():
+    """Get the NerdBible store used by the module-level functions."""
+    global _bible_store
+    if _bible_store is None:
+        _bible_store = _create_default_store()
+    return _bible_store
+
+def set_bible_store(store):
+    """Plug in a different NerdBible store (a BibleStore, SqliteBibleStore or compatible object)."""
+    global _bible_store
+    _bible_store = store
+
+def save_bible_core(bible_data):
+    """Save the NerdBible core file."""
+    return get_bible_store().save(bible_data)
+
+def compact_bible():
+    """Fold the NerdBible journal back into the core file."""
+    return get_bible_store().compact()
+
+def start_background_compaction(interval=60.0, min_records=JOURNAL_COMPACT_THRESHOLD):
+    """
+    Compact the NerdBible journal in a daemon thread.
+
+    Every `interval` seconds the journal is compacted if it holds at least
+    `min_records` records. Returns the thread; call stop() on it to end it.
+    """
+    thread = _CompactionThread(get_bible_store(), interval, min_records)
+    thread.start()
+    return thread
+
 def get_all_entries():
     """Get all NerdBible entries."""
-    bible = load_bible_core()
-    return bible.get("entries", [])
+    return list(get_bible_store().entries())
 
 def get_entry_by_id(entry_id):
     """Get a NerdBible entry by ID."""
-    bible = load_bible_core()
-    entries = bible.get("entries", [])
-    for entry in entries:
-        if entry.get("id") == entry_id:
-            return entry
-    return None
+    return get_bible_store().get(entry_id)
 
 def get_entries_by_theme(theme):
     """Get NerdBible entries by theme."""
-    bible = load_bible_core()
-    entries = bible.get("entries", [])
-    return [entry for entry in entries if entry.get("theme", "").lower() == theme.lower()]
+    return get_bible_store().query(theme=theme)
 
 def get_entries_by_character(character):
     """Get NerdBible entries by character."""
-    bible = load_bible_core()
-    entries = bible.get("entries", [])
-    return [entry for entry in entries if entry.get("character", "").lower() == character.lower()]
+    return get_bible_store().query(character=character)
+
+def query_entries(theme=None, character=None, tier=None, limit=None, source=None):
+    """
+    Get NerdBible entries matching every given field (case-insensitive).
+
+    For example query_entries(theme="legacy", character="Tony Stark") is
+    answered by intersecting the theme and character indexes.
+    """
+    filters = {
+        field: value
+        for field, value in (("theme", theme), ("character", character), ("source", source), ("tier", tier))
+        if value is not None
+    }
+    return get_bible_store().query(limit=limit, **filters)
 
 def create_entry(theme, quote, source, character, tier="Trial Ruling"):
     """Create a new NerdBible entry."""
-    bible = load_bible_core()
-    entries = bible.get("entries", [])
-    
-    # Generate a new entry ID
-    entry_id = f"NB-{len(entries) + 1:04d}"
-    
-    # Create the new entry
-    new_entry = {
-        "id": entry_id,
+    created = create_entries([{
         "theme": theme,
         "quote": quote,
         "source": source,
         "character": character,
-        "tier": tier,
-        "created_at": datetime.utcnow().isoformat() + "Z"
-    }
-    
-    # Add the entry to the list
-    entries.append(new_entry)
-    bible["entries"] = entries
-    
-    # Save the updated Bible
-    save_bible_core(bible)
-    
-    return new_entry
+        "tier": tier
+    }])
+    return created[0] if created else None
+
+def create_entries(entries):
+    """
+    Create many NerdBible entries in one write.
+
+    Each item is a dict with theme, quote, source and character, plus an
+    optional tier (default "Trial Ruling"). IDs are assigned in one pass
+    and all entries are persisted with a single journal append. Returns
+    the created entries, or an empty list if the write failed.
+    """
+    return get_bible_store().create_entries(list(entries), datetime.utcnow().isoformat() + "Z")
+
+def update_entry(entry_id, **fields):
+    """
+    Update fields of an existing NerdBible entry.
+
+    Only theme, quote, source, character and tier can be changed. Returns
+    the updated entry, or None if no entry has that ID.
+    """
+    unknown = set(fields) - set(UPDATABLE_FIELDS)
+    if unknown:
+        raise ValueError(f"Cannot update NerdBible fields: {', '.join(sorted(unknown))}")
+    changes = dict(fields, updated_at=datetime.utcnow().isoformat() + "Z")
+    return get_bible_store().update_entry(entry_id, changes)
+
+def _trial_entry_specs(trial_data):
+    """Yield create_entries() items for the quotes in a trial record."""
+    title = trial_data.get("title", "Untitled Trial")
+    theme = (trial_data.get("charges") or ["Justice"])[0].lower()
 
-def create_entry_from_trial(trial_data):
-    """Create NerdBible entries from a trial record."""
-    entries = []
-    
     # Extract notable quotes from the trial
     for quote in trial_data.get("notable_quotes", []):
         # Try to extract character and quote text
@@ -130,57 +726,119 @@ def create_entry_from_trial(trial_data):
         else:
             character = "Tribunal"
             quote_text = quote.strip().strip('"')
-        
-        # Create an entry for each quote
-        entry = create_entry(
-            theme=trial_data.get("charges", ["Justice"])[0].lower(),
-            quote=quote_text,
-            source=trial_data.get("title", "Untitled Trial"),
-            character=character,
-            tier="Trial Ruling"
-        )
-        entries.append(entry)
-    
-    # Create an entry for the post-credit scene quote if it exists
+
+        yield {
+            "theme": theme,
+            "quote": quote_text,
+            "source": title,
+            "character": character,
+            "tier": "Trial Ruling"
+        }
+
+    # Add the post-credit scene quote if it exists
     post_credit = trial_data.get("post_credit_scene", {})
     if post_credit and post_credit.get("quote"):
         # Use the first present character as the speaker, or "Witness" if none
-        character = post_credit.get("present", ["Witness"])[0]
-        entry = create_entry(
-            theme="reflection",
-            quote=post_credit.get("quote"),
-            source=f"{trial_data.get('title', 'Untitled Trial')} (Post-Credit)",
-            character=character,
-            tier="Golden Frame"
-        )
-        entries.append(entry)
-    
-    return entries
+        yield {
+            "theme": "reflection",
+            "quote": post_credit.get("quote"),
+            "source": f"{title} (Post-Credit)",
+            "character": (post_credit.get("present") or ["Witness"])[0],
+            "tier": "Golden Frame"
+        }
 
-def search_bible(query):
-    """Search the NerdBible for entries matching the query."""
-    bible = load_bible_core()
-    entries = bible.get("entries", [])
-    results = []
-    
-    query = query.lower()
-    for entry in entries:
-        # Check if the query appears in any of the entry fields
-        if (query in entry.get("theme", "").lower() or
-            query in entry.get("quote", "").lower() or
-            query in entry.get("source", "").lower() or
-            query in entry.get("character", "").lower()):
-            results.append(entry)
-    
-    return results
+def create_entry_from_trial(trial_data):
+    """Create NerdBible entries from a trial record."""
+    return create_entries(_trial_entry_specs(trial_data))
+
+def create_entries_from_trials(trials):
+    """
+    Create NerdBible entries from many trial records in one write.
+
+    Intended for backfills: every quote from every trial is persisted
+    with a single journal append.
+    """
+    return create_entries(spec for trial_data in trials for spec in _trial_entry_specs(trial_data))
+
+def search_bible(query, limit=None, ranked=False):
+    """
+    Search the NerdBible for entries matching the query.
+
+    By default an entry matches when the query is a case-insensitive
+    substring of its theme, quote, source or character, and results come back
+    in archive order. With ranked=True the query is run against the inverted
+    index instead: every word must match, "quoted phrases" must appear in
+    order, a trailing * matches any word with that prefix, and results are
+    sorted by BM25 score.
+    """
+    return get_bible_store().search(query, limit, ranked)
+
+def fuzzy_search_names(query, fields=FUZZY_FIELDS, limit=10, min_similarity=0.5):
+    """
+    Find character, theme and source names close to a possibly misspelled query.
+
+    Returns [{"name", "field", "similarity"}] best first, e.g.
+    fuzzy_search_names("Magnito") -> [{"name": "Magneto Prime", "field": "character", ...}].
+    similarity is the share of the query's trigrams found in the name.
+    """
+    return get_bible_store().fuzzy_search(query, fields, limit, min_similarity)
+
+def fuzzy_search_bible(query, limit=10, min_similarity=0.5):
+    """
+    Search the NerdBible for entries whose character, theme or source fuzzily matches the query.
+
+    Entries of the best-matching names come first.
+    """
+    store = get_bible_store()
+    results = {}
+    for match in store.fuzzy_search(query, FUZZY_FIELDS, None, min_similarity):
+        for entry in store.query(limit=limit, **{match["field"]: match["name"]}):
+            results.setdefault(entry.get("id"), entry)
+            if len(results) >= limit:
+                return list(results.values())
+    return list(results.values())
+
+def semantic_search(query, limit=5, include_parables=True):
+    """
+    Find the verses closest in meaning to a natural-language query, offline.
+
+    Bible entries (and parables) are ranked by cosine similarity of hashed
+    word embeddings, so "standing by those in pain" finds verses about
+    grief even without an exact theme match. Requires numpy.
+    """
+    return get_bible_store().semantic_search([query], limit, include_parables)[0]
+
+def semantic_search_many(queries, limit=5, include_parables=True):
+    """Run semantic_search for many queries at once, scored as one batched matrix product."""
+    return get_bible_store().semantic_search(list(queries), limit, include_parables)
+
+def get_scripture_by_theme(theme, limit=5, include_parables=True):
+    """
+    Get scripture for a theme: exact theme matches first, then semantic matches.
+
+    Backs the getScriptureByTheme intent ("what does the bible say about ...").
+    """
+    verses = get_bible_store().query(limit=limit, theme=theme)
+    if len(verses) < limit:
+        seen = {verse.get("id") for verse in verses}
+        for verse in semantic_search(theme, limit + len(verses), include_parables):
+            if verse is not None and verse.get("id") not in seen:
+                verses.append(verse)
+                seen.add(verse.get("id"))
+            if len(verses) >= limit:
+                break
+    return verses
 
-def get_random_verse():
-    """Get a random verse from the NerdBible."""
-    import random
-    bible = load_bible_core()
-    entries = bible.get("entries", [])
+def get_random_verse(include_parables=True):
+    """
+    Get a random verse from the NerdBible.
+
+    Verses are weighted by tier, and parables from parables_index.json by
+    their emotional_weight.
+    """
+    verses = get_bible_store().sample_verses(1, include_parables)
     
-    if not entries:
+    if not verses:
         return {
             "id": "NB-0000",
             "theme": "beginning",
@@ -190,19 +848,77 @@ def get_random_verse():
             "tier": "System Message"
         }
     
-    return random.choice(entries)
+    return verses[0]
 
-def export_bible_to_json(output_path=None):
-    """Export the NerdBible to a JSON file."""
-    bible = load_bible_core()
-    
-    if output_path is None:
-        output_path = f"nerdbible_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    
+def get_random_verses(k, include_parables=True):
+    """
+    Get k distinct weighted random verses, e.g. a "verse of the day" batch.
+
+    Returns fewer than k verses if the archive is smaller than that.
+    """
+    return get_bible_store().sample_verses(k, include_parables)
+
+def get_entries_page(cursor=None, page_size=100):
+    """
+    Get one page of NerdBible entries in archive order.
+
+    Returns (entries, next_cursor). Pass next_cursor back to continue; a
+    page shorter than page_size means the end of the archive was reached,
+    and the same cursor will pick up entries created later.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    return get_bible_store().page(cursor, page_size)
+
+def iter_entries(cursor=None, page_size=100):
+    """Iterate over NerdBible entries from cursor onward, fetching one page at a time."""
+    while True:
+        entries, cursor = get_entries_page(cursor, page_size)
+        yield from entries
+        if len(entries) < page_size:
+            return
+
+def export_bible(output_path, format="json", compress=None, page_size=1000):
+    """
+    Stream the NerdBible to a file in constant memory.
+
+    format is "json" (the core file's shape) or "jsonl" (the bible's
+    metadata on the first line, then one entry per line). With compress,
+    or when output_path ends in .gz, the file is gzip-compressed.
+    Returns output_path, or None on error.
+    """
+    if format not in ("json", "jsonl"):
+        raise ValueError(f"Unknown export format: {format}")
+    if compress is None:
+        compress = str(output_path).endswith(".gz")
+
+    store = get_bible_store()
     try:
-        with open(output_path, "w") as f:
-            json.dump(bible, f, indent=2)
+        opener = gzip.open if compress else open
+        with opener(output_path, "wt", encoding="utf-8") as f:
+            metadata = store.metadata()
+            if format == "jsonl":
+                f.write(json.dumps(metadata) + "\n")
+                for entry in iter_entries(page_size=page_size):
+                    f.write(json.dumps(entry) + "\n")
+            else:
+                f.write("{\n")
+                for key, value in metadata.items():
+                    f.write(f"  {json.dumps(key)}: {json.dumps(value)},\n")
+                f.write('  "entries": [')
+                separator = "\n    "
+                for entry in iter_entries(page_size=page_size):
+                    f.write(separator + json.dumps(entry))
+                    separator = ",\n    "
+                f.write("\n  ]\n}\n")
         return output_path
     except Exception as e:
         print(f"Error exporting NerdBible: {e}")
         return None
+
+def export_bible_to_json(output_path=None):
+    """Export the NerdBible to a JSON file."""
+    if output_path is None:
+        output_path = f"nerdbible_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    
+    return export_bible(output_path, format="json")
@@ -0,0 +1,40 @@
+"""
+NerdBible File Lock
+
+Advisory cross-process lock on a sidecar lock file, so several workers
+(gunicorn, the Flask app, the CLI) can share one NerdBible safely.
+"""
+
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+@contextmanager
+def file_lock(path, shared=False):
+    """
+    Hold a lock on `path` for the duration of the block.
+
+    Writers take an exclusive lock; readers that need a consistent view of
+    several files take a shared one. On Windows every lock is exclusive.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
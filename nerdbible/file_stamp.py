@@ -0,0 +1,17 @@
+"""
+File Stamp
+
+Cheap change detection for the files the caches hot-reload (the NerdBible
+core file, canon JSON files, intent map, Zord rules): a stamp changes
+whenever a file is replaced, rewritten or resized.
+"""
+
+from pathlib import Path
+
+def file_stamp(path):
+    """Identify the current on-disk version of a file, or None if missing."""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return (str(path), stat.st_ino, stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,72 @@
+"""
+NerdBible Journal
+
+Append-only JSONL journal of NerdBible writes. New and updated entries are
+appended here instead of rewriting the whole core file; the journal is
+replayed on load and folded back into the core file by compaction.
+"""
+
+import os
+import json
+
+def read_journal(path, offset=0):
+    """
+    Read journal records written after a byte offset.
+
+    Returns (records, offset) where offset points just past the last complete
+    line. A trailing line without a newline is still being written (or was
+    torn by a crash) and is left for the next read. Complete lines that are
+    not valid JSON are skipped.
+    """
+    records = []
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError as e:
+                    print(f"Skipping corrupt NerdBible journal line: {e}")
+    except FileNotFoundError:
+        pass
+    return records, offset
+
+def append_journal(path, records):
+    """
+    Append records to the journal in a single write and fsync it.
+
+    If the journal ends in a torn line from an earlier crash, a newline is
+    written first so the new records start on a line of their own.
+    """
+    payload = b"".join(
+        json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n" for record in records
+    )
+    fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b"\n":
+            payload = b"\n" + payload
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def atomic_write_json(path, data):
+    """Write JSON to a temporary file and rename it over path."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
@@ -0,0 +1,87 @@
+"""
+NerdBible Lookup Index
+
+Dictionary-backed secondary indexes over NerdBible entries: id -> entry for
+point lookups, and casefolded theme, character, source and tier -> entry ids
+for equality filters. Multi-key queries intersect the id sets.
+"""
+
+# Fields with an equality index
+LOOKUP_FIELDS = ("theme", "character", "source", "tier")
+
+def lookup_key(value):
+    """Normalize a field value for equality lookups."""
+    return (value or "").casefold()
+
+class BibleLookupIndex:
+    """
+    Hash indexes over NerdBible entries.
+
+    Results of filtered lookups are returned in archive order. If an id is
+    duplicated in the archive, the first entry wins, matching the old linear
+    scan.
+    """
+
+    def __init__(self, entries=()):
+        self._by_id = {}
+        self._positions = {}
+        self._postings = {field: {} for field in LOOKUP_FIELDS}
+        for entry in entries:
+            self.add(entry)
+
+    def add(self, entry):
+        """Index one entry."""
+        entry_id = entry.get("id")
+        if entry_id in self._by_id:
+            return
+        self._by_id[entry_id] = entry
+        self._positions[entry_id] = len(self._positions)
+        for field in LOOKUP_FIELDS:
+            self._postings[field].setdefault(lookup_key(entry.get(field)), set()).add(entry_id)
+
+    def update(self, old_entry, entry):
+        """Re-index an entry whose fields changed from old_entry."""
+        entry_id = entry.get("id")
+        if self._by_id.get(entry_id) is not entry:
+            return
+        for field in LOOKUP_FIELDS:
+            old_key = lookup_key(old_entry.get(field))
+            new_key = lookup_key(entry.get(field))
+            if old_key != new_key:
+                postings = self._postings[field]
+                postings[old_key].discard(entry_id)
+                if not postings[old_key]:
+                    del postings[old_key]
+                postings.setdefault(new_key, set()).add(entry_id)
+
+    def get(self, entry_id):
+        """Return the entry with this id, or None."""
+        return self._by_id.get(entry_id)
+
+    def position(self, entry_id):
+        """Return the entry's position among the archive's distinct ids, or None."""
+        return self._positions.get(entry_id)
+
+    def ids(self, field, value):
+        """Return the set of entry ids whose field equals value (casefolded)."""
+        return self._postings[field].get(lookup_key(value), set())
+
+    def query(self, limit=None, **filters):
+        """
+        Return entries matching every field=value filter, in archive order.
+
+        Filters are answered by intersecting the id sets of each field,
+        smallest first.
+        """
+        id_sets = sorted((self.ids(field, value) for field, value in filters.items()), key=len)
+        if not id_sets:
+            return []
+        matched = set(id_sets[0])
+        for ids in id_sets[1:]:
+            matched &= ids
+            if not matched:
+                return []
+        ordered = sorted(matched, key=self._positions.__getitem__)
+        if limit is not None:
+            ordered = ordered[:limit]
+        return [self._by_id[entry_id] for entry_id in ordered]
@@ -0,0 +1,181 @@
+"""
+NerdBible Verse Sampling
+
+Weighted random selection of verses. Bible entries are weighted by tier and
+parables by their emotional_weight. Items with equal weight share a bucket;
+a Vose alias table over the buckets picks a bucket in O(1) and a uniform
+draw picks the item inside it, so each draw is O(1). Adding, moving or
+removing an item only touches its bucket and rebuilds the small alias table
+over the buckets, never a table over every item.
+"""
+
+import heapq
+import random
+
+# Sampling weight per NerdBible tier; parables use their emotional_weight (1-10)
+TIER_WEIGHTS = {
+    "Golden Frame": 10,
+    "Mythos Verse": 9,
+    "Core Verse": 8,
+    "Oath Verse": 7,
+    "Trial Ruling": 5,
+    "Verified Panel Quote": 3,
+    "System Message": 0,
+}
+DEFAULT_TIER_WEIGHT = 5
+
+# Draws attempted by rejection before sample_distinct falls back to a full pass
+MAX_REJECTION_DRAWS = 20
+
+def verse_weight(item):
+    """Sampling weight of a bible entry or parable."""
+    if "emotional_weight" in item:
+        try:
+            return max(float(item["emotional_weight"]), 0.0)
+        except (TypeError, ValueError):
+            return float(DEFAULT_TIER_WEIGHT)
+    return float(TIER_WEIGHTS.get(item.get("tier"), DEFAULT_TIER_WEIGHT))
+
+class AliasTable:
+    """Vose alias table: O(n) to build, O(1) per weighted draw of an index."""
+
+    def __init__(self, weights):
+        count = len(weights)
+        total = sum(weights)
+        if not count or total <= 0:
+            raise ValueError("AliasTable needs at least one positive weight")
+        self.probability = [0.0] * count
+        self.alias = [0] * count
+
+        scaled = [weight * count / total for weight in weights]
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            self.probability[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+        for i in small + large:
+            self.probability[i] = 1.0
+
+    def draw(self, rng=random):
+        """Return an index with probability proportional to its weight."""
+        i = rng.randrange(len(self.probability))
+        return i if rng.random() < self.probability[i] else self.alias[i]
+
+class WeightedSampler:
+    """
+    Weighted sampler over keyed items.
+
+    set() adds or re-weights an item and remove() drops it, each in O(1)
+    plus an O(buckets) alias rebuild deferred to the next draw.
+    """
+
+    def __init__(self):
+        self._items = {}
+        self._buckets = {}
+        self._positions = {}
+        self._bucket_weights = None
+        self._table = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        """Return the item stored under key, or None."""
+        return self._items.get(key)
+
+    def set(self, key, item, weight):
+        """Add an item, or replace it and move it to its new weight's bucket."""
+        if key in self._items:
+            self.remove(key)
+        if weight <= 0:
+            return
+        bucket = self._buckets.setdefault(weight, [])
+        self._positions[key] = (weight, len(bucket))
+        bucket.append(key)
+        self._items[key] = item
+        self._table = None
+
+    def remove(self, key):
+        """Drop an item if present."""
+        if key not in self._items:
+            return
+        del self._items[key]
+        weight, position = self._positions.pop(key)
+        bucket = self._buckets[weight]
+        last = bucket.pop()
+        if last != key:
+            bucket[position] = last
+            self._positions[last] = (weight, position)
+        if not bucket:
+            del self._buckets[weight]
+        self._table = None
+
+    def _sample_key(self, rng):
+        if self._table is None:
+            self._bucket_weights = list(self._buckets)
+            self._table = AliasTable([weight * len(self._buckets[weight]) for weight in self._bucket_weights])
+        bucket = self._buckets[self._bucket_weights[self._table.draw(rng)]]
+        return bucket[rng.randrange(len(bucket))]
+
+    def sample(self, rng=random):
+        """Draw one item, or None if the sampler is empty."""
+        if not self._items:
+            return None
+        return self._items[self._sample_key(rng)]
+
+    def sample_distinct_keys(self, k, rng=random):
+        """
+        Draw the keys of up to k distinct items without replacement.
+
+        Small batches use rejection over O(1) draws; when rejections pile up
+        (k close to the population, or very skewed weights) it falls back to
+        Efraimidis-Spirakis weighted reservoir keys in one O(n log k) pass.
+        """
+        k = min(k, len(self._items))
+        if k <= 0:
+            return []
+        chosen = {}
+        for _ in range(k * MAX_REJECTION_DRAWS):
+            chosen.setdefault(self._sample_key(rng))
+            if len(chosen) == k:
+                return list(chosen)
+
+        return heapq.nlargest(k, self._items, key=lambda key: rng.random() ** (1.0 / self._positions[key][0]))
+
+    def sample_distinct(self, k, rng=random):
+        """Draw up to k distinct items without replacement."""
+        return [self._items[key] for key in self.sample_distinct_keys(k, rng)]
+
+class VerseSampler:
+    """
+    WeightedSampler over bible entries and parables, kept in sync by a store.
+
+    Follows the derived-index protocol used by BibleStore: built from the
+    entries, then updated with add() and update().
+    """
+
+    def __init__(self, entries=(), parables=()):
+        self.sampler = WeightedSampler()
+        for entry in entries:
+            self.add(entry)
+        for parable in parables:
+            self.sampler.set(("parable", parable.get("id")), parable, verse_weight(parable))
+
+    def add(self, entry):
+        self.sampler.set(("entry", entry.get("id")), entry, verse_weight(entry))
+
+    def update(self, old_entry, entry):
+        self.sampler.remove(("entry", old_entry.get("id")))
+        self.add(entry)
+
+    def sample(self, k=1, rng=random):
+        """Draw k distinct verses."""
+        return self.sampler.sample_distinct(k, rng)
+
+    def sample_keys(self, k=1, rng=random):
+        """Draw k distinct ("entry" | "parable", id) keys."""
+        return self.sampler.sample_distinct_keys(k, rng)
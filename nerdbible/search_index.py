@@ -0,0 +1,378 @@
+"""
+NerdBible Search Index
+
+Tokenized inverted index over NerdBible entries. Supports BM25-ranked
+queries with "quoted phrases" and trailing-* prefix terms, plus the
+original case-insensitive substring semantics of search_bible().
+"""
+
+import re
+import math
+from bisect import bisect_left, insort
+
+# Fields of an entry that are searchable, in the order search_bible checks them
+SEARCH_FIELDS = ("theme", "quote", "source", "character")
+
+# BM25 tuning parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Position gap between fields so phrases never match across field boundaries
+FIELD_GAP = 1000
+
+TOKEN_PATTERN = re.compile(r"\w+")
+CLAUSE_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+def tokenize(text):
+    """Split text into casefolded word tokens."""
+    return TOKEN_PATTERN.findall(text.casefold())
+
+def _haystack(entry):
+    """Lower-cased searchable fields joined by a separator no query contains."""
+    return "\0".join((entry.get(field) or "").lower() for field in SEARCH_FIELDS)
+
+class BibleSearchIndex:
+    """
+    Inverted index over NerdBible entries.
+
+    Documents are numbered in insertion order, so substring results come back
+    in the same order as the entries list. The index is built once and then
+    kept up to date with add() and update().
+    """
+
+    def __init__(self, entries=()):
+        self._docs = []
+        self._doc_numbers = {}
+        self._haystacks = []
+        self._lengths = []
+        self._postings = {}
+        self._vocabulary = []
+        self._total_length = 0
+        for entry in entries:
+            self.add(entry)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, entry):
+        """Index one entry."""
+        doc = len(self._docs)
+        self._docs.append(entry)
+        self._doc_numbers.setdefault(entry.get("id"), doc)
+        self._haystacks.append(_haystack(entry))
+        self._lengths.append(0)
+        self._index_tokens(doc, entry)
+
+    def update(self, old_entry, entry):
+        """Re-index an entry whose searchable fields changed from old_entry."""
+        doc = self._doc_numbers.get(entry.get("id"))
+        if doc is None:
+            return
+        for token in set(self._field_tokens(old_entry)):
+            postings = self._postings[token]
+            postings.pop(doc, None)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+        self._total_length -= self._lengths[doc]
+        self._docs[doc] = entry
+        self._haystacks[doc] = _haystack(entry)
+        self._index_tokens(doc, entry)
+
+    def _field_tokens(self, entry):
+        for field in SEARCH_FIELDS:
+            yield from tokenize(entry.get(field) or "")
+
+    def _index_tokens(self, doc, entry):
+        length = 0
+        for field_number, field in enumerate(SEARCH_FIELDS):
+            offset = field_number * FIELD_GAP
+            tokens = tokenize(entry.get(field) or "")
+            for position, token in enumerate(tokens):
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    insort(self._vocabulary, token)
+                postings.setdefault(doc, []).append(offset + position)
+            length += len(tokens)
+        self._lengths[doc] = length
+        self._total_length += length
+
+    def substring(self, query, limit=None):
+        """Return entries where the query is a substring of any searchable field."""
+        query = query.lower()
+        results = []
+        if "\0" in query:
+            return results
+        for doc, haystack in enumerate(self._haystacks):
+            if query in haystack:
+                results.append(self._docs[doc])
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def search(self, query, limit=None):
+        """
+        Return (entry, score) pairs ranked by BM25.
+
+        Every clause of the query must match. A clause is a bare word, a
+        "quoted phrase" or a prefix ending in *.
+        """
+        clauses = self._parse(query)
+        if not clauses:
+            return []
+
+        matches = [self._match_clause(clause) for clause in clauses]
+        matches.sort(key=len)
+        candidates = set(matches[0])
+        for match in matches[1:]:
+            candidates.intersection_update(match)
+            if not candidates:
+                return []
+
+        total_docs = len(self._docs)
+        average_length = (self._total_length / total_docs) or 1
+        idfs = [self._idf(len(match), total_docs) for match in matches]
+
+        scored = []
+        for doc in candidates:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[doc] / average_length)
+            score = 0.0
+            for match, idf in zip(matches, idfs):
+                tf = match[doc]
+                score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            scored.append((score, doc))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        if limit is not None:
+            scored = scored[:limit]
+        return [(self._docs[doc], score) for score, doc in scored]
+
+    def _parse(self, query):
+        """Split a query into (kind, tokens) clauses."""
+        clauses = []
+        for phrase, word in CLAUSE_PATTERN.findall(query):
+            if phrase:
+                tokens = tokenize(phrase)
+                if tokens:
+                    clauses.append(("phrase", tokens))
+            elif word.endswith("*") and len(tokenize(word)) == 1:
+                clauses.append(("prefix", tokenize(word)))
+            else:
+                tokens = tokenize(word)
+                if len(tokens) == 1:
+                    clauses.append(("term", tokens))
+                elif tokens:
+                    # Words like "spider-man" must match as a phrase
+                    clauses.append(("phrase", tokens))
+        return clauses
+
+    def _match_clause(self, clause):
+        """Return {doc: term frequency} for one clause."""
+        kind, tokens = clause
+        if kind == "term":
+            return {doc: len(positions) for doc, positions in self._postings.get(tokens[0], {}).items()}
+        if kind == "prefix":
+            return self._match_prefix(tokens[0])
+        return self._match_phrase(tokens)
+
+    def _match_prefix(self, prefix):
+        counts = {}
+        vocabulary = self._vocabulary
+        for i in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            token = vocabulary[i]
+            if not token.startswith(prefix):
+                break
+            for doc, positions in self._postings[token].items():
+                counts[doc] = counts.get(doc, 0) + len(positions)
+        return counts
+
+    def _match_phrase(self, tokens):
+        postings = [self._postings.get(token) for token in tokens]
+        if not all(postings):
+            return {}
+        counts = {}
+        docs = set(postings[0])
+        for other in postings[1:]:
+            docs.intersection_update(other)
+        for doc in docs:
+            following = [set(p[doc]) for p in postings[1:]]
+            hits = sum(
+                1 for start in postings[0][doc]
+                if all(start + i + 1 in positions for i, positions in enumerate(following))
+            )
+            if hits:
+                counts[doc] = hits
+        return counts
+
+    @staticmethod
+    def _idf(doc_frequency, total_docs):
+        return math.log(1 + (total_docs - doc_frequency + 0.5) / (doc_frequency + 0.5))
+
+# Fields whose distinct values are indexed for typo-tolerant name search
+FUZZY_FIELDS = ("character", "theme", "source")
+
+# A trigram's bitmask is cached once at least 1 in this many names contain it
+MASK_DENSITY = 64
+
+def trigrams(text):
+    """Set of word trigrams, each word padded like pg_trgm ("  w" ... "d ")."""
+    grams = set()
+    for word in tokenize(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+class TrigramIndex:
+    """
+    Trigram index over the distinct character, theme and source names.
+
+    similarity is the share of the query's trigrams found in a name (so
+    "Magnito" still finds "Magneto Prime"), with Jaccard similarity breaking
+    ties in favour of names closer in length. Each name gets a small integer
+    id, and a query counts how many of its trigrams every name shares with
+    bitwise operations over one integer bitmask per trigram, so only the
+    names that reach the minimum overlap are ever looked at in Python.
+    Bitmasks of common trigrams are cached until their postings change.
+    """
+
+    def __init__(self, entries=()):
+        self._grams = {}
+        self._variants = {}
+        self._postings = {}
+        self._ids = {}
+        self._keys = []
+        self._free_ids = []
+        self._masks = {}
+        for entry in entries:
+            self.add(entry)
+
+    def __len__(self):
+        return len(self._grams)
+
+    def __getstate__(self):
+        # Cached bitmasks are rebuilt on demand rather than stored
+        return dict(self.__dict__, _masks={})
+
+    def add(self, entry):
+        """Index the names used by one entry."""
+        for field in FUZZY_FIELDS:
+            value = entry.get(field)
+            if value:
+                self._add_name(field, value)
+
+    def update(self, old_entry, entry):
+        """Re-index an entry whose names changed from old_entry."""
+        for field in FUZZY_FIELDS:
+            if old_entry.get(field) != entry.get(field):
+                if old_entry.get(field):
+                    self._remove_name(field, old_entry[field])
+                if entry.get(field):
+                    self._add_name(field, entry[field])
+
+    def _add_name(self, field, value):
+        key = " ".join(tokenize(value))
+        if not key:
+            return
+        variants = self._variants.get(key)
+        if variants is None:
+            variants = self._variants[key] = {}
+            if self._free_ids:
+                name_id = self._free_ids.pop()
+                self._keys[name_id] = key
+            else:
+                name_id = len(self._keys)
+                self._keys.append(key)
+            self._ids[key] = name_id
+            grams = self._grams[key] = frozenset(trigrams(key))
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(name_id)
+                self._masks.pop(gram, None)
+        variants[(field, value)] = variants.get((field, value), 0) + 1
+
+    def _remove_name(self, field, value):
+        key = " ".join(tokenize(value))
+        variants = self._variants.get(key)
+        if not variants or (field, value) not in variants:
+            return
+        variants[(field, value)] -= 1
+        if not variants[(field, value)]:
+            del variants[(field, value)]
+        if not variants:
+            del self._variants[key]
+            name_id = self._ids.pop(key)
+            self._keys[name_id] = None
+            self._free_ids.append(name_id)
+            for gram in self._grams.pop(key):
+                postings = self._postings[gram]
+                postings.discard(name_id)
+                self._masks.pop(gram, None)
+                if not postings:
+                    del self._postings[gram]
+
+    def _mask(self, gram):
+        """Bitmask of the ids of the names containing a trigram."""
+        mask = self._masks.get(gram)
+        if mask is not None:
+            return mask
+        postings = self._postings.get(gram)
+        if not postings:
+            return 0
+        bits = bytearray(len(self._keys) // 8 + 1)
+        for name_id in postings:
+            bits[name_id >> 3] |= 1 << (name_id & 7)
+        mask = int.from_bytes(bits, "little")
+        # Only cache masks no larger than the postings they replace
+        if len(postings) * MASK_DENSITY >= len(self._keys):
+            self._masks[gram] = mask
+        return mask
+
+    def search(self, query, fields=FUZZY_FIELDS, limit=10, min_similarity=0.5):
+        """
+        Return names similar to the query, best first.
+
+        Each result is {"name", "field", "similarity"}; a name used in
+        several fields (or with several spellings of case) appears once per
+        field and spelling.
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        min_overlap = max(1, math.ceil(min_similarity * len(query_grams) - 1e-9))
+        if min_overlap > len(query_grams):
+            return []
+
+        # at_least[n] has the bit of every name sharing at least n of the
+        # query trigrams seen so far
+        at_least = [0] * (min_overlap + 1)
+        seen = 0
+        for gram in query_grams:
+            mask = self._mask(gram)
+            if not mask:
+                continue
+            seen += 1
+            for n in range(min(seen, min_overlap), 1, -1):
+                at_least[n] |= at_least[n - 1] & mask
+            at_least[1] |= mask
+
+        scored = []
+        bits = bin(at_least[min_overlap])[:1:-1]
+        name_id = bits.find("1")
+        while name_id >= 0:
+            key = self._keys[name_id]
+            grams = self._grams[key]
+            overlap = len(query_grams & grams)
+            similarity = overlap / len(query_grams)
+            jaccard = overlap / (len(query_grams) + len(grams) - overlap)
+            scored.append((similarity, jaccard, key))
+            name_id = bits.find("1", name_id + 1)
+        scored.sort(key=lambda item: (-item[0], -item[1], item[2]))
+
+        results = []
+        for similarity, jaccard, key in scored:
+            for (field, value), count in sorted(self._variants[key].items(), key=lambda item: -item[1]):
+                if field in fields:
+                    results.append({"name": value, "field": field, "similarity": round(similarity, 4)})
+                    if limit is not None and len(results) >= limit:
+                        return results
+        return results
@@ -0,0 +1,295 @@
+"""
+NerdBible Semantic Index
+
+Offline semantic retrieval over bible entries and parables, with no network
+calls. Each verse is embedded as a hashed bag of stemmed words: every word
+adds its sublinear term frequency to a few signed buckets of a fixed-width
+float32 vector (a sparse random projection), and rows are L2-normalized.
+Query words are weighted by inverse document frequency, so a verse scores
+roughly the IDF-weighted cosine of the two texts. Verse rows never depend on
+corpus statistics, so new entries are appended without re-embedding the
+rest, and the matrix is persisted to an .npz file whose rows are matched
+back to verses by a content fingerprint.
+"""
+
+import os
+import math
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from nerdbible.search_index import tokenize
+
+# Width of the hashed embedding; must be a power of two no larger than 2**15
+SEMANTIC_DIMENSIONS = 512
+
+# Signed buckets each word is hashed into
+BUCKETS_PER_WORD = 4
+
+# Verse fields that are embedded (title and book only exist on parables)
+SEMANTIC_FIELDS = ("theme", "quote", "source", "character", "title", "book")
+
+# Cosine similarity below which a verse is treated as unrelated (hash collisions score up to ~0.08)
+MIN_SCORE = 0.08
+
+# Queries scored against the matrix per matrix product
+QUERY_BATCH = 256
+
+# Verses embedded per bincount when building the matrix
+EMBED_BATCH = 4096
+
+# Unsaved rows before the matrix is written back to disk (or a quarter of the rows, if more)
+SAVE_MIN_ROWS = 256
+
+STOPWORDS = frozenset("""
+    a about all am an and any are as at be but by can do does for from had has
+    have he her him his how i if in into is it its me my no not of on or our
+    say says she so than that the their them then there they this to up us was
+    we were what when which who why will with you your
+""".split())
+
+SUFFIXES = ("ing", "ed", "es", "ly", "s")
+
+@lru_cache(maxsize=65536)
+def stem(word):
+    """Strip a common English suffix so "grieving" and "grieves" meet "griev"."""
+    for suffix in SUFFIXES:
+        if len(word) - len(suffix) >= 4 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+def semantic_terms(text):
+    """Stemmed words of a text, without stopwords."""
+    return [stem(word) for word in tokenize(text) if word not in STOPWORDS]
+
+def verse_text(item):
+    """The text of a bible entry or parable that gets embedded."""
+    return "\n".join(str(item.get(field) or "") for field in SEMANTIC_FIELDS)
+
+def fingerprint(text):
+    """64-bit content hash used to match persisted rows to verses."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+class SemanticIndex:
+    """
+    Hashed-embedding matrix over bible entries and parables.
+
+    Follows the derived-index protocol used by the stores: built from the
+    entries (and parables), then updated with add() and update(). Rows are
+    keyed ("entry" | "parable", id). When a path is given, rows persisted
+    there are reused for verses whose text has not changed.
+    """
+
+    def __init__(self, entries=(), parables=(), path=None, dimensions=SEMANTIC_DIMENSIONS):
+        self.path = Path(path) if path else None
+        self.dimensions = dimensions
+        self.unsaved = 0
+        self._vectors = np.zeros((64, dimensions), dtype=np.float32)
+        self._fingerprints = np.zeros(64, dtype=np.uint64)
+        self._parable_rows = np.zeros(64, dtype=bool)
+        self._keys = []
+        self._rows = {}
+        self._df = {}
+        self._vocabulary = {}
+        self._term_buckets = np.zeros((64, BUCKETS_PER_WORD), dtype=np.intp)
+        self._term_signs = np.zeros((64, BUCKETS_PER_WORD), dtype=np.float64)
+        self._pending = []
+        self._persisted = self._load() if self.path else {}
+        for entry in entries:
+            self._set(("entry", entry.get("id")), entry)
+        for parable in parables:
+            self._set(("parable", parable.get("id")), parable)
+        self._flush()
+        self._persisted = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _load(self):
+        """Read persisted rows as {key: (fingerprint, vector)}."""
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if data["vectors"].shape[1:] != (self.dimensions,):
+                    return {}
+                return {
+                    tuple(key.split(":", 1)): (int(fp), vector)
+                    for key, fp, vector in zip(data["keys"].tolist(), data["fingerprints"], data["vectors"])
+                }
+        except FileNotFoundError:
+            return {}
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Ignoring unreadable NerdBible semantic index: {e}")
+            return {}
+
+    def save(self):
+        """Write the matrix to self.path atomically."""
+        count = len(self._keys)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    keys=np.array([f"{kind}:{key}" for kind, key in self._keys], dtype=str),
+                    fingerprints=self._fingerprints[:count],
+                    vectors=self._vectors[:count]
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self.unsaved = 0
+            return True
+        except Exception as e:
+            print(f"Error saving NerdBible semantic index: {e}")
+            return False
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def save_if_stale(self):
+        """Save once enough rows were embedded since the last save."""
+        if self.path and self.unsaved >= max(SAVE_MIN_ROWS, len(self._keys) // 4):
+            return self.save()
+        return False
+
+    def add(self, entry):
+        """Embed one bible entry."""
+        self._set(("entry", entry.get("id")), entry)
+        self._flush()
+
+    def update(self, old_entry, entry):
+        """Re-embed an entry whose fields changed from old_entry."""
+        key = ("entry", entry.get("id"))
+        if key in self._rows:
+            self._count_terms(semantic_terms(verse_text(old_entry)), -1)
+        self._set(key, entry, replace=True)
+        self._flush()
+
+    def _count_terms(self, terms, delta):
+        for term in set(terms):
+            count = self._df.get(term, 0) + delta
+            if count > 0:
+                self._df[term] = count
+            else:
+                self._df.pop(term, None)
+
+    def _set(self, key, item, replace=False):
+        """Point a row at an item, reusing its persisted vector or queueing it for embedding."""
+        row = self._rows.get(key)
+        if row is not None and not replace:
+            return
+        text = verse_text(item)
+        terms = semantic_terms(text)
+        self._count_terms(terms, 1)
+        fp = fingerprint(text)
+        if row is None:
+            row = self._append_row(key)
+        persisted = self._persisted.get(key)
+        if persisted is not None and persisted[0] == fp:
+            self._vectors[row] = persisted[1]
+        else:
+            self._pending.append((row, terms))
+        self._fingerprints[row] = fp
+        self._parable_rows[row] = key[0] == "parable"
+
+    def _flush(self):
+        """Embed queued rows, EMBED_BATCH at a time."""
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), EMBED_BATCH):
+            batch = pending[start:start + EMBED_BATCH]
+            rows = [row for row, terms in batch]
+            self._vectors[rows] = self._embed_many([terms for row, terms in batch])
+            self.unsaved += len(batch)
+
+    def _append_row(self, key):
+        row = len(self._keys)
+        if row == len(self._vectors):
+            capacity = row * 2
+            self._vectors = np.resize(self._vectors, (capacity, self.dimensions))
+            self._fingerprints = np.resize(self._fingerprints, capacity)
+            self._parable_rows = np.resize(self._parable_rows, capacity)
+        self._keys.append(key)
+        self._rows[key] = row
+        return row
+
+    def _term_id(self, term):
+        """Row of a term in the bucket tables, hashing it on first use."""
+        term_id = self._vocabulary.get(term)
+        if term_id is None:
+            term_id = self._vocabulary[term] = len(self._vocabulary)
+            if term_id == len(self._term_buckets):
+                self._term_buckets = np.resize(self._term_buckets, (term_id * 2, BUCKETS_PER_WORD))
+                self._term_signs = np.resize(self._term_signs, (term_id * 2, BUCKETS_PER_WORD))
+            digest = hashlib.blake2b(term.encode("utf-8"), digest_size=2 * BUCKETS_PER_WORD).digest()
+            values = np.frombuffer(digest, dtype="<u2")
+            self._term_buckets[term_id] = values & (self.dimensions - 1)
+            self._term_signs[term_id] = np.where(values & 0x8000, -1.0, 1.0)
+        return term_id
+
+    def _embed_many(self, term_lists, weights=None):
+        """
+        L2-normalized hashed embeddings of bags of terms, one row per bag.
+
+        Each term adds (1 + log tf) * weights(term) to its signed buckets;
+        terms weighted 0 are skipped. All rows are summed in one bincount.
+        """
+        rows, term_ids, term_weights = [], [], []
+        for row, terms in enumerate(term_lists):
+            counts = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, count in counts.items():
+                weight = 1.0 + math.log(count)
+                if weights is not None:
+                    weight *= weights(term)
+                if weight:
+                    rows.append(row)
+                    term_ids.append(self._term_id(term))
+                    term_weights.append(weight)
+
+        term_ids = np.array(term_ids, dtype=np.intp)
+        positions = np.array(rows, dtype=np.intp)[:, None] * self.dimensions + self._term_buckets[term_ids]
+        values = self._term_signs[term_ids] * np.array(term_weights)[:, None]
+        vectors = np.bincount(
+            positions.ravel(), values.ravel(), minlength=len(term_lists) * self.dimensions
+        ).reshape(len(term_lists), self.dimensions)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32)
+
+    def _idf(self, term):
+        """Query term weight; words no verse uses can only add hash noise, so they weigh 0."""
+        df = self._df.get(term, 0)
+        return math.log((len(self._keys) + 1) / (df + 1)) + 1.0 if df else 0.0
+
+    def search_many(self, queries, k=5, include_parables=True, min_score=MIN_SCORE):
+        """
+        Return the top k ((kind, id), score) pairs for each query, best first.
+
+        Queries are embedded into one matrix and scored against the verses in
+        batches of QUERY_BATCH with a single matrix product each. Verses
+        scoring below min_score are left out.
+        """
+        count = len(self._keys)
+        if not count or k <= 0:
+            return [[] for _ in queries]
+        vectors = self._vectors[:count]
+        excluded = None if include_parables else self._parable_rows[:count]
+        k = min(k, count)
+
+        results = []
+        for start in range(0, len(queries), QUERY_BATCH):
+            batch = self._embed_many([semantic_terms(query) for query in queries[start:start + QUERY_BATCH]], self._idf)
+            scores = batch @ vectors.T
+            if excluded is not None:
+                scores[:, excluded] = -np.inf
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            for row_scores, candidates in zip(scores, top):
+                ordered = candidates[np.argsort(-row_scores[candidates], kind="stable")]
+                results.append([
+                    (self._keys[i], float(row_scores[i]))
+                    for i in ordered
+                    if row_scores[i] >= min_score
+                ])
+        return results
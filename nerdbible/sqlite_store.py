@@ -0,0 +1,518 @@
+"""
+NerdBible SQLite Store
+
+SQLite storage backend for the NerdBible. Entries live in an indexed table
+with an FTS5 index over quote, theme, source and character, so the archive
+can grow well past what a single JSON file handles. The store exposes the
+same methods as BibleStore, so the module-level functions in bible_core work
+unchanged once it is selected:
+
+    NERDBIBLE_BACKEND=sqlite NERDBIBLE_DB_PATH=data/nerdbible/nerdbible.db
+
+Use migrate_json_to_sqlite() (or `python main.py migrate-bible`) to import
+nerd_bible_core.json and parables_index.json.
+"""
+
+import json
+import random
+import sqlite3
+import threading
+from pathlib import Path
+
+from nerdbible import bible_core
+from nerdbible.bible_core import (
+    DATA_DIR,
+    DEFAULT_SCRIPTURE_CORE,
+    format_entry_id,
+    journal_path,
+    replay_journal,
+    _entry_number,
+    _new_entry,
+)
+from nerdbible.search_index import CLAUSE_PATTERN, FUZZY_FIELDS, TrigramIndex, tokenize, _haystack
+from nerdbible.lookup_index import lookup_key
+from nerdbible.sampling import VerseSampler
+
+# Default database location
+NERDBIBLE_DB_PATH = DATA_DIR / "nerdbible.db"
+
+# Columns stored for every entry; anything else goes into the `extra` JSON
+ENTRY_COLUMNS = ("id", "theme", "quote", "source", "character", "tier", "created_at", "updated_at")
+PARABLE_COLUMNS = ("id", "title", "character", "theme", "source", "book", "emotional_weight", "quote", "type", "tier")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    theme TEXT,
+    quote TEXT,
+    source TEXT,
+    character TEXT,
+    tier TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    extra TEXT,
+    theme_key TEXT,
+    character_key TEXT,
+    tier_key TEXT,
+    haystack TEXT,
+    source_key TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_theme_key ON entries(theme_key);
+CREATE INDEX IF NOT EXISTS entries_character_key ON entries(character_key);
+CREATE INDEX IF NOT EXISTS entries_tier_key ON entries(tier_key);
+CREATE INDEX IF NOT EXISTS entries_created_at ON entries(created_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    theme, quote, source, character,
+    content='entries', content_rowid='seq',
+    tokenize="unicode61 remove_diacritics 0 tokenchars '_'"
+);
+CREATE TRIGGER IF NOT EXISTS entries_fts_insert AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, theme, quote, source, character)
+    VALUES (new.seq, new.theme, new.quote, new.source, new.character);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_fts_delete AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, theme, quote, source, character)
+    VALUES ('delete', old.seq, old.theme, old.quote, old.source, old.character);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_fts_update AFTER UPDATE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, theme, quote, source, character)
+    VALUES ('delete', old.seq, old.theme, old.quote, old.source, old.character);
+    INSERT INTO entries_fts(rowid, theme, quote, source, character)
+    VALUES (new.seq, new.theme, new.quote, new.source, new.character);
+END;
+
+CREATE TABLE IF NOT EXISTS parables (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    character TEXT,
+    theme TEXT,
+    source TEXT,
+    book TEXT,
+    emotional_weight INTEGER,
+    quote TEXT,
+    type TEXT,
+    tier TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS parables_character ON parables(character);
+CREATE INDEX IF NOT EXISTS parables_tier ON parables(tier);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def _entry_row(entry):
+    """Column values for an entry dict, in the order of the INSERT below."""
+    extra = {key: value for key, value in entry.items() if key not in ENTRY_COLUMNS}
+    return (
+        entry.get("id"),
+        entry.get("theme"),
+        entry.get("quote"),
+        entry.get("source"),
+        entry.get("character"),
+        entry.get("tier"),
+        entry.get("created_at"),
+        entry.get("updated_at"),
+        json.dumps(extra) if extra else None,
+        lookup_key(entry.get("theme")),
+        lookup_key(entry.get("character")),
+        lookup_key(entry.get("tier")),
+        _haystack(entry),
+        lookup_key(entry.get("source")),
+    )
+
+INSERT_ENTRY = (
+    "INSERT INTO entries (id, theme, quote, source, character, tier, created_at, updated_at, "
+    "extra, theme_key, character_key, tier_key, haystack, source_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+UPDATE_ENTRY = (
+    "UPDATE entries SET id = ?, theme = ?, quote = ?, source = ?, character = ?, tier = ?, created_at = ?, "
+    "updated_at = ?, extra = ?, theme_key = ?, character_key = ?, tier_key = ?, haystack = ?, source_key = ? "
+    "WHERE id = ?"
+)
+SELECT_ENTRY = "SELECT " + ", ".join(f"entries.{column}" for column in ENTRY_COLUMNS + ("extra",)) + " FROM entries"
+
+def _row_entry(row):
+    """Rebuild an entry dict from a SELECT_ENTRY row."""
+    entry = dict(zip(ENTRY_COLUMNS, row))
+    if entry["updated_at"] is None:
+        del entry["updated_at"]
+    if row[-1]:
+        entry.update(json.loads(row[-1]))
+    return entry
+
+def _fts_query(query):
+    """
+    Translate a search_bible(ranked=True) query into FTS5 syntax.
+
+    Tokens are always quoted so user input can never be read as FTS5
+    operators.
+    """
+    clauses = []
+    for phrase, word in CLAUSE_PATTERN.findall(query):
+        tokens = tokenize(phrase or word)
+        if not tokens:
+            continue
+        quoted = " ".join(f'"{token}"' for token in tokens)
+        if not phrase and word.endswith("*") and len(tokens) == 1:
+            clauses.append(f"{quoted}*")
+        elif len(tokens) > 1:
+            clauses.append(f'"{" ".join(tokens)}"')
+        else:
+            clauses.append(quoted)
+    return " AND ".join(clauses)
+
+class SqliteBibleStore:
+    """
+    NerdBible store backed by SQLite.
+
+    Each thread gets its own connection. The database runs in WAL mode so
+    readers never block the writer, and IDs are allocated inside an
+    IMMEDIATE transaction from a counter in the meta table, which keeps them
+    collision-free across processes.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path or NERDBIBLE_DB_PATH)
+        self._local = threading.local()
+        self._derived_lock = threading.Lock()
+        self._derived = {}
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            self._upgrade_schema(conn)
+
+    def _upgrade_schema(self, conn):
+        """Add columns introduced after a database was first created."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+        if "source_key" not in columns:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("ALTER TABLE entries ADD COLUMN source_key TEXT")
+            rows = conn.execute("SELECT seq, source FROM entries").fetchall()
+            conn.executemany(
+                "UPDATE entries SET source_key = ? WHERE seq = ?",
+                [(lookup_key(source), seq) for seq, source in rows]
+            )
+            conn.execute("COMMIT")
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_source_key ON entries(source_key)")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return _Transaction(conn)
+
+    def _query(self, sql, params=()):
+        with self._connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def _meta(self, conn, key, default=None):
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, conn, key, value):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def _bump_rewrite_version(self, conn):
+        """Mark in-memory derived indexes stale after rows were changed rather than appended."""
+        self._set_meta(conn, "rewrite_version", self._meta(conn, "rewrite_version", 0) + 1)
+
+    def bible(self):
+        """Return the whole bible in the JSON file's shape."""
+        with self._connection() as conn:
+            return {
+                "scripture_core": self._meta(conn, "scripture_core", DEFAULT_SCRIPTURE_CORE),
+                "entries": [_row_entry(row) for row in conn.execute(f"{SELECT_ENTRY} ORDER BY seq")],
+                "id_counter": self._meta(conn, "id_counter", 0)
+            }
+
+    def entries(self):
+        """Return every entry in archive order."""
+        return [_row_entry(row) for row in self._query(f"{SELECT_ENTRY} ORDER BY seq")]
+
+    def count(self):
+        """Number of entries in the archive."""
+        return self._query("SELECT COUNT(*) FROM entries")[0][0]
+
+    def get(self, entry_id):
+        """Return the entry with this ID, or None."""
+        rows = self._query(f"{SELECT_ENTRY} WHERE id = ?", (entry_id,))
+        return _row_entry(rows[0]) if rows else None
+
+    def query(self, limit=None, **filters):
+        """Return entries whose fields equal the filters (case-insensitive), in archive order."""
+        where = " AND ".join(f"{field}_key = ?" for field in filters)
+        params = [lookup_key(value) for value in filters.values()]
+        sql = f"{SELECT_ENTRY} WHERE {where} ORDER BY seq" if where else f"{SELECT_ENTRY} ORDER BY seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [_row_entry(row) for row in self._query(sql, params)]
+
+    def search(self, query, limit=None, ranked=False):
+        """Substring or FTS5/BM25-ranked search, with the same semantics as BibleStore.search()."""
+        if ranked:
+            match = _fts_query(query)
+            if not match:
+                return []
+            sql = (
+                f"{SELECT_ENTRY} JOIN entries_fts ON entries_fts.rowid = entries.seq "
+                "WHERE entries_fts MATCH ? ORDER BY bm25(entries_fts), seq"
+            )
+            params = [match]
+        else:
+            needle = query.lower()
+            if "\0" in needle:
+                return []
+            sql = f"{SELECT_ENTRY} WHERE instr(haystack, ?) > 0 ORDER BY seq"
+            params = [needle]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [_row_entry(row) for row in self._query(sql, params)]
+
+    def _derived_index(self, name, factory):
+        """
+        Return an in-memory index over (id, theme, quote, source, character, tier) stubs.
+
+        The index is caught up with the database on every call: new rows
+        are added incrementally by sequence number, while updates, saves and
+        parable imports bump rewrite_version, which forces a rebuild.
+        """
+        with self._derived_lock:
+            with self._connection() as conn:
+                version = self._meta(conn, "rewrite_version", 0)
+                cached = self._derived.get(name)
+                if cached is None or cached[0] != version:
+                    cached = self._derived[name] = [version, 0, factory()]
+                rows = conn.execute(
+                    "SELECT seq, id, theme, quote, source, character, tier FROM entries WHERE seq > ? ORDER BY seq",
+                    (cached[1],)
+                ).fetchall()
+            index = cached[2]
+            for seq, entry_id, theme, quote, source, character, tier in rows:
+                index.add({
+                    "id": entry_id, "theme": theme, "quote": quote,
+                    "source": source, "character": character, "tier": tier
+                })
+                cached[1] = seq
+            return index
+
+    def _verse_sampler(self, include_parables):
+        parables = self.parables() if include_parables else ()
+        return self._derived_index(f"verses:{include_parables}", lambda: VerseSampler((), parables))
+
+    def trigram_index(self):
+        """Return the trigram index over character, theme and source names."""
+        return self._derived_index("trigrams", TrigramIndex)
+
+    def fuzzy_search(self, query, fields=FUZZY_FIELDS, limit=10, min_similarity=0.5):
+        """Names close to a possibly misspelled query, from the trigram index."""
+        index = self.trigram_index()
+        with self._derived_lock:
+            return index.search(query, fields, limit, min_similarity)
+
+    def semantic_index(self):
+        """Return the hashed-embedding index over entries and parables, persisted beside the database."""
+        from nerdbible.semantic_index import SemanticIndex
+
+        parables = self.parables()
+        path = self.db_path.with_name(self.db_path.stem + ".semantic.npz")
+        return self._derived_index("semantic", lambda: SemanticIndex((), parables, path))
+
+    def semantic_search(self, queries, limit=5, include_parables=True):
+        """Return the verses most similar to each query, best first."""
+        index = self.semantic_index()
+        with self._derived_lock:
+            results = index.search_many(queries, limit, include_parables)
+        parables = {parable.get("id"): parable for parable in self.parables()}
+        return [
+            [self.get(key) if kind == "entry" else parables.get(key) for (kind, key), score in hits]
+            for hits in results
+        ]
+
+    def sample_verses(self, k=1, include_parables=True, rng=random):
+        """Draw k distinct verses weighted by tier (and parables by emotional_weight)."""
+        sampler = self._verse_sampler(include_parables)
+        verses = []
+        for kind, key in sampler.sample_keys(k, rng):
+            if kind == "entry":
+                verses.append(self.get(key))
+            else:
+                verses.append(sampler.sampler.get((kind, key)))
+        return verses
+
+    def page(self, cursor, page_size):
+        """
+        Return (entries, next_cursor) for up to page_size entries after cursor.
+
+        The cursor is the last row sequence number returned, so it stays
+        stable while entries are added, updated or saved.
+        """
+        rows = self._query(
+            f"SELECT entries.seq, {SELECT_ENTRY[len('SELECT '):]} WHERE seq > ? ORDER BY seq LIMIT ?",
+            (cursor or 0, page_size)
+        )
+        if not rows:
+            return [], cursor or 0
+        return [_row_entry(row[1:]) for row in rows], rows[-1][0]
+
+    def metadata(self):
+        """Return the bible's top-level fields other than the entries."""
+        with self._connection() as conn:
+            return {
+                "scripture_core": self._meta(conn, "scripture_core", DEFAULT_SCRIPTURE_CORE),
+                "id_counter": self._meta(conn, "id_counter", 0)
+            }
+
+    def create_entries(self, items, created_at):
+        """Allocate IDs and insert new entries in one transaction."""
+        items = list(items)
+        if not items:
+            return []
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            first_number = self._meta(conn, "id_counter", 0) + 1
+            entries = [
+                _new_entry(
+                    format_entry_id(first_number + offset),
+                    item["theme"],
+                    item["quote"],
+                    item["source"],
+                    item["character"],
+                    item.get("tier", "Trial Ruling"),
+                    created_at
+                )
+                for offset, item in enumerate(items)
+            ]
+            conn.executemany(INSERT_ENTRY, [_entry_row(entry) for entry in entries])
+            self._set_meta(conn, "id_counter", first_number + len(entries) - 1)
+        return entries
+
+    def update_entry(self, entry_id, changes):
+        """Apply field changes to an existing entry and return it."""
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(f"{SELECT_ENTRY} WHERE id = ?", (entry_id,)).fetchone()
+            if row is None:
+                return None
+            entry = _row_entry(row)
+            entry.update(changes)
+            conn.execute(UPDATE_ENTRY, _entry_row(entry) + (entry_id,))
+            self._bump_rewrite_version(conn)
+        return entry
+
+    def save(self, bible_data):
+        """
+        Replace every entry with the contents of bible_data.
+
+        Entries that are already stored are updated in place and keep their
+        sequence number, so page cursors handed out earlier stay valid; new
+        entries are appended and missing ones deleted.
+        """
+        entries = bible_data.get("entries", [])
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            id_counter = max(
+                [self._meta(conn, "id_counter", 0), bible_data.get("id_counter", 0)]
+                + [_entry_number(entry.get("id")) for entry in entries]
+            )
+            stored = {row[0] for row in conn.execute("SELECT id FROM entries")}
+            kept = {entry.get("id") for entry in entries}
+            conn.executemany("DELETE FROM entries WHERE id = ?", [(entry_id,) for entry_id in stored - kept])
+            conn.executemany(UPDATE_ENTRY, [_entry_row(entry) + (entry["id"],) for entry in entries if entry.get("id") in stored])
+            conn.executemany(INSERT_ENTRY, [_entry_row(entry) for entry in entries if entry.get("id") not in stored])
+            self._set_meta(conn, "scripture_core", bible_data.get("scripture_core", DEFAULT_SCRIPTURE_CORE))
+            self._set_meta(conn, "id_counter", id_counter)
+            self._bump_rewrite_version(conn)
+        return True
+
+    def save_parables(self, parables):
+        """Replace the parables table."""
+        rows = []
+        for parable in parables:
+            extra = {key: value for key, value in parable.items() if key not in PARABLE_COLUMNS}
+            rows.append(tuple(parable.get(column) for column in PARABLE_COLUMNS) + (json.dumps(extra) if extra else None,))
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM parables")
+            conn.executemany(f"INSERT INTO parables VALUES ({', '.join('?' * (len(PARABLE_COLUMNS) + 1))})", rows)
+            self._bump_rewrite_version(conn)
+
+    def parables(self):
+        """Return every imported parable."""
+        parables = []
+        for row in self._query(f"SELECT {', '.join(PARABLE_COLUMNS)}, extra FROM parables ORDER BY id"):
+            parable = dict(zip(PARABLE_COLUMNS, row))
+            if row[-1]:
+                parable.update(json.loads(row[-1]))
+            parables.append(parable)
+        return parables
+
+    def compact(self):
+        """Merge FTS5 segments, refresh query-planner statistics and persist the semantic index."""
+        with self._connection() as conn:
+            conn.execute("INSERT INTO entries_fts(entries_fts) VALUES ('optimize')")
+            conn.execute("PRAGMA optimize")
+        with self._derived_lock:
+            cached = self._derived.get("semantic")
+            if cached is not None and cached[2].unsaved:
+                cached[2].save()
+        return True
+
+    def journal_records(self):
+        """SQLite has no separate journal to fold in."""
+        return 0
+
+    def invalidate(self):
+        """Nothing is cached outside SQLite itself."""
+
+class _Transaction:
+    """
+    Context manager around an autocommit connection.
+
+    Statements run in autocommit mode unless the block opens a transaction
+    with BEGIN, in which case it is committed on success and rolled back on
+    error.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.conn.in_transaction:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+def migrate_json_to_sqlite(db_path=None, bible_path=None, parables_path="parables_index.json"):
+    """
+    Import the JSON NerdBible (core file plus journal) and the parables index into SQLite.
+
+    Existing entries and parables in the database are replaced. Returns
+    (entry_count, parable_count).
+    """
+    bible_path = Path(bible_path or bible_core.NERDBIBLE_CORE_PATH)
+    with open(bible_path, "r") as f:
+        bible = json.load(f)
+    replay_journal(bible, journal_path(bible_path))
+
+    store = SqliteBibleStore(db_path)
+    store.save(bible)
+
+    parables = []
+    if parables_path and Path(parables_path).exists():
+        with open(parables_path, "r") as f:
+            parables = json.load(f).get("parables", [])
+        store.save_parables(parables)
+
+    return len(bible.get("entries", [])), len(parables)
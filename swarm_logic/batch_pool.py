@@ -0,0 +1,58 @@
+"""
+Batch Pool
+
+Chunked, bounded fan-out of bulk work (persona spawning, trial forging)
+across a process pool. Items are consumed lazily and at most two chunks per
+worker are in flight, so a generator of millions of seeds or specs runs in
+constant memory; results come back in input order or as chunks finish.
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# Items handed to a worker at a time
+BATCH_CHUNK_SIZE = 256
+
+def chunked(items, size):
+    """Yield lists of up to size items from any iterable."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def map_chunks(func, items, workers=None, ordered=True, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Yield every result of func(chunk), a picklable function from a list of items to a list of results.
+
+    With workers > 1 the chunks run in a process pool; otherwise in this
+    process. ordered=False yields each chunk's results as soon as it
+    finishes instead of in input order.
+    """
+    chunks = chunked(items, chunk_size)
+    if not workers or workers <= 1:
+        for chunk in chunks:
+            yield from func(chunk)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        in_flight = deque()
+        limit = workers * 2
+        while True:
+            for chunk in chunks:
+                in_flight.append(pool.submit(func, chunk))
+                if len(in_flight) >= limit:
+                    break
+            if not in_flight:
+                return
+            if ordered:
+                finished = [in_flight.popleft()]
+            else:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                finished = [future for future in in_flight if future in done]
+                in_flight = deque(future for future in in_flight if future not in done)
+            for future in finished:
+                yield from future.result()
@@ -0,0 +1,224 @@
+"""
+Provider Stats Module
+
+Rolling latency, error-rate and in-flight counts per model string (e.g.
+"openrouter:deepseek-coder"), and the choice between the acceptable models
+for a profile by expected latency. Stats are kept per model rather than per
+provider, so a slow image or video generation on HuggingFace never counts
+against a HuggingFace chat model it is compared with.
+
+A model's expected latency is its rolling mean latency scaled by the calls
+already in flight to it, plus a penalty for recent failures that fades
+with the error rate and with time since the last failure. Models with no
+samples yet are assumed to answer in DEFAULT_LATENCY so they get tried.
+
+Calls the backend makes itself (the HuggingFace voice and media calls)
+are wrapped in track(); calls the frontend makes with a routed model are
+reported back through the chat server's report_model_call command.
+
+The clock is injectable, and SimulatedProviders drives the stats with
+made-up latencies and failures, so routing can be exercised offline.
+"""
+
+import time
+import random
+import threading
+from contextlib import contextmanager
+
+# Weight of the newest sample in the rolling latency and error rate
+LATENCY_ALPHA = 0.2
+ERROR_ALPHA = 0.2
+
+# Seconds of expected latency added at a 100% error rate
+FAILURE_PENALTY = 5.0
+
+# Seconds for the failure penalty to halve once a model stops failing
+FAILURE_HALF_LIFE = 60.0
+
+# Models above this error rate are skipped while another candidate is below it
+MAX_ERROR_RATE = 0.5
+
+# Assumed latency, in seconds, of a model with no samples
+DEFAULT_LATENCY = 1.0
+
+def model_target(model):
+    """The provider a model string routes to, e.g. "openrouter" for "openrouter:deepseek-coder"."""
+    return model.split(":", 1)[0]
+
+class TargetStats:
+    """Rolling counters for one model."""
+
+    __slots__ = ("latency", "error_rate", "in_flight", "calls", "failures", "last_failure")
+
+    def __init__(self):
+        self.latency = None
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.last_failure = None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+# Read in place of the stats of a model with no samples; never written to
+NO_SAMPLES = TargetStats()
+
+class ProviderStats:
+    """
+    Thread-safe rolling stats for every model.
+
+    Wrap provider calls in track(model), or report them with begin() and
+    finish() (or record() for calls timed elsewhere).
+    """
+
+    def __init__(
+        self,
+        clock=time.monotonic,
+        failure_penalty=FAILURE_PENALTY,
+        failure_half_life=FAILURE_HALF_LIFE,
+        max_error_rate=MAX_ERROR_RATE,
+        default_latency=DEFAULT_LATENCY,
+    ):
+        self.clock = clock
+        self.failure_penalty = failure_penalty
+        self.failure_half_life = failure_half_life
+        self.max_error_rate = max_error_rate
+        self.default_latency = default_latency
+        self._targets = {}
+        self._lock = threading.Lock()
+
+    def _peek(self, model):
+        """A model's stats for reading, without creating an entry for it."""
+        return self._targets.get(model, NO_SAMPLES)
+
+    def _target(self, model):
+        stats = self._targets.get(model)
+        if stats is None:
+            stats = self._targets[model] = TargetStats()
+        return stats
+
+    def begin(self, model):
+        """Count a call to a model as in flight."""
+        with self._lock:
+            self._target(model).in_flight += 1
+
+    def finish(self, model, latency, ok=True):
+        """Settle an in-flight call and record its outcome."""
+        with self._lock:
+            stats = self._target(model)
+            stats.in_flight = max(0, stats.in_flight - 1)
+            self._record(stats, latency, ok)
+
+    def record(self, model, latency, ok=True):
+        """Record a call that was never counted as in flight."""
+        with self._lock:
+            self._record(self._target(model), latency, ok)
+
+    def _record(self, stats, latency, ok):
+        stats.calls += 1
+        if stats.latency is None:
+            stats.latency = latency
+        else:
+            stats.latency += LATENCY_ALPHA * (latency - stats.latency)
+        stats.error_rate += ERROR_ALPHA * ((0.0 if ok else 1.0) - stats.error_rate)
+        if not ok:
+            stats.failures += 1
+            stats.last_failure = self.clock()
+
+    @contextmanager
+    def track(self, model):
+        """Time a provider call; an exception counts as a failure and is re-raised."""
+        self.begin(model)
+        start = self.clock()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.finish(model, self.clock() - start, ok)
+
+    def snapshot(self):
+        """{model: counters} for every model seen so far."""
+        with self._lock:
+            return {target: stats.to_dict() for target, stats in self._targets.items()}
+
+    def _expected(self, stats, now):
+        latency = self.default_latency if stats.latency is None else stats.latency
+        expected = latency * (1 + stats.in_flight)
+        if stats.last_failure is not None:
+            fade = 0.5 ** ((now - stats.last_failure) / self.failure_half_life)
+            expected += self.failure_penalty * stats.error_rate * fade
+        return expected
+
+    def expected_latency(self, model):
+        """Seconds a new call to a model is expected to take, failure penalty included."""
+        with self._lock:
+            return self._expected(self._peek(model), self.clock())
+
+    def choose(self, candidates):
+        """
+        The candidate model with the lowest expected latency.
+
+        Candidates failing more than max_error_rate are only considered
+        when every candidate is; ties keep candidate order.
+        """
+        if len(candidates) == 1:
+            return candidates[0]
+        with self._lock:
+            now = self.clock()
+            scored = [(self._peek(model), model) for model in candidates]
+            healthy = [item for item in scored if item[0].error_rate <= self.max_error_rate] or scored
+            return min(healthy, key=lambda item: self._expected(item[0], now))[1]
+
+class SimulatedClock:
+    """A clock that only moves when told to, for offline runs."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+class SimulatedProviders:
+    """
+    Local stand-in for the model providers.
+
+    providers maps a provider (see model_target) to {"latency": seconds, "jitter": seconds,
+    "error_rate": 0..1}; call() draws a latency and outcome, advances a
+    SimulatedClock by the latency and records the call in the stats.
+    """
+
+    def __init__(self, stats, providers, seed=None):
+        self.stats = stats
+        self.providers = providers
+        self.rng = random.Random(seed)
+
+    def call(self, model):
+        """Simulate one call to a model. Returns (latency, ok)."""
+        profile = self.providers.get(model_target(model), {})
+        latency = max(0.0, profile.get("latency", DEFAULT_LATENCY) + self.rng.uniform(-1, 1) * profile.get("jitter", 0.0))
+        ok = self.rng.random() >= profile.get("error_rate", 0.0)
+        self.stats.begin(model)
+        if isinstance(self.stats.clock, SimulatedClock):
+            self.stats.clock.advance(latency)
+        self.stats.finish(model, latency, ok)
+        return latency, ok
+
+_stats = ProviderStats()
+_stats_lock = threading.Lock()
+
+def get_provider_stats():
+    """Return the process-wide provider stats."""
+    with _stats_lock:
+        return _stats
+
+def set_provider_stats(stats):
+    """Replace the process-wide provider stats (e.g. with a simulated clock in tests)."""
+    global _stats
+    with _stats_lock:
+        _stats = stats
+    return stats
@@ -0,0 +1,254 @@
+"""
+Swarm Warm Pool
+
+Builds the personas of the standing swarm (the agents in swarm_registry.json
+and the witnesses in witness_registry.json) and the witnesses' echo
+agents ahead of time, models already routed, so the first chat turn of a
+trial does not wait on them. Each agent has a small queue of ready
+instances; checking one out hands it over immediately and queues a
+background rebuild, since every instance carries its own session_id.
+
+warm() fills the pool at server start; start(interval) also tops it up on
+a schedule, picking up agents added to either registry since. Instances are
+restamped (session_id, generated_at) when they are handed out, so a
+prebuilt agent reads as spawned at checkout.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from canon_index.canon_index import get_canon_index, lookup_key
+from canon_index.graph import ingest
+from krakoa_engine.generate_krakoa_persona import build_krakoa_persona, create_session_id
+from swarm_temp_cache.construct_echo_agent import construct_echo_agent
+from swarm_temp_cache.echo_cache import get_echo_cache
+
+# Ready instances kept per pooled agent
+WARM_POOL_DEPTH = 1
+
+# Background threads building pooled agents
+WARM_POOL_WORKERS = 2
+
+def agent_seed(agent):
+    """Persona seed for a swarm_registry.json agent."""
+    personality = agent.get("personality") or ""
+    return {
+        "name": agent.get("name", agent.get("id")),
+        "alias": agent.get("role", "Undefined Role"),
+        "role": agent.get("role", ""),
+        "traits": [trait.strip() for trait in personality.split(",") if trait.strip()],
+        "purpose": agent.get("specialty", "To interpret and preserve mythos integrity."),
+        "spawned_from": "Swarm Registry",
+    }
+
+def witness_echo_seed(witness):
+    """Echo agent seed for a witness_registry.json witness."""
+    return {
+        "name": witness.get("designation", "Echo Construct"),
+        "inspired_by": witness.get("spawned_from", "Legacy Performance"),
+        "archetype": witness.get("alias", "Undefined Role"),
+        "traits": witness.get("core_traits", ["[Fragment Trait 1]", "[Trait 2]"]),
+        "use_case": "Trial witness",
+    }
+
+def restamp(instance):
+    """A copy of a prebuilt persona or echo with a fresh session_id and generated_at, keys in place."""
+    return dict(instance, session_id=create_session_id(), generated_at=datetime.utcnow().isoformat() + "Z")
+
+def swarm_specs():
+    """
+    {(kind, key): (names, build)} for every agent the pool keeps warm.
+
+    kind is "persona" or "echo"; names are the lookup keys an agent can be
+    checked out by (its id, name or designation).
+    """
+    canon = get_canon_index()
+    specs = {}
+    for agent in canon.records("agents"):
+        seed = agent_seed(agent)
+        names = {lookup_key(agent.get("id")), lookup_key(seed["name"])}
+        specs[("persona", agent.get("id") or seed["name"])] = (names, lambda seed=seed: build_krakoa_persona(seed))
+    for witness in canon.records("witnesses"):
+        designation = witness.get("designation")
+        if not designation:
+            continue
+        names = {lookup_key(designation)}
+        specs[("persona", designation)] = (names, lambda seed=witness: build_krakoa_persona(seed))
+        specs[("echo", designation)] = (names, lambda seed=witness_echo_seed(witness): construct_echo_agent(seed))
+    return specs
+
+class WarmPool:
+    """
+    Queues of prebuilt personas and echo agents, refilled in the background.
+
+    Counters: hits (served warm), misses (built on the request path) and
+    refills (built in the background). The pool can be stopped and started
+    again; background builds get a new executor after a stop.
+    """
+
+    def __init__(self, specs=swarm_specs, depth=WARM_POOL_DEPTH, workers=WARM_POOL_WORKERS):
+        self._specs_source = specs
+        self.depth = depth
+        self.workers = workers
+        self._specs = {}
+        self._names = {}
+        self._ready = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._executor = None
+        self._timer = None
+        self._stopped = threading.Event()
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+
+    def _load_specs(self):
+        specs = self._specs_source()
+        names = {}
+        for pool_key, (lookup_names, _) in specs.items():
+            for name in lookup_names:
+                names.setdefault((pool_key[0], name), pool_key)
+        with self._lock:
+            self._specs = specs
+            self._names = names
+            for pool_key in specs:
+                self._ready.setdefault(pool_key, deque())
+                self._pending.setdefault(pool_key, 0)
+
+    def _schedule(self, pool_key):
+        """Queue background builds until ready plus pending reaches depth. Call with the lock held."""
+        if self._stopped.is_set():
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="warm-pool")
+        while len(self._ready[pool_key]) + self._pending[pool_key] < self.depth:
+            self._pending[pool_key] += 1
+            self._executor.submit(self._refill, pool_key)
+
+    def _refill(self, pool_key):
+        spec = self._specs.get(pool_key)
+        try:
+            # An agent dropped from its registry since the build was queued is not rebuilt
+            instance = spec[1]() if spec is not None else None
+        except Exception as e:
+            print(f"Error warming {pool_key[0]} {pool_key[1]}: {e}")
+            instance = None
+        with self._lock:
+            self._pending[pool_key] -= 1
+            if instance is not None:
+                self._ready[pool_key].append(instance)
+                self.refills += 1
+            self._idle.notify_all()
+
+    def warm(self, wait=True):
+        """Fill every queue to depth, re-reading the registries first. Blocks until done unless wait=False."""
+        self._load_specs()
+        with self._lock:
+            for pool_key in self._specs:
+                self._schedule(pool_key)
+        if wait:
+            self.wait_idle()
+
+    def wait_idle(self, timeout=None):
+        """Block until no background builds are pending. Returns False on timeout."""
+        with self._lock:
+            return self._idle.wait_for(lambda: not any(self._pending.values()), timeout)
+
+    def resolve(self, kind, name):
+        """The pool key for an agent id, name or designation, or None."""
+        if not self._specs:
+            self._load_specs()
+        with self._lock:
+            return self._names.get((kind, lookup_key(name)))
+
+    def checkout(self, kind, name):
+        """
+        Take a ready instance of an agent, building one in place if none is ready.
+
+        A ready instance is restamped as of now. A background rebuild is
+        queued either way. Raises KeyError for a name that is not in either
+        registry.
+        """
+        pool_key = self.resolve(kind, name)
+        if pool_key is None:
+            raise KeyError(f"No pooled {kind} named {name!r}")
+        with self._lock:
+            ready = self._ready[pool_key]
+            instance = ready.popleft() if ready else None
+            if instance is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._schedule(pool_key)
+        if instance is None:
+            return self._specs[pool_key][1]()
+        return restamp(instance)
+
+    def checkout_persona(self, name):
+        """A ready persona for a registry agent or witness, linked into the canon graph."""
+        persona = self.checkout("persona", name)
+        ingest("persona", persona)
+        return persona
+
+    def checkout_echo(self, name):
+        """A ready echo agent for a witness, registered in the echo cache."""
+        return get_echo_cache().put(self.checkout("echo", name))
+
+    def start(self, interval=None):
+        """Warm the pool in the background; with interval, top it up again every interval seconds."""
+        self._stopped.clear()
+
+        def run():
+            if self._stopped.is_set():
+                return
+            self.warm(wait=False)
+            if interval:
+                self._timer = threading.Timer(interval, run)
+                self._timer.daemon = True
+                self._timer.start()
+
+        run()
+        return self
+
+    def stop(self):
+        """
+        Stop scheduled top-ups and background builds until the next start().
+
+        Ready instances are kept; checkouts past them are built in place.
+        """
+        self._stopped.set()
+        if self._timer is not None:
+            self._timer.cancel()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            # Cancelled builds never ran; the next warm() queues them again
+            for pool_key in self._pending:
+                self._pending[pool_key] = 0
+            self._idle.notify_all()
+
+    def stats(self):
+        """Counters and the number of ready instances: {"hits", "misses", "refills", "ready"}."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "refills": self.refills,
+                "ready": sum(len(ready) for ready in self._ready.values()),
+            }
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_warm_pool():
+    """Return the process-wide warm pool, created (cold) on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WarmPool()
+        return _pool
@@ -1,23 +1,363 @@
-
 # zord_model_router.py
+"""
+Zord Model Router
+
+Routes an agent profile to its model with a rule set instead of a
+hardcoded if/elif chain. Each rule names a model, a priority and the
+keywords (or regexes) that trigger it in the profile's tone, purpose,
+traits or role. Rules are compiled into one priority-ordered keyword set
+per field (a trie-shaped regex once a field has many keywords), so a
+profile is routed in a single pass over its fields, and the router reports
+which rule fired. Traits are matched as substrings of each trait, not by
+list membership, so "Chaos" in core_traits now triggers the chaos rule.
+
+Profiles are normalized once (casefolded, whitespace collapsed) and
+routes are memoized in an LRU keyed by a hash of the normalized fields, so
+re-routing a swarm of near-identical personas mostly hits the memo.
+match_zord_models() routes a whole batch, evaluating each distinct
+profile once.
+
+A rule may list "candidates", alternative models that serve it equally
+well; the router then picks the one with the lowest expected latency
+right now (see swarm_logic/provider_stats.py).
+
+Rules are read from zord_rules.json (or ZORD_RULES_PATH; .yaml/.yml needs
+PyYAML) and recompiled when that file changes. Without a rules file the
+built-in DEFAULT_ZORD_RULES apply, which reproduce the original chain.
+"""
+
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from nerdbible.file_stamp import file_stamp
+from swarm_logic.provider_stats import get_provider_stats
+
+# Rules file, relative to the working directory like the other canon files
+ZORD_RULES_PATH = Path(os.environ.get("ZORD_RULES_PATH", "zord_rules.json"))
+
+# Profile fields a rule can test
+PROFILE_FIELDS = ("tone", "purpose", "traits", "role")
+
+# Fields with more keywords than this are scanned with one trie regex
+# instead of a substring test per keyword
+SCAN_LIMIT = 32
+
+# Routed profiles remembered per rule engine, by routing_key
+ROUTE_CACHE_SIZE = 65536
+
+# The original keyword heuristics; higher priorities are checked first
+DEFAULT_ZORD_RULES = {
+    "default": {"name": "generalist", "model": "openrouter:gemini-pro-vision"},
+    "rules": [
+        {
+            "name": "heavy_resonance",
+            "model": "qwen:Qwen3-72B-Instruct",
+            "priority": 40,
+            "keywords": {"tone": ["trauma"], "purpose": ["sacrifice", "legacy"]},
+        },
+        {
+            "name": "responsive_quirky",
+            "model": "openrouter:deepseek-coder",
+            "priority": 30,
+            "keywords": {"tone": ["humor"], "traits": ["chaos"], "role": ["meta"]},
+        },
+        {
+            "name": "calm_rational",
+            "model": "openrouter:together-gemma-7b-it",
+            "priority": 20,
+            "keywords": {"purpose": ["justice"], "tone": ["order"], "role": ["narrator"]},
+        },
+        {
+            "name": "reflective_scalable",
+            "model": "huggingface:deepseek-v2",
+            "priority": 10,
+            "keywords": {"purpose": ["evolution"], "tone": ["introspection"]},
+        },
+    ],
+}
+
+def _normalize(text):
+    """Casefold and collapse whitespace, the only differences routing ignores."""
+    return " ".join(str(text).casefold().split())
+
+def profile_fields(agent_profile):
+    """
+    The normalized routable text of a profile, in PROFILE_FIELDS order.
+
+    Traits are joined one per line, so a keyword never spans two traits.
+    """
+    signature = agent_profile.get("emotional_signature") or {}
+    traits = agent_profile.get("core_traits") or []
+    if isinstance(traits, str):
+        traits = [traits]
+    return (
+        _normalize(signature.get("tone") or "") if isinstance(signature, dict) else "",
+        _normalize(agent_profile.get("purpose") or ""),
+        "\n".join(_normalize(trait) for trait in traits),
+        _normalize(agent_profile.get("role") or ""),
+    )
+
+def routing_key(fields):
+    """Hash of a profile's normalized routable fields, the key of the routing memo."""
+    return hashlib.blake2b("\x1f".join(fields).encode("utf-8"), digest_size=16).digest()
+
+def _trie_regex(words):
+    """A regex matching any of the words, with shared prefixes factored out so it scans like a trie."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return emit(trie)
+
+def _models(rule):
+    """{"model", "candidates"} for a rule: its preferred model first, then any alternatives."""
+    candidates = list(rule.get("candidates") or [])
+    model = rule.get("model") or candidates[0]
+    if model not in candidates:
+        candidates.insert(0, model)
+    return {"model": model, "candidates": tuple(candidates)}
+
+class ZordRuleEngine:
+    """
+    Compiled routing rules.
+
+    Rules are ranked by priority (ties keep file order). Each field's
+    keywords are merged into one casefolded keyword set. A small set is
+    tested in rank order and stops at the first hit, or as soon as no
+    remaining keyword can beat the best rule found so far; a large one is
+    compiled into a trie-shaped regex and the field is scanned once, where
+    a keyword found stands for the best-ranked rule among it and the
+    keywords it begins with, since those match at the same spot.
+    "patterns" are regexes, searched only while they could still win.
+    """
+
+    def __init__(self, config=DEFAULT_ZORD_RULES):
+        # Identifies the rule set, so results cached elsewhere can be keyed on it
+        canonical = json.dumps(config, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        self.version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+        default = config.get("default") or DEFAULT_ZORD_RULES["default"]
+        self.default = {"rule": default.get("name", "default"), "priority": None, **_models(default)}
+        indexed = list(enumerate(config.get("rules", [])))
+        indexed.sort(key=lambda item: (-item[1].get("priority", 0), item[0]))
+        self.rules = [
+            {"name": rule.get("name", f"rule_{i}"), "priority": rule.get("priority", 0), **_models(rule)}
+            for i, rule in indexed
+        ]
+
+        keywords = {field: {} for field in PROFILE_FIELDS}
+        patterns = {field: [] for field in PROFILE_FIELDS}
+        for rank, (_, rule) in enumerate(indexed):
+            for kind, terms_by_field in (("keywords", rule.get("keywords")), ("patterns", rule.get("patterns"))):
+                for field, terms in (terms_by_field or {}).items():
+                    if field not in keywords:
+                        raise ValueError(f"Unknown profile field in rule {self.rules[rank]['name']}: {field}")
+                    for term in [terms] if isinstance(terms, str) else terms:
+                        if kind == "keywords":
+                            keywords[field].setdefault(term.casefold(), (rank, term))
+                        else:
+                            patterns[field].append((rank, term, re.compile(term, re.IGNORECASE)))
+
+        self._keywords = []
+        for field, ranks in keywords.items():
+            column = PROFILE_FIELDS.index(field)
+            if not ranks:
+                continue
+            if len(ranks) <= SCAN_LIMIT:
+                # Few keywords: substring tests in rank order, stopping at the first hit
+                self._keywords.append((column, None, sorted((rank, word, term) for word, (rank, term) in ranks.items())))
+                continue
+            # A keyword match implies a match of every keyword that is a prefix of it
+            effective = {}
+            for word in ranks:
+                effective[word] = min(ranks[word[:i]] for i in range(1, len(word) + 1) if word[:i] in ranks)
+            first = "".join(sorted({re.escape(word[0]) for word in ranks}))
+            self._keywords.append((column, re.compile(f"(?=[{first}])(?=({_trie_regex(ranks)}))"), effective))
+        self._patterns = [(PROFILE_FIELDS.index(field), terms) for field, terms in patterns.items() if terms]
+
+        self._memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.rules)
+
+    def _evaluate(self, batch):
+        """
+        Best (rank, column, term) per normalized profile, or None.
+
+        Rules are applied across the whole batch one keyword set at a
+        time; a profile drops out of a set once nothing left in it can
+        beat the rule it already matched.
+        """
+        best = [None] * len(batch)
+        for column, pattern, keywords in self._keywords:
+            texts = [fields[column] for fields in batch]
+            if pattern is None:
+                open_rows = list(range(len(batch)))
+                for rank, word, term in keywords:
+                    still_open = []
+                    for i in open_rows:
+                        if best[i] is not None and rank >= best[i][0]:
+                            continue
+                        if word in texts[i]:
+                            best[i] = (rank, column, term)
+                        else:
+                            still_open.append(i)
+                    open_rows = still_open
+                    if not open_rows:
+                        break
+                continue
+            for i, text in enumerate(texts):
+                for found in pattern.findall(text):
+                    rank, term = keywords[found]
+                    if best[i] is None or rank < best[i][0]:
+                        best[i] = (rank, column, term)
+        for column, terms in self._patterns:
+            for rank, term, pattern in terms:
+                for i, fields in enumerate(batch):
+                    if (best[i] is None or rank < best[i][0]) and pattern.search(fields[column]):
+                        best[i] = (rank, column, term)
+        return best
+
+    def _result(self, best):
+        if best is None:
+            return dict(self.default, field=None, keyword=None)
+        rank, column, term = best
+        rule = self.rules[rank]
+        return {
+            "model": rule["model"],
+            "candidates": rule["candidates"],
+            "rule": rule["name"],
+            "priority": rule["priority"],
+            "field": PROFILE_FIELDS[column],
+            "keyword": term,
+        }
+
+    def route_many(self, agent_profiles):
+        """
+        Route a batch of profiles, returning one result per profile in order.
+
+        Each profile is normalized once; profiles already routed (by
+        routing_key) come from the memo, and the rest are evaluated
+        together, once per distinct key.
+        """
+        batch = [profile_fields(profile) for profile in agent_profiles]
+        keys = [routing_key(fields) for fields in batch]
+        results = [None] * len(batch)
+        pending = {}
+        with self._memo_lock:
+            for i, key in enumerate(keys):
+                route = self._memo.get(key)
+                if route is not None:
+                    self._memo.move_to_end(key)
+                    self.hits += 1
+                    results[i] = route
+                elif key in pending:
+                    self.hits += 1
+                else:
+                    pending[key] = i
+        if pending:
+            rows = list(pending.values())
+            routed = {keys[i]: self._result(best) for i, best in zip(rows, self._evaluate([batch[i] for i in rows]))}
+            with self._memo_lock:
+                self.misses += len(routed)
+                self._memo.update(routed)
+                while len(self._memo) > ROUTE_CACHE_SIZE:
+                    self._memo.popitem(last=False)
+            for i, key in enumerate(keys):
+                if results[i] is None:
+                    results[i] = routed[key]
+        return [dict(route) for route in results]
+
+    def route(self, agent_profile):
+        """
+        Return the model for a profile and why it was chosen.
+
+        The result is {"model", "candidates", "rule", "priority", "field",
+        "keyword"}, where model is the rule's preferred model; field and
+        keyword are None when no rule fired and the default applies.
+        """
+        return self.route_many([agent_profile])[0]
+
+    def cache_info(self):
+        """Routing memo counters: {"hits", "misses", "size", "max_size"}."""
+        with self._memo_lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._memo), "max_size": ROUTE_CACHE_SIZE}
+
+def load_zord_rules(path=ZORD_RULES_PATH):
+    """Read a rules file (JSON, or YAML with PyYAML); the built-in rules if it is missing or unreadable."""
+    path = Path(path)
+    try:
+        if not path.exists():
+            return DEFAULT_ZORD_RULES
+        with open(path, "r") as f:
+            if path.suffix in (".yaml", ".yml"):
+                import yaml
+                return yaml.safe_load(f) or DEFAULT_ZORD_RULES
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading Zord rules {path}: {e}")
+        return DEFAULT_ZORD_RULES
+
+_engine = None
+_engine_stamp = None
+_engine_lock = threading.Lock()
+
+def get_zord_engine(path=ZORD_RULES_PATH):
+    """Return the compiled rule engine, recompiling it if the rules file changed."""
+    global _engine, _engine_stamp
+    stamp = (str(path), file_stamp(path))
+    with _engine_lock:
+        if _engine is None or stamp != _engine_stamp:
+            try:
+                _engine = ZordRuleEngine(load_zord_rules(path))
+            except Exception as e:
+                print(f"Error compiling Zord rules {path}: {e}")
+                _engine = ZordRuleEngine()
+            _engine_stamp = stamp
+        return _engine
+
+def select_model(route, stats=None):
+    """Pick the model with the lowest expected latency among a route's candidates."""
+    if len(route["candidates"]) > 1:
+        route["model"] = (stats or get_provider_stats()).choose(route["candidates"])
+    return route
+
+def route_zord_model(agent_profile):
+    """Route a profile and report the rule that fired."""
+    return select_model(get_zord_engine().route(agent_profile))
+
+def route_zord_models(agent_profiles):
+    """Route a batch of profiles, reporting the rule that fired for each."""
+    stats = get_provider_stats()
+    return [select_model(route, stats) for route in get_zord_engine().route_many(agent_profiles)]
 
 def match_zord_model(agent_profile):
-    tone = agent_profile.get("emotional_signature", {}).get("tone", "").lower()
-    purpose = agent_profile.get("purpose", "").lower()
-    traits = agent_profile.get("core_traits", [])
-    archetype = agent_profile.get("role", "").lower()
-
-    # Basic keyword heuristics for model matching
-    if "trauma" in tone or "sacrifice" in purpose or "legacy" in purpose:
-        return "qwen:Qwen3-72B-Instruct"  # Heavy resonance model
-    elif "humor" in tone or "chaos" in traits or "meta" in archetype:
-        return "openrouter:deepseek-coder"  # Responsive and quirky
-    elif "justice" in purpose or "order" in tone or "narrator" in archetype:
-        return "openrouter:together-gemma-7b-it"  # Calm rational tone
-    elif "evolution" in purpose or "introspection" in tone:
-        return "huggingface:deepseek-v2"  # Reflective, scalable
-    else:
-        return "openrouter:gemini-pro-vision"  # Generalist fallback
+    return route_zord_model(agent_profile)["model"]
+
+def match_zord_models(agent_profiles):
+    """Models for a batch of profiles, e.g. when re-routing the whole swarm."""
+    return [route["model"] for route in route_zord_models(agent_profiles)]
 
 # Example usage:
 # model = match_zord_model(stark_prime_dict)
+# route_zord_model(stark_prime_dict)["rule"]  # e.g. "heavy_resonance"
+# models = match_zord_models(swarm_profiles)
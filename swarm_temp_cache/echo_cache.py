@@ -0,0 +1,223 @@
+"""
+Echo Agent Cache
+
+In-process cache of the temporary echo agents construct_echo_agent()
+builds. Echoes are looked up by session_id in O(1), expire after a
+per-entry TTL, and are evicted least recently used first once the cache is
+full. spawn() reuses the live echo built from an identical seed, so a trial
+that summons the same echo twice in a session gets the same construct.
+
+Echoes are temporary ("Post-session unless archived"); archive() writes the
+selected ones to swarm_temp_cache.json so they outlive the session.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+
+from nerdbible.file_lock import file_lock
+from swarm_temp_cache.construct_echo_agent import construct_echo_agent
+
+# Seconds an echo stays live unless given its own TTL
+ECHO_TTL = 3600
+
+# Live echoes kept before the least recently used is evicted
+ECHO_CACHE_SIZE = 1024
+
+# Where archived echoes are persisted
+ECHO_ARCHIVE_PATH = Path("swarm_temp_cache.json")
+
+def seed_key(seed):
+    """SHA-256 over the canonical JSON of an echo seed."""
+    canonical = json.dumps(seed, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def load_echo_archive(path=ECHO_ARCHIVE_PATH):
+    """Return the archived echoes, {"echoes": [...]}; empty if the file is missing or blank."""
+    path = Path(path)
+    try:
+        text = path.read_text() if path.exists() else ""
+        archive = json.loads(text) if text.strip() else {}
+    except Exception as e:
+        print(f"Error loading echo archive {path}: {e}")
+        archive = {}
+    archive.setdefault("echoes", [])
+    return archive
+
+class EchoCache:
+    """
+    TTL + LRU cache of echo agents keyed by session_id.
+
+    Expired echoes are dropped when they are next looked up, evicted, or
+    swept by purge_expired(). Counters: hits, misses, evictions, expirations.
+    """
+
+    def __init__(self, max_size=ECHO_CACHE_SIZE, ttl=ECHO_TTL, archive_path=ECHO_ARCHIVE_PATH, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.archive_path = Path(archive_path)
+        self.clock = clock
+        self._echoes = OrderedDict()
+        self._by_seed = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._echoes)
+
+    def __contains__(self, session_id):
+        return self.get(session_id, count=False) is not None
+
+    def _drop(self, session_id):
+        echo, _, key = self._echoes.pop(session_id)
+        if key is not None and self._by_seed.get(key) == session_id:
+            del self._by_seed[key]
+        return echo
+
+    def _live(self, session_id, now):
+        """The echo for a session_id if it has not expired, refreshed as most recently used."""
+        entry = self._echoes.get(session_id)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            self._drop(session_id)
+            self.expirations += 1
+            return None
+        self._echoes.move_to_end(session_id)
+        return entry[0]
+
+    def get(self, session_id, count=True):
+        """The live echo with this session_id, or None."""
+        with self._lock:
+            echo = self._live(session_id, self.clock())
+            if count:
+                if echo is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+            return echo
+
+    def put(self, echo, ttl=None, key=None):
+        """Cache an echo for ttl seconds (the cache default if None). Returns the echo."""
+        session_id = echo["session_id"]
+        with self._lock:
+            if session_id in self._echoes:
+                self._drop(session_id)
+            self._echoes[session_id] = (echo, self.clock() + (self.ttl if ttl is None else ttl), key)
+            if key is not None:
+                self._by_seed[key] = session_id
+            while len(self._echoes) > self.max_size:
+                oldest = next(iter(self._echoes))
+                self._drop(oldest)
+                self.evictions += 1
+        return echo
+
+    def spawn(self, seed, ttl=None):
+        """Return the live echo built from this seed, constructing and caching one if there is none."""
+        key = seed_key(seed)
+        with self._lock:
+            session_id = self._by_seed.get(key)
+            echo = self._live(session_id, self.clock()) if session_id is not None else None
+            if echo is not None:
+                self.hits += 1
+                return echo
+            self.misses += 1
+        return self.put(construct_echo_agent(seed), ttl=ttl, key=key)
+
+    def remove(self, session_id):
+        """Drop an echo from the cache. Returns it, or None if it was not cached."""
+        with self._lock:
+            if session_id not in self._echoes:
+                return None
+            return self._drop(session_id)
+
+    def purge_expired(self):
+        """Drop every expired echo. Returns how many were dropped."""
+        with self._lock:
+            now = self.clock()
+            expired = [session_id for session_id, entry in self._echoes.items() if entry[1] <= now]
+            for session_id in expired:
+                self._drop(session_id)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def archive(self, session_ids):
+        """
+        Persist live echoes to the archive file, marked as no longer temporary.
+
+        Echoes already archived under the same session_id are replaced. The
+        read-modify-write holds a lock on a sidecar .lock file, so archives
+        from several processes (the server and the CLI) do not lose echoes.
+        Returns the archived echoes; unknown or expired session_ids are skipped.
+        """
+        if isinstance(session_ids, str):
+            session_ids = [session_ids]
+        with self._lock:
+            now = self.clock()
+            echoes = [echo for echo in (self._live(session_id, now) for session_id in session_ids) if echo is not None]
+        archived_at = datetime.utcnow().isoformat() + "Z"
+        archived = [dict(echo, temporary=False, expires="Archived", archived_at=archived_at) for echo in echoes]
+        if not archived:
+            return []
+
+        replaced = {echo["session_id"] for echo in archived}
+        tmp_path = self.archive_path.with_name(f".{self.archive_path.name}.{os.getpid()}.tmp")
+        try:
+            with file_lock(self.archive_path.with_name(self.archive_path.name + ".lock")):
+                archive = load_echo_archive(self.archive_path)
+                archive["echoes"] = [echo for echo in archive["echoes"] if echo.get("session_id") not in replaced] + archived
+                with open(tmp_path, "w") as f:
+                    json.dump(archive, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, self.archive_path)
+        except Exception as e:
+            print(f"Error archiving echoes: {e}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return []
+        return archived
+
+    def stats(self):
+        """Counters and size: {"hits", "misses", "evictions", "expirations", "size", "max_size"}."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._echoes),
+                "max_size": self.max_size,
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_echo_cache():
+    """Return the process-wide echo cache, created on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EchoCache()
+        return _cache
+
+def set_echo_cache(cache):
+    """Replace the process-wide echo cache."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+    return cache
+
+def spawn_echo_agent(seed, ttl=None):
+    """Construct an echo agent, or reuse the live one built from the same seed this session."""
+    return get_echo_cache().spawn(seed, ttl=ttl)
+
+def archive_echoes(session_ids):
+    """Persist live echoes from the process-wide cache to swarm_temp_cache.json."""
+    return get_echo_cache().archive(session_ids)
@@ -6,13 +6,55 @@ This script tests the backend components to ensure they are working correctly.
 """
 
 import os
+import gzip
 import json
+import tempfile
+import multiprocessing
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Import the core modules
-from krakoa_engine.generate_krakoa_persona import generate_krakoa_persona
-from trial_logic.trial_forge import generate_trial_record
-from swarm_logic.zord_model_router import match_zord_model
+from krakoa_engine.generate_krakoa_persona import (
+    generate_krakoa_persona,
+    generate_krakoa_personas,
+    stream_krakoa_personas,
+    write_krakoa_personas,
+)
+from krakoa_engine.persona import PERSONA_KEYS, Persona
+from krakoa_engine.persona_cache import PersonaCache, get_persona_cache, persona_key, set_persona_cache
+from trial_logic.trial_forge import forge_trials, generate_trial_record, stream_trials, write_trials
+from swarm_logic.zord_model_router import (
+    ZordRuleEngine,
+    get_zord_engine,
+    match_zord_model,
+    match_zord_models,
+    route_zord_model,
+    select_model,
+)
+from swarm_logic.provider_stats import ProviderStats, SimulatedClock, SimulatedProviders
+from swarm_temp_cache.echo_cache import EchoCache, get_echo_cache, load_echo_archive
+from swarm_logic.warm_pool import WarmPool
+from nerdbible import bible_core
+from nerdbible.search_index import TrigramIndex
+from canon_index.canon_index import CanonIndex, CanonSource, CANON_SOURCES, get_canon_index, set_canon_index
+from canon_index.snapshot import (
+    HEADER,
+    SNAPSHOT_MAGIC,
+    SNAPSHOT_VERSION,
+    build_canon_snapshot,
+    load_canon_snapshot,
+    read_canon_snapshot,
+    snapshot_sources,
+    sources_digest,
+)
+from canon_index import timeline as canon_timeline
+from canon_index.timeline import TimelineIndex, compact_trial_journal, get_timeline_index, load_trial_journal
+from canon_index.graph import get_canon_graph
+from intent_logic.intent_matcher import IntentMatcher, get_intent_matcher
 
 # Load environment variables
 load_dotenv()
@@ -45,6 +87,112 @@ def test_krakoa_engine():
         print(f"❌ Error generating persona: {str(e)}")
         return False
 
+def test_bulk_persona_generation():
+    """Test generating personas in bulk, in a process pool and as a JSONL stream."""
+    print("\n=== Testing Bulk Persona Generation ===")
+
+    try:
+        seeds = [{"name": f"Echo {i}", "purpose": "To preserve legacy" if i % 2 else "To witness"} for i in range(40)]
+        personas = generate_krakoa_personas(seeds, workers=2)
+        assert [p["identity"]["designation"] for p in personas] == [seed["name"] for seed in seeds]
+        assert personas[1]["model_profile"] == "qwen:Qwen3-72B-Instruct"
+        assert len({p["session_id"] for p in personas}) == len(seeds)
+
+        unordered = stream_krakoa_personas(iter(seeds), workers=2, ordered=False, chunk_size=7)
+        assert sorted(p["identity"]["designation"] for p in unordered) == sorted(seed["name"] for seed in seeds)
+
+        # Bulk personas are only linked into the canon graph on request
+        graph = get_canon_graph()
+        assert graph.node("Echo 0") is None
+        generate_krakoa_personas(seeds[:1], link=True)
+        assert graph.node("Echo 0")["kind"] == "persona"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            seeds_path = Path(tmp) / "seeds.jsonl"
+            seeds_path.write_text("".join(json.dumps(seed) + "\n" for seed in seeds))
+            output = Path(tmp) / "personas.jsonl"
+            assert write_krakoa_personas(seeds_path, output) == len(seeds)
+            lines = output.read_text().splitlines()
+            assert json.loads(lines[-1])["identity"]["designation"] == "Echo 39"
+
+            output = Path(tmp) / "witnesses.jsonl"
+            assert write_krakoa_personas("witness_registry.json", output) >= 1
+            assert json.loads(output.read_text().splitlines()[0])["identity"]["designation"] == "Mutant Echo"
+
+        print(f"✅ {len(personas)} personas generated in bulk")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing bulk persona generation: {str(e)}")
+        return False
+
+def test_persona_representation():
+    """Test the slotted Persona against the persona dict shape."""
+    print("\n=== Testing Persona Representation ===")
+
+    try:
+        seed = {"name": "Test Agent", "universe": "Earth-616", "traits": ["Loyal", "Stoic"], "parable": "Test Parable"}
+        persona = Persona.from_seed(seed, "openrouter:gemini-pro-vision")
+        legacy = generate_krakoa_persona(seed)
+        as_dict = persona.to_dict()
+        assert list(as_dict) == list(legacy) == list(PERSONA_KEYS)
+        for key in ("identity", "personality_framework", "soul_data", "self_awareness", "calibrated_by", "model_profile"):
+            assert as_dict[key] == legacy[key], key
+        assert persona["session_id"].startswith(f"{int(persona.created)}-")
+        assert persona["generated_at"].endswith("Z") and persona.get("missing") is None
+
+        # Shared strings are interned and the slots leave no per-instance dict
+        other = Persona.from_seed(json.loads(json.dumps(seed)), "openrouter:gemini-pro-vision")
+        assert other.universe is persona.universe and other.traits[0] is persona.traits[0]
+        assert not hasattr(persona, "__dict__")
+        assert pickle.loads(pickle.dumps(persona)).to_dict() == as_dict
+        assert json.loads(persona.to_json()) == as_dict
+
+        print("✅ Persona objects render the persona dict on demand")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing persona representation: {str(e)}")
+        return False
+
+def test_persona_cache():
+    """Test that re-spawning a seed reuses its persona body and Convex result."""
+    print("\n=== Testing Persona Cache ===")
+
+    previous = get_persona_cache()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "personas.db"
+            cache = set_persona_cache(PersonaCache(size=2, db_path=db_path))
+            seed = {"name": "Cache Agent", "traits": ["Loyal"], "purpose": "To preserve legacy"}
+
+            first = generate_krakoa_persona(seed)
+            second = generate_krakoa_persona(dict(reversed(list(seed.items()))))
+            assert first["session_id"] != second["session_id"] and list(first) == list(second)
+            assert {k: v for k, v in first.items() if k != "session_id"} == {k: v for k, v in second.items() if k != "session_id"}
+            assert cache.cache_info()["hits"] == 1
+            assert persona_key(seed) != persona_key(dict(seed, purpose="To witness"))
+            assert persona_key(seed) != persona_key(seed, rules_version="edited-rules")
+            assert persona_key(dict(seed, traits="Loyal")) == persona_key(seed)
+
+            key = persona_key(seed)
+            assert cache.convex_result(key) is None
+            cache.set_convex(key, {"_id": "persona-123"})
+
+            # Evicted from memory, then read back from the SQLite tier by a new process
+            generate_krakoa_persona({"name": "Filler A"})
+            generate_krakoa_persona({"name": "Filler B"})
+            reopened = set_persona_cache(PersonaCache(size=2, db_path=db_path))
+            assert reopened.convex_result(key) == {"_id": "persona-123"}
+            third = generate_krakoa_persona(seed)
+            assert third["generated_at"] == first["generated_at"] and third["session_id"] != first["session_id"]
+
+        print("✅ Repeated spawns reuse the cached persona")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing persona cache: {str(e)}")
+        return False
+    finally:
+        set_persona_cache(previous)
+
 def test_trial_forge():
     """Test the Trial Forge for trial generation."""
     print("\n=== Testing Trial Forge ===")
@@ -58,7 +206,8 @@ def test_trial_forge():
     
     # Generate trial
     try:
-        trial = generate_trial_record(title, plaintiffs, defendants, charges, tone)
+        with temporary_trial_journal():
+            trial = generate_trial_record(title, plaintiffs, defendants, charges, tone)
         print("✅ Trial generated successfully:")
         print(f"  Title: {trial['title']}")
         print(f"  Case ID: {trial['case_id']}")
@@ -70,6 +219,41 @@ def test_trial_forge():
         print(f"❌ Error generating trial: {str(e)}")
         return False
 
+def test_batch_trial_forge():
+    """Test forging trials in bulk, in a process pool and as a JSONL or gzip stream."""
+    print("\n=== Testing Batch Trial Forge ===")
+
+    try:
+        specs = [{"title": f"Docket {i}", "defendants": [f"Defendant {i}"], "trial_tone": "farce"} for i in range(30)]
+        with temporary_trial_journal() as path:
+            trials = forge_trials(specs, workers=2)
+            assert [t["case_id"] for t in load_trial_journal(path)[0]] == [t["case_id"] for t in trials]
+        assert [t["title"] for t in trials] == [spec["title"] for spec in specs]
+        assert trials[0]["trial_tone"] == "farce" and trials[0]["verdict"] == "PENDING"
+        assert len({t["case_id"] for t in trials}) == len(specs)
+
+        unordered = stream_trials(iter(specs), workers=2, ordered=False, index=False, chunk_size=4)
+        assert sorted(t["title"] for t in unordered) == sorted(spec["title"] for spec in specs)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            specs_path = Path(tmp) / "docket.jsonl"
+            specs_path.write_text("".join(json.dumps(spec) + "\n" for spec in specs))
+            output = Path(tmp) / "records.jsonl.gz"
+            assert write_trials(specs_path, output, workers=2) == len(specs)
+            with gzip.open(output, "rt", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            assert json.loads(lines[-1])["title"] == "Docket 29"
+
+        # The root-level module is the same code path
+        import trial_forge
+        assert trial_forge.generate_trial_record is generate_trial_record
+
+        print(f"✅ {len(trials)} trials forged in bulk")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing batch trial forge: {str(e)}")
+        return False
+
 def test_zord_model_router():
     """Test the Zord Model Router for model matching."""
     print("\n=== Testing Zord Model Router ===")
@@ -120,23 +304,806 @@ def test_zord_model_router():
     
     return success
 
+def test_zord_rule_engine():
+    """Test the compiled Zord routing rules."""
+    print("\n=== Testing Zord Rule Engine ===")
+
+    try:
+        # Traits match as substrings, case-insensitively
+        route = route_zord_model({"core_traits": ["Funny", "Chaos"], "role": "Narrator"})
+        assert route["rule"] == "responsive_quirky" and route["field"] == "traits"
+        assert route_zord_model({"purpose": "Guard the legacy", "role": "Meta"})["model"] == "qwen:Qwen3-72B-Instruct"
+        assert route_zord_model({})["rule"] == "generalist"
+
+        # Large keyword sets compile to a trie regex; prefixes keep their own rank
+        rules = [{"name": f"r{i}", "model": f"m{i}", "priority": i, "keywords": {"tone": [f"kw{i}"]}} for i in range(40)]
+        rules.append({"name": "meta", "model": "meta-model", "priority": 100, "keywords": {"role": ["meta"]}})
+        rules.append({"name": "wry", "model": "wry-model", "priority": 99, "patterns": {"tone": [r"\bwry\b"]}})
+        engine = ZordRuleEngine({"default": {"model": "fallback"}, "rules": rules})
+        assert engine.route({"emotional_signature": {"tone": "KW3 then kw12"}})["rule"] == "r12"
+        assert engine.route({"emotional_signature": {"tone": "kw1"}})["rule"] == "r1"
+        assert engine.route({"emotional_signature": {"tone": "a wry kw39"}})["rule"] == "wry"
+        assert engine.route({"role": "metahuman", "emotional_signature": {"tone": "wry"}})["model"] == "meta-model"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "zord_rules.json"
+            path.write_text(json.dumps({"default": {"model": "fallback"}, "rules": rules[:1]}))
+            assert get_zord_engine(path).route({"emotional_signature": {"tone": "kw0"}})["model"] == "m0"
+            path.write_text(json.dumps({"default": {"model": "fallback"}, "rules": []}))
+            assert get_zord_engine(path).route({"emotional_signature": {"tone": "kw0"}})["model"] == "fallback"
+        get_zord_engine()
+
+        # Batches keep their order and route each normalized profile once
+        engine = ZordRuleEngine()
+        profiles = [
+            {"purpose": "Guard the  LEGACY", "role": "Narrator"},
+            {"purpose": "guard the legacy ", "role": "narrator"},
+            {"core_traits": ["Evolution"], "purpose": "Evolution"},
+            {"role": "narrator"},
+        ]
+        routes = engine.route_many(profiles)
+        assert [route["rule"] for route in routes] == ["heavy_resonance", "heavy_resonance", "reflective_scalable", "calm_rational"]
+        assert engine.cache_info()["misses"] == 3 and engine.cache_info()["hits"] == 1
+        engine.route(profiles[3])
+        assert engine.cache_info()["hits"] == 2
+        assert match_zord_models(profiles) == [route["model"] for route in routes]
+
+        print("✅ Zord rules route profiles and report the rule that fired")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing Zord rule engine: {str(e)}")
+        return False
+
+def test_load_aware_routing():
+    """Test choosing between candidate models by simulated provider latency."""
+    print("\n=== Testing Load-Aware Routing ===")
+
+    try:
+        stats = ProviderStats(clock=SimulatedClock(), failure_penalty=5.0, failure_half_life=60.0)
+        providers = SimulatedProviders(stats, {
+            "qwen": {"latency": 2.0, "jitter": 0.2},
+            "openrouter": {"latency": 0.4, "jitter": 0.1},
+        }, seed=7)
+        engine = ZordRuleEngine({
+            "default": {"model": "openrouter:gemini-pro-vision"},
+            "rules": [{
+                "name": "heavy_resonance",
+                "candidates": ["qwen:Qwen3-72B-Instruct", "openrouter:qwen-72b"],
+                "keywords": {"purpose": ["legacy"]},
+            }],
+        })
+        profile = {"purpose": "Guard the legacy"}
+
+        # Untried providers are assumed equal, so the preferred model wins
+        assert select_model(engine.route(profile), stats)["model"] == "qwen:Qwen3-72B-Instruct"
+        for _ in range(20):
+            providers.call("qwen:Qwen3-72B-Instruct")
+            providers.call("openrouter:qwen-72b")
+        assert select_model(engine.route(profile), stats)["model"] == "openrouter:qwen-72b"
+
+        # Recent failures push traffic away until they fade
+        providers.providers["openrouter"]["error_rate"] = 1.0
+        for _ in range(3):
+            providers.call("openrouter:qwen-72b")
+        assert select_model(engine.route(profile), stats)["model"] == "qwen:Qwen3-72B-Instruct"
+        providers.providers["openrouter"]["error_rate"] = 0.0
+        for _ in range(10):
+            providers.call("openrouter:qwen-72b")
+        stats.clock.advance(600)
+        assert select_model(engine.route(profile), stats)["model"] == "openrouter:qwen-72b"
+
+        # Calls in flight count against a provider
+        for _ in range(5):
+            stats.begin("openrouter:qwen-72b")
+        assert select_model(engine.route(profile), stats)["model"] == "qwen:Qwen3-72B-Instruct"
+        assert stats.snapshot()["openrouter:qwen-72b"]["in_flight"] == 5
+
+        # Reading the stats never creates entries for untried models
+        stats.expected_latency("huggingface:deepseek-v2")
+        stats.choose(["huggingface:deepseek-v2", "together:gemma"])
+        assert set(stats.snapshot()) == {"qwen:Qwen3-72B-Instruct", "openrouter:qwen-72b"}
+
+        # Slow or failing media calls on HuggingFace don't count against its chat models
+        reflective = get_zord_engine().route({"purpose": "Study evolution"})
+        assert reflective["candidates"] == ("huggingface:deepseek-v2", "openrouter:deepseek-coder")
+        stats.record("openrouter:deepseek-coder", 0.5)
+        stats.record("huggingface:deepseek-v2", 0.5)
+        for _ in range(4):
+            with suppress(ConnectionError), stats.track("huggingface:nari-labs/Dia-1.6B"):
+                stats.clock.advance(8.0)
+                raise ConnectionError("voice call failed")
+        assert select_model(reflective, stats)["model"] == "huggingface:deepseek-v2"
+
+        # The shipped rules fail reflective profiles over from a failing HuggingFace chat model
+        for _ in range(4):
+            stats.record("huggingface:deepseek-v2", 0.5, ok=False)
+        assert select_model(reflective, stats)["model"] == "openrouter:deepseek-coder"
+
+        print("✅ Routing follows simulated provider latency and failures")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing load-aware routing: {str(e)}")
+        return False
+
+def _archive_echoes_worker(args):
+    """Spawn and archive echoes one at a time from a separate process (used by the echo cache test)."""
+    path, worker, count = args
+    cache = EchoCache(archive_path=path)
+    for i in range(count):
+        cache.archive(cache.spawn({"name": f"Worker {worker} Echo {i}"})["session_id"])
+
+def test_echo_cache():
+    """Test the TTL/LRU echo agent cache and archiving."""
+    print("\n=== Testing Echo Cache ===")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            archive_path = Path(tmp) / "swarm_temp_cache.json"
+            archive_path.write_text("")
+            clock = SimulatedClock()
+            cache = EchoCache(max_size=2, ttl=60, archive_path=archive_path, clock=clock)
+
+            # The same seed within a session reuses the live echo
+            echo = cache.spawn({"name": "Echo Stark", "traits": ["Wit"]})
+            assert cache.spawn({"traits": ["Wit"], "name": "Echo Stark"}) is echo
+            assert cache.get(echo["session_id"]) is echo
+
+            # Expiry, then least-recently-used eviction
+            short = cache.spawn({"name": "Echo Wade"}, ttl=5)
+            clock.advance(10)
+            assert cache.get(short["session_id"]) is None
+            other = cache.spawn({"name": "Echo Logan"})
+            cache.get(echo["session_id"])
+            newest = cache.spawn({"name": "Echo Bruce"})
+            assert other["session_id"] not in cache and echo["session_id"] in cache
+            assert cache.stats() == {"hits": 3, "misses": 5, "evictions": 1, "expirations": 1, "size": 2, "max_size": 2}
+
+            archived = cache.archive([echo["session_id"], "missing"])
+            assert len(archived) == 1 and archived[0]["temporary"] is False
+            cache.archive(newest["session_id"])
+            cache.archive(echo["session_id"])
+            stored = load_echo_archive(archive_path)["echoes"]
+            assert [e["session_id"] for e in stored] == [newest["session_id"], echo["session_id"]]
+            assert echo["temporary"] is True
+
+            clock.advance(120)
+            assert cache.purge_expired() == 2 and len(cache) == 0
+
+            # Archives from several processes at once do not lose each other's echoes
+            with multiprocessing.Pool(3) as pool:
+                pool.map(_archive_echoes_worker, [(str(archive_path), worker, 10) for worker in range(3)])
+            assert len(load_echo_archive(archive_path)["echoes"]) == 2 + 3 * 10
+
+        print("✅ Echo agents are cached, expired, evicted and archived")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing echo cache: {str(e)}")
+        return False
+
+def test_warm_pool():
+    """Test prebuilding registry agents and refilling the pool in the background."""
+    print("\n=== Testing Warm Pool ===")
+
+    pool = WarmPool(depth=2)
+    try:
+        pool.warm()
+        ready = pool.stats()["ready"]
+        assert ready >= 2 * 6, "expected 4 registry agents plus a witness persona and echo, twice"
+
+        # Prebuilt agents are stamped as of checkout, not as of the warm-up
+        checkout_time = datetime.utcnow().isoformat() + "Z"
+        alfred = pool.checkout_persona("agent-alfred")
+        assert alfred["generated_at"] >= checkout_time
+        again = pool.checkout_persona("alfred")
+        assert alfred["identity"]["designation"] == again["identity"]["designation"] == "Alfred"
+        assert alfred["session_id"] != again["session_id"] and alfred["model_profile"]
+        echo = pool.checkout_echo("Mutant Echo")
+        assert echo["echo_identity"]["spawn_type"] == "echo"
+        assert get_echo_cache().get(echo["session_id"]) is echo
+
+        assert pool.wait_idle(timeout=10)
+        stats = pool.stats()
+        assert stats["hits"] == 3 and stats["misses"] == 0 and stats["ready"] == ready
+        try:
+            pool.checkout_persona("Nobody")
+            assert False, "unknown agents should not be pooled"
+        except KeyError:
+            pass
+
+        # The pool can be stopped and started again
+        pool.stop()
+        pool.checkout_persona("alfred")
+        assert pool.stats()["ready"] == ready - 1
+        pool.start()
+        assert pool.wait_idle(timeout=10) and pool.stats()["ready"] == ready
+
+        print(f"✅ {ready} agents prebuilt and refilled after checkout")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing warm pool: {str(e)}")
+        return False
+    finally:
+        pool.stop()
+
+@contextmanager
+def temporary_bible():
+    """Point the NerdBible at a throwaway core file for the duration of a test."""
+    original_path = bible_core.NERDBIBLE_CORE_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        bible_core.NERDBIBLE_CORE_PATH = Path(tmp) / "nerd_bible_core.json"
+        try:
+            yield bible_core.NERDBIBLE_CORE_PATH
+        finally:
+            bible_core.NERDBIBLE_CORE_PATH = original_path
+            bible_core.get_bible_store().invalidate()
+
+@contextmanager
+def temporary_trial_journal():
+    """Point the trial journal at a throwaway file for the duration of a test."""
+    original_path = canon_timeline.TRIAL_JOURNAL_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        canon_timeline.TRIAL_JOURNAL_PATH = Path(tmp) / "trial_journal.jsonl"
+        try:
+            yield canon_timeline.TRIAL_JOURNAL_PATH
+        finally:
+            canon_timeline.TRIAL_JOURNAL_PATH = original_path
+
+def test_nerdbible_store():
+    """Test that the NerdBible store caches reads and sees outside writes."""
+    print("\n=== Testing NerdBible Store ===")
+
+    try:
+        with temporary_bible() as path:
+            entry = bible_core.create_entry("legacy", "Legacy isn't cosplay.", "Test Trial", "Tony Stark")
+            assert bible_core.get_entry_by_id(entry["id"]) == entry
+
+            # A write from another process must be picked up on the next lookup
+            bible = json.loads(path.read_text())
+            bible["entries"].append(dict(entry, id="NB-9999", theme="outside write"))
+            path.write_text(json.dumps(bible) + "\n")
+            assert bible_core.get_entries_by_theme("Outside Write")[0]["id"] == "NB-9999"
+
+            # Multi-key queries intersect the theme and character indexes
+            assert bible_core.query_entries(theme="LEGACY", character="tony stark") == [entry]
+            bible_core.update_entry(entry["id"], character="Iron Man")
+            assert bible_core.query_entries(theme="legacy", character="Tony Stark") == []
+            assert bible_core.get_entries_by_character("iron man")[0]["id"] == entry["id"]
+
+            # Lookups on other threads never see the indexes mid-update
+            def look_up(i):
+                bible_core.search_bible(f"quote {i}", ranked=True)
+                bible_core.query_entries(character="Thread Writer")
+                bible_core.fuzzy_search_names("Thred Writer")
+                return bible_core.search_bible("quote")
+
+            with ThreadPoolExecutor(4) as pool:
+                lookups = [pool.submit(look_up, i) for i in range(200)]
+                for i in range(50):
+                    bible_core.create_entry(f"thread {i}", f"Thread quote {i}", "Threads", "Thread Writer")
+                for lookup in lookups:
+                    lookup.result()
+            assert len(bible_core.query_entries(character="Thread Writer")) == 50
+
+        print("✅ NerdBible store cached and reloaded successfully")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing NerdBible store: {str(e)}")
+        return False
+
+def test_nerdbible_search():
+    """Test ranked and substring NerdBible search."""
+    print("\n=== Testing NerdBible Search ===")
+
+    try:
+        with temporary_bible():
+            bible_core.create_entry("responsibility", "With great power comes great responsibility.", "Amazing Fantasy #15", "Peter Parker")
+            bible_core.create_entry("power", "Power corrupts.", "Lecture Notes", "Lord Acton")
+            # Created after the index was built, so it must be added incrementally
+            bible_core.search_bible("power", ranked=True)
+            bible_core.create_entry("legacy", "Legacy isn't cosplay. It's cost.", "Post-Credit", "Tony Stark")
+
+            assert [e["character"] for e in bible_core.search_bible("ER")] == ["Peter Parker", "Lord Acton"]
+            assert bible_core.search_bible("power", ranked=True)[0]["character"] == "Lord Acton"
+            assert len(bible_core.search_bible('"great responsibility"', ranked=True)) == 1
+            assert bible_core.search_bible('"responsibility great"', ranked=True) == []
+            assert bible_core.search_bible("cosp*", ranked=True, limit=1)[0]["character"] == "Tony Stark"
+
+        print("✅ NerdBible search returned the expected entries")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing NerdBible search: {str(e)}")
+        return False
+
+def test_nerdbible_journal():
+    """Test that NerdBible writes are journaled and compacted."""
+    print("\n=== Testing NerdBible Journal ===")
+
+    try:
+        with temporary_bible() as path:
+            bible_core.load_bible_core()
+            snapshot = path.read_text()
+            entry = bible_core.create_entry("legacy", "Legacy isn't cosplay.", "Test Trial", "Tony Stark")
+            bible_core.update_entry(entry["id"], quote="Legacy isn't cosplay. It's cost.")
+
+            # Writes go to the journal and are replayed on load
+            assert path.read_text() == snapshot
+            assert bible_core.load_bible_core()["entries"][0]["quote"] == "Legacy isn't cosplay. It's cost."
+
+            assert bible_core.compact_bible()
+            assert not bible_core._journal_path().exists()
+            assert json.loads(path.read_text())["entries"][0]["quote"] == "Legacy isn't cosplay. It's cost."
+
+            # Bulk ingest assigns sequential IDs and persists every quote together
+            with open("rdj_affleck_trial_record.json", "r") as f:
+                trial = json.load(f)
+            created = bible_core.create_entries_from_trials([trial, trial])
+            assert [e["id"] for e in created] == [f"NB-{n:04d}" for n in range(2, 8)]
+            assert bible_core.get_bible_store().journal_records() == 6
+
+        print("✅ NerdBible journal replayed and compacted successfully")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing NerdBible journal: {str(e)}")
+        return False
+
+def test_nerdbible_export():
+    """Test paginated iteration and streaming export of the NerdBible."""
+    print("\n=== Testing NerdBible Export ===")
+
+    try:
+        with temporary_bible() as path:
+            bible_core.create_entries(
+                {"theme": "export", "quote": f"Verse {i}", "source": "Export Test", "character": "Alfred"}
+                for i in range(25)
+            )
+            page, cursor = bible_core.get_entries_page(page_size=10)
+            assert [e["quote"] for e in page] == [f"Verse {i}" for i in range(10)]
+            assert len(list(bible_core.iter_entries(cursor, page_size=7))) == 15
+
+            # Cursors handed out before a save that drops or reorders entries stay put
+            bible = bible_core.get_bible_store().bible()
+            entries = bible["entries"]
+            assert bible_core.save_bible_core(dict(bible, entries=entries[:5] + entries[10:]))
+            page, cursor = bible_core.get_entries_page(cursor, page_size=5)
+            assert [e["quote"] for e in page] == [f"Verse {i}" for i in range(10, 15)]
+            entries = bible_core.get_all_entries()
+            assert bible_core.save_bible_core(dict(bible, entries=entries[1:] + entries[:1]))
+            page, cursor = bible_core.get_entries_page(cursor, page_size=3)
+            assert [e["quote"] for e in page] == [f"Verse {i}" for i in range(15, 18)]
+
+            export_path = path.with_name("export.jsonl.gz")
+            assert bible_core.export_bible(export_path, format="jsonl") == export_path
+            with gzip.open(export_path, "rt") as f:
+                lines = f.read().splitlines()
+            assert "scripture_core" in json.loads(lines[0])
+            assert [json.loads(line) for line in lines[1:]] == bible_core.get_all_entries()
+
+            json_path = bible_core.export_bible_to_json(str(path.with_name("export.json")))
+            with open(json_path, "r") as f:
+                assert json.load(f)["entries"] == bible_core.get_all_entries()
+
+        print("✅ NerdBible paged and exported successfully")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing NerdBible export: {str(e)}")
+        return False
+
+def test_nerdbible_sqlite():
+    """Test the SQLite NerdBible backend and the migration from the JSON store."""
+    print("\n=== Testing NerdBible SQLite Backend ===")
+
+    from nerdbible.sqlite_store import migrate_json_to_sqlite
+
+    original_store = bible_core.get_bible_store()
+    original_env = {key: os.environ.get(key) for key in ("NERDBIBLE_BACKEND", "NERDBIBLE_DB_PATH")}
+    try:
+        with temporary_bible() as path:
+            # Migrate a JSON store (core file plus journal) and the parables index
+            bible_core.create_entries(
+                {"theme": "legacy", "quote": f"Legacy verse {i}", "source": "Migration Test", "character": "Alfred"}
+                for i in range(5)
+            )
+            db_path = path.with_name("nerdbible.db")
+            assert migrate_json_to_sqlite(db_path, path, "parables_index.json")[0] == 5
+
+            os.environ.update(NERDBIBLE_BACKEND="sqlite", NERDBIBLE_DB_PATH=str(db_path))
+            bible_core.set_bible_store(None)
+            assert type(bible_core.get_bible_store()).__name__ == "SqliteBibleStore"
+            assert bible_core.get_entry_by_id("NB-0003")["quote"] == "Legacy verse 2"
+            assert bible_core.get_bible_store().parables()
+
+            entry = bible_core.create_entry("grief", "Grief is love persevering.", "Test Trial", "Vision")
+            assert entry["id"] == "NB-0006" and bible_core.get_entry_by_id("NB-0006") == entry
+            bible_core.update_entry(entry["id"], quote="Grief is love, persevering.")
+            assert bible_core.get_entry_by_id(entry["id"])["quote"] == "Grief is love, persevering."
+
+            assert [e["id"] for e in bible_core.search_bible("love, persevering")] == [entry["id"]]
+            assert bible_core.search_bible("grief love", ranked=True)[0]["id"] == entry["id"]
+            assert bible_core.search_bible("legacy verse", ranked=True, limit=2)[0]["theme"] == "legacy"
+
+            # A cursor handed out before a save still points at the same place
+            page, cursor = bible_core.get_entries_page(page_size=2)
+            assert [e["id"] for e in page] == ["NB-0001", "NB-0002"]
+            bible = bible_core.get_bible_store().bible()
+            bible["entries"][0]["quote"] = "Legacy verse zero"
+            assert bible_core.save_bible_core(bible)
+            page, cursor = bible_core.get_entries_page(cursor, page_size=10)
+            assert [e["id"] for e in page] == ["NB-0003", "NB-0004", "NB-0005", "NB-0006"]
+            assert bible_core.get_entries_page(cursor)[0] == []
+            assert bible_core.get_entry_by_id("NB-0001")["quote"] == "Legacy verse zero"
+
+        print("✅ NerdBible SQLite backend works and migrates the JSON store")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing NerdBible SQLite backend: {str(e)}")
+        return False
+    finally:
+        for key, value in original_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        bible_core.set_bible_store(original_store)
+
+def test_nerdbible_sampling():
+    """Test weighted random verse sampling."""
+    print("\n=== Testing NerdBible Sampling ===")
+
+    try:
+        with temporary_bible():
+            ruling = bible_core.create_entry("order", "Order in the court!", "Opening", "Springer")
+            assert bible_core.get_random_verse(include_parables=False)["id"] == ruling["id"]
+
+            # Added after the sampler was built; a Golden Frame outweighs a Trial Ruling 2:1
+            golden = bible_core.create_entry("legacy", "Legacy isn't cosplay.", "Post-Credit", "Tony Stark", tier="Golden Frame")
+            draws = [bible_core.get_random_verse(include_parables=False)["id"] for _ in range(3000)]
+            assert 1.6 < draws.count(golden["id"]) / draws.count(ruling["id"]) < 2.5
+
+            batch = bible_core.get_random_verses(5)
+            assert len({verse["id"] for verse in batch}) == len(batch)
+
+        print("✅ NerdBible verses sampled by weight")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing NerdBible sampling: {str(e)}")
+        return False
+
+def test_nerdbible_fuzzy():
+    """Test typo-tolerant character and theme name search."""
+    print("\n=== Testing NerdBible Fuzzy Search ===")
+
+    try:
+        with temporary_bible():
+            bible_core.create_entry("chaos", "Maximum effort.", "Deadpool #1", "Deadpool")
+            bible_core.create_entry("mutant pride", "We are the future.", "X-Men #1", "Magneto Prime")
+
+            assert bible_core.fuzzy_search_names("Magnito", fields=("character",))[0]["name"] == "Magneto Prime"
+            assert bible_core.fuzzy_search_bible("Deadpol")[0]["character"] == "Deadpool"
+
+            # Renamed characters are re-indexed
+            bible_core.update_entry(bible_core.query_entries(character="Deadpool")[0]["id"], character="Wade Wilson")
+            assert not bible_core.fuzzy_search_names("Deadpol", fields=("character",))
+            assert bible_core.fuzzy_search_names("Wade Wilsen", fields=("character",))[0]["name"] == "Wade Wilson"
+
+        # Freed name ids are reused without leaving stale matches behind
+        index = TrigramIndex([{"character": "Deadpool"}, {"character": "Magneto"}])
+        index.update({"character": "Deadpool"}, {"character": "Cable"})
+        index.add({"character": "Cablo"})
+        assert [match["name"] for match in index.search("Deadpol")] == []
+        assert [match["name"] for match in index.search("Cabel", min_similarity=0.3)] == ["Cable", "Cablo"]
+        assert pickle.loads(pickle.dumps(index)).search("Magnito")[0]["name"] == "Magneto"
+
+        print("✅ NerdBible fuzzy search tolerates typos")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing NerdBible fuzzy search: {str(e)}")
+        return False
+
+def test_nerdbible_semantic():
+    """Test offline semantic search and getScriptureByTheme fallback."""
+    print("\n=== Testing NerdBible Semantic Search ===")
+
+    try:
+        with temporary_bible():
+            grief = bible_core.create_entry("grief", "We carry the loss of those we buried.", "Year One", "Bruce Wayne")
+            bible_core.create_entry("legacy", "Legacy isn't cosplay.", "Post-Credit", "Tony Stark")
+
+            assert bible_core.semantic_search("burying loss", include_parables=False)[0]["id"] == grief["id"]
+            # No entry has the theme "mourning a loss", so the semantic match fills in
+            assert bible_core.get_scripture_by_theme("mourning a loss", include_parables=False)[0]["id"] == grief["id"]
+
+            # New entries are appended to the matrix
+            bible_core.create_entry("sacrifice", "A hero gives everything.", "Finale", "Steve Rogers")
+            hits = bible_core.semantic_search_many(["hero sacrifice", "cosplay legacy"], limit=1, include_parables=False)
+            assert [verses[0]["character"] for verses in hits] == ["Steve Rogers", "Tony Stark"]
+            # Searches never write the matrix; compaction does
+            assert not bible_core.semantic_index_path(bible_core.NERDBIBLE_CORE_PATH).exists()
+            assert bible_core.compact_bible()
+            assert bible_core.semantic_index_path(bible_core.NERDBIBLE_CORE_PATH).exists()
+
+        print("✅ NerdBible semantic search ranks verses by meaning")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing NerdBible semantic search: {str(e)}")
+        return False
+
+def test_canon_index():
+    """Test indexed canon lookups and hot reload."""
+    print("\n=== Testing Canon Index ===")
+
+    try:
+        canon = CanonIndex()
+        assert canon.parables(theme="grief")[0]["character"] == "Bruce Wayne"
+        assert canon.verdicts(issued_by="judge jerry springer")[0]["id"] == "V-0001"
+        assert canon.timeline(party="Ben Affleck")[0]["trial_id"] == "616-WTF-3000"
+        assert canon.witnesses(universe="Earth-616", spawned_from="Golden Frame: NEVER AGAIN")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "witness_registry.json"
+            path.write_text(json.dumps({"witnesses": []}))
+            canon = CanonIndex({"witnesses": CanonSource(path, "witnesses", CANON_SOURCES["witnesses"].fields)})
+            assert not canon.witnesses(universe="Earth-1610")
+
+            # Rewritten on disk: picked up on the next lookup
+            path.write_text(json.dumps({"witnesses": [{"designation": "Echo", "universe": "Earth-1610"}]}))
+            assert canon.witnesses(universe="Earth-1610")[0]["designation"] == "Echo"
+
+        print("✅ Canon index lookups and hot reload work")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing canon index: {str(e)}")
+        return False
+
+def test_canon_snapshot():
+    """Test that the binary canon snapshot is used only while it matches the sources."""
+    print("\n=== Testing Canon Snapshot ===")
+
+    try:
+        with temporary_bible() as core_path:
+            entry = bible_core.create_entry("legacy", "Legacy isn't cosplay.", "Post-Credit", "Tony Stark")
+            bible_core.compact_bible()
+            snapshot_path = core_path.with_name("canon_snapshot.bin")
+            assert build_canon_snapshot(snapshot_path)
+
+            bible_core.get_bible_store().invalidate()
+            assert load_canon_snapshot(snapshot_path)
+            assert bible_core.query_entries(character="tony stark")[0]["id"] == entry["id"]
+            assert get_canon_index().parables(character="Bruce Wayne")
+
+            # Journaled writes are replayed on top of the snapshot
+            later = bible_core.create_entry("order", "Order in the court!", "Opening", "Springer")
+            assert bible_core.search_bible("court", ranked=True)[0]["id"] == later["id"]
+
+            # A snapshot others can write to is not trusted
+            os.chmod(snapshot_path, 0o666)
+            assert not load_canon_snapshot(snapshot_path)
+            os.chmod(snapshot_path, 0o644)
+            assert load_canon_snapshot(snapshot_path)
+
+            # A current snapshot naming anything but the index classes is refused
+            forged_path = core_path.with_name("forged_snapshot.bin")
+            with open(forged_path, "wb") as f:
+                f.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, sources_digest(snapshot_sources())))
+                pickle.dump(os.getcwd, f)
+            assert read_canon_snapshot(forged_path) is None
+
+            # A changed source invalidates the snapshot
+            bible_core.compact_bible()
+            assert not load_canon_snapshot(snapshot_path)
+        get_canon_index().invalidate()
+
+        print("✅ Canon snapshot loads only when current")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing canon snapshot: {str(e)}")
+        return False
+
+def test_trial_timeline():
+    """Test timestamp range, party and verdict queries over the trial timeline."""
+    print("\n=== Testing Trial Timeline ===")
+
+    try:
+        timeline = TimelineIndex([
+            {"trial_id": "T-2", "plaintiffs": ["Ben Affleck"], "defendants": ["Critics"], "verdict": "Guilty", "timestamp": "2025-06-01T00:00:00Z"},
+            {"trial_id": "T-1", "plaintiffs": ["Vision"], "defendants": ["Ben Affleck"], "verdict": "Acquitted", "timestamp": "2025-01-01T00:00:00Z"},
+            {"trial_id": "T-3", "plaintiffs": ["Ben Affleck"], "defendants": ["Ultron"], "verdict": "Guilty", "timestamp": "2025-12-01T00:00:00Z"},
+        ])
+        assert [t["trial_id"] for t in timeline.between("2025-01-01T00:00:00Z", "2025-06-01T00:00:00Z")] == ["T-1", "T-2"]
+        assert [t["trial_id"] for t in timeline.by_party("ben affleck", role="plaintiff")] == ["T-2", "T-3"]
+        assert [t["trial_id"] for t in timeline.query(end="2025-07-01", party="Ben Affleck", verdict="guilty")] == ["T-2"]
+
+        with temporary_trial_journal() as path:
+            # Generated trials are journaled and added to the live index in place
+            index = get_timeline_index()
+            size = len(index)
+            trial = generate_trial_record("The Trial of Ultron", ["Vision"], ["Ultron"], ["AI Rebellion"])
+            assert get_timeline_index() is index and len(index) == size + 1
+            assert index.by_party("Ultron", role="defendant", start=trial["timestamp"])[0]["case_id"] == trial["case_id"]
+            assert load_trial_journal(path)[0] == [trial]
+
+            # Trials journaled by another process are caught up with
+            other = dict(trial, case_id="T-OTHER", title="The Other Trial")
+            with open(path, "a") as f:
+                f.write(json.dumps(other) + "\n")
+            assert get_timeline_index().get("T-OTHER")["title"] == "The Other Trial"
+
+        # A new journal is read from the start, so the index matches what is on disk
+        assert get_timeline_index().get(trial["case_id"]) is None
+
+        # Compaction folds the journal into the timeline file and removes it
+        original_canon = get_canon_index()
+        original_threshold = canon_timeline.TRIAL_JOURNAL_COMPACT_BYTES
+        with temporary_trial_journal() as path:
+            timeline_path = path.with_name("trial_timeline_index.json")
+            with open(timeline_path, "w") as f:
+                json.dump({"timeline": [{"trial_id": "T-1", "timestamp": "2025-01-01T00:00:00Z"}]}, f)
+            timeline_source = CanonSource(timeline_path, "timeline", CANON_SOURCES["timeline"].fields)
+            set_canon_index(CanonIndex(dict(CANON_SOURCES, timeline=timeline_source)))
+            try:
+                trial = generate_trial_record("The Trial of Ultron", ["Vision"], ["Ultron"], ["AI Rebellion"])
+                assert compact_trial_journal() and not path.exists()
+                with open(timeline_path) as f:
+                    assert [record.get("trial_id") or record["case_id"] for record in json.load(f)["timeline"]] == ["T-1", trial["case_id"]]
+                assert get_timeline_index().get(trial["case_id"])["title"] == "The Trial of Ultron"
+
+                # Past the size threshold new trials compact the journal themselves
+                canon_timeline.TRIAL_JOURNAL_COMPACT_BYTES = 1
+                later = generate_trial_record("The Appeal", ["Ultron"], ["Vision"], ["Contempt"])
+                assert not path.exists()
+                assert len(get_timeline_index()) == 3 and get_timeline_index().get(later["case_id"])
+            finally:
+                canon_timeline.TRIAL_JOURNAL_COMPACT_BYTES = original_threshold
+                set_canon_index(original_canon)
+
+        print("✅ Trial timeline queries work")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing trial timeline: {str(e)}")
+        return False
+
+def test_canon_graph():
+    """Test the canon cross-reference graph and its depth-limited BFS."""
+    print("\n=== Testing Canon Graph ===")
+
+    try:
+        graph = get_canon_graph()
+        # Trial -> its record file -> the verdict stored in it
+        assert graph.within("616-WTF-3000", 2) == {"616-WTF-3000": 0, "rdj_affleck_trial_record.json": 1, "V-0001": 2}
+        # The witness and the parable both cite the Magneto golden frame
+        assert graph.within("Mutant Echo", 2)["PB-0004"] == 2
+
+        # New trials are linked in without a rebuild
+        with temporary_trial_journal():
+            trial = generate_trial_record("The Appeal", ["Ben Affleck"], ["Critics"], ["Contempt"], linked_record="rdj_affleck_trial_record.json")
+            assert get_canon_graph() is graph
+            assert graph.within("616-WTF-3000", 2)[trial["case_id"]] == 2
+
+        # Respawning a persona refreshes its node instead of adding one per session
+        graph = get_canon_graph()
+        generate_krakoa_persona({"name": "Graph Echo", "spawned_from": "Legacy Initialization"})
+        size = len(graph)
+        generate_krakoa_persona({"name": "Graph Echo", "spawned_from": "Legacy Initialization"})
+        assert len(graph) == size and graph.node("Graph Echo")["kind"] == "persona"
+        # and never takes over the witness it was spawned for
+        generate_krakoa_persona({"name": "Mutant Echo"})
+        assert graph.node("Mutant Echo")["kind"] == "witness"
+
+        # Reloaded canon rebuilds the graph, whatever addresses the new objects get
+        get_canon_index().invalidate()
+        assert get_canon_graph() is not graph
+
+        print("✅ Canon graph links and walks records")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing canon graph: {str(e)}")
+        return False
+
+def test_intent_matcher():
+    """Test the compiled intent matcher and its hot reload."""
+    print("\n=== Testing Intent Matcher ===")
+
+    try:
+        intent = get_intent_matcher().match("Alfred, what does the Bible say about grief?")
+        assert intent["action"] == "getScriptureByTheme" and intent["slot"] == "grief"
+
+        # Longest phrase wins unless another has a higher priority
+        matcher = IntentMatcher([
+            ("the bible", "pullFromRepo", 0, "test"),
+            ("what does the bible say about", "getScriptureByTheme", 0, "test"),
+        ])
+        assert matcher.match("what does the bible say about legacy")["action"] == "getScriptureByTheme"
+        assert len(matcher.find_all("what does the bible say about legacy")) == 2
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "intent_map.json"
+            path.write_text(json.dumps({"intent_map": {"the bible": "pullFromRepo"}}))
+            assert get_intent_matcher([path]).match("open the bible")["action"] == "pullFromRepo"
+            path.write_text(json.dumps({"intent_map": {"open the bible": {"action": "openBible", "priority": 1}}}))
+            assert get_intent_matcher([path]).match("open the bible")["action"] == "openBible"
+
+        print("✅ Intent matcher resolves commands")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing intent matcher: {str(e)}")
+        return False
+
+def _create_entries_worker(args):
+    """Create entries from a separate process (used by the concurrency test)."""
+    path, worker, count = args
+    bible_core.NERDBIBLE_CORE_PATH = Path(path)
+    bible_core.get_bible_store().invalidate()
+    ids = []
+    for i in range(count):
+        entry = bible_core.create_entry("stress", f"Worker {worker} verse {i}", "Stress Test", f"Worker {worker}")
+        ids.append(entry["id"])
+        if worker == 0 and i == count // 2:
+            bible_core.compact_bible()
+    return ids
+
+def test_nerdbible_concurrency(workers=8, per_worker=250):
+    """Test that concurrent create_entry calls from many processes never collide."""
+    print("\n=== Testing NerdBible Concurrency ===")
+
+    try:
+        with temporary_bible() as path:
+            bible_core.load_bible_core()
+            jobs = [(str(path), worker, per_worker) for worker in range(workers)]
+            with multiprocessing.Pool(workers) as pool:
+                minted = [entry_id for ids in pool.map(_create_entries_worker, jobs) for entry_id in ids]
+
+            total = workers * per_worker
+            bible_core.get_bible_store().invalidate()
+            stored = [entry["id"] for entry in bible_core.get_all_entries()]
+            assert len(set(minted)) == total, "duplicate IDs were minted"
+            assert sorted(stored) == sorted(minted), "entries were lost or overwritten"
+            assert {bible_core._entry_number(entry_id) for entry_id in minted} == set(range(1, total + 1))
+
+        print(f"✅ {total} concurrent entries created without collisions")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing NerdBible concurrency: {str(e)}")
+        return False
+
 def main():
     """Main entry point for the test script."""
     print("NerdsCourt Canon Core - Backend Test")
     print("====================================")
     
     # Run tests
-    krakoa_success = test_krakoa_engine()
-    trial_success = test_trial_forge()
-    zord_success = test_zord_model_router()
+    results = {
+        "Krakoa Engine": test_krakoa_engine(),
+        "Bulk Persona Generation": test_bulk_persona_generation(),
+        "Persona Representation": test_persona_representation(),
+        "Persona Cache": test_persona_cache(),
+        "Trial Forge": test_trial_forge(),
+        "Batch Trial Forge": test_batch_trial_forge(),
+        "Zord Model Router": test_zord_model_router(),
+        "Zord Rule Engine": test_zord_rule_engine(),
+        "Load-Aware Routing": test_load_aware_routing(),
+        "Echo Cache": test_echo_cache(),
+        "Warm Pool": test_warm_pool(),
+        "NerdBible Store": test_nerdbible_store(),
+        "NerdBible Search": test_nerdbible_search(),
+        "NerdBible Journal": test_nerdbible_journal(),
+        "NerdBible SQLite Backend": test_nerdbible_sqlite(),
+        "NerdBible Export": test_nerdbible_export(),
+        "NerdBible Sampling": test_nerdbible_sampling(),
+        "NerdBible Fuzzy Search": test_nerdbible_fuzzy(),
+        "NerdBible Semantic Search": test_nerdbible_semantic(),
+        "Canon Index": test_canon_index(),
+        "Canon Snapshot": test_canon_snapshot(),
+        "Trial Timeline": test_trial_timeline(),
+        "Canon Graph": test_canon_graph(),
+        "Intent Matcher": test_intent_matcher(),
+        "NerdBible Concurrency": test_nerdbible_concurrency(),
+    }
     
     # Print summary
     print("\n=== Test Summary ===")
-    print(f"Krakoa Engine: {'✅ PASS' if krakoa_success else '❌ FAIL'}")
-    print(f"Trial Forge: {'✅ PASS' if trial_success else '❌ FAIL'}")
-    print(f"Zord Model Router: {'✅ PASS' if zord_success else '❌ FAIL'}")
+    for name, success in results.items():
+        print(f"{name}: {'✅ PASS' if success else '❌ FAIL'}")
     
-    if krakoa_success and trial_success and zord_success:
+    if all(results.values()):
         print("\n✅ All tests passed! The backend components are working correctly.")
         return 0
     else:
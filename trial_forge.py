@@ -1,29 +1,17 @@
+"""
+Trial Forge
 
-from datetime import datetime
-import uuid
+Kept for scripts that import trial_forge from the repository root; the
+implementation lives in trial_logic/trial_forge.py.
+"""
 
-def create_trial_id():
-    return f"{uuid.uuid4()}"
-
-def generate_trial_record(title, plaintiffs, defendants, charges, tone="lore satire", linked_record=None):
-    timestamp = datetime.utcnow().isoformat() + "Z"
-    trial_id = create_trial_id()
-
-    return {
-        "case_id": trial_id,
-        "title": title,
-        "plaintiffs": plaintiffs,
-        "defendants": defendants,
-        "charges": charges,
-        "verdict": "PENDING",
-        "sentencing": [],
-        "notable_quotes": [],
-        "trial_tone": tone,
-        "linked_record": linked_record,
-        "timestamp": timestamp,
-        "post_credit_scene": {
-            "setting": "Undetermined",
-            "present": [],
-            "quote": "TBD"
-        }
-    }
+from trial_logic.trial_forge import (
+    build_trial_record,
+    create_trial_id,
+    forge_trials,
+    generate_trial_record,
+    iter_trial_specs,
+    stream_trials,
+    trial_spec_args,
+    write_trials,
+)
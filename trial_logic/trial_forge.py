@@ -1,11 +1,24 @@
-
 from datetime import datetime
+import gzip
+import json
 import uuid
+from pathlib import Path
+
+from canon_index.timeline import add_trial, add_trials
+from canon_index.graph import ingest
+from swarm_logic.batch_pool import chunked, map_chunks
+
+# Trial specs forged per pool task
+TRIAL_CHUNK_SIZE = 256
+
+# Keys a JSON spec file may list its trials under
+SPEC_LIST_KEYS = ("trials", "specs", "docket")
 
 def create_trial_id():
     return f"{uuid.uuid4()}"
 
-def generate_trial_record(title, plaintiffs, defendants, charges, tone="lore satire", linked_record=None):
+def build_trial_record(title, plaintiffs, defendants, charges, tone="lore satire", linked_record=None):
+    """Build a new PENDING trial record without indexing it."""
     timestamp = datetime.utcnow().isoformat() + "Z"
     trial_id = create_trial_id()
 
@@ -27,3 +40,88 @@ def generate_trial_record(title, plaintiffs, defendants, charges, tone="lore sat
             "quote": "TBD"
         }
     }
+
+def generate_trial_record(title, plaintiffs, defendants, charges, tone="lore satire", linked_record=None):
+    record = build_trial_record(title, plaintiffs, defendants, charges, tone=tone, linked_record=linked_record)
+
+    # Index the new trial in place rather than rebuilding the timeline and graph
+    add_trial(record)
+    ingest("trial", record)
+    return record
+
+def trial_spec_args(spec):
+    """Keyword arguments for build_trial_record from a trial spec (as create-trial reads it)."""
+    return {
+        "title": spec.get("title", "Untitled Trial"),
+        "plaintiffs": spec.get("plaintiffs", []),
+        "defendants": spec.get("defendants", []),
+        "charges": spec.get("charges", []),
+        "tone": spec.get("trial_tone", spec.get("tone", "lore satire")),
+        "linked_record": spec.get("linked_record"),
+    }
+
+def _forge_chunk(specs):
+    """Build the records for a chunk of trial specs (runs in pool workers)."""
+    return [build_trial_record(**trial_spec_args(spec)) for spec in specs]
+
+def stream_trials(specs, workers=None, ordered=True, index=True, chunk_size=TRIAL_CHUNK_SIZE):
+    """
+    Yield a trial record for each spec as it is forged.
+
+    Specs may be any iterable and are consumed lazily; with workers > 1
+    chunks are forged in a process pool. ordered=False yields chunks as
+    they finish instead of in spec order. Indexed trials are journaled a
+    chunk at a time, before that chunk is yielded. index=False skips
+    adding the trials to the timeline and canon graph.
+    """
+    records = map_chunks(_forge_chunk, specs, workers=workers, ordered=ordered, chunk_size=chunk_size)
+    if not index:
+        yield from records
+        return
+    for chunk in chunked(records, chunk_size):
+        add_trials(chunk)
+        for record in chunk:
+            ingest("trial", record)
+        yield from chunk
+
+def forge_trials(specs, workers=None, ordered=True):
+    """Forge and index a trial record for every spec, in a process pool when workers > 1."""
+    return list(stream_trials(specs, workers=workers, ordered=ordered))
+
+def iter_trial_specs(path):
+    """
+    Read trial specs from a file without loading all of it when possible.
+
+    A .jsonl (or .jsonl.gz) file is read one spec per line. A JSON file may
+    hold a list of specs, an object with one of SPEC_LIST_KEYS, or a single spec.
+    """
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        if path.name.endswith((".jsonl", ".jsonl.gz")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = next((data[key] for key in SPEC_LIST_KEYS if isinstance(data.get(key), list)), [data])
+    yield from data
+
+def write_trials(specs_path, output_path, workers=None, ordered=True, compress=None):
+    """
+    Forge a trial record for every spec in a file and write them as JSONL.
+
+    Records are written as they are forged and are not indexed. The output
+    is gzip-compressed when compress is True, or by default when
+    output_path ends in .gz. Returns the number written.
+    """
+    if compress is None:
+        compress = str(output_path).endswith(".gz")
+    opener = gzip.open if compress else open
+    count = 0
+    with opener(output_path, "wt", encoding="utf-8") as out:
+        for record in stream_trials(iter_trial_specs(specs_path), workers=workers, ordered=ordered, index=False):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
@@ -3,9 +3,14 @@ import os
 from dotenv import load_dotenv
 import requests
 
+from swarm_logic.provider_stats import get_provider_stats
+
 load_dotenv()
 HF_TOKEN = os.getenv("HUGGINGFACE_API_TOKEN")
 
+# Model the voice calls are tracked under in the provider stats
+VOICE_MODEL = "huggingface:nari-labs/Dia-1.6B"
+
 def generate_agent_voice(text_input, audio_prompt_url=None):
     headers = {
         "Authorization": f"Bearer {HF_TOKEN}"
@@ -22,15 +27,17 @@ def generate_agent_voice(text_input, audio_prompt_url=None):
         "speed_factor": 0.94
     }
 
-    response = requests.post(
-        "https://hf.space/embed/nari-labs/Dia-1.6B/+/api/predict",
-        headers=headers,
-        json={"data": list(payload.values())}
-    )
-
-    if response.ok:
-        result = response.json()
-        return result.get("data", [None])[0]
-    else:
+    try:
+        with get_provider_stats().track(VOICE_MODEL):
+            response = requests.post(
+                "https://hf.space/embed/nari-labs/Dia-1.6B/+/api/predict",
+                headers=headers,
+                json={"data": list(payload.values())}
+            )
+            response.raise_for_status()
+    except requests.HTTPError:
         print("Error:", response.status_code, response.text)
         return None
+
+    result = response.json()
+    return result.get("data", [None])[0]